@@ -10,16 +10,45 @@ from sklearn.model_selection import TimeSeriesSplit
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from models.model_registry import ModelRegistry
+from helper.fold_cache import FoldCache
+from helper.dataset import ArrayDataset
+from helper.checkpoint import RunCheckpoint
+from helper.budget import BudgetScheduler
+from helper.profiler import StageProfiler, count_fit
+from helper.model_race import ModelRace
+from helper.score_cache import ScoreCache, _stable
+from helper.selection_store import SelectionStore
+import json
+import time
 import joblib
+import inspect
 import pickle
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Union
 
 class SimpleAutoML:
-    def __init__(self, target_col='purchase_price', test_split=0.2, cv_folds=3):
+    # Feature matrix dtype per policy; 'compact' also moves 0/1 indicator columns out of the float matrix into a uint8 block
+    DTYPE_POLICIES = {'float64': np.float64, 'float32': np.float32, 'compact': np.float32}
+
+    def __init__(self, target_col='purchase_price', test_split=0.2, cv_folds=3, dtype_policy='float64',
+                 score_cache_path=None, selection_cache_dir=None):
+        """
+        Args:
+            dtype_policy: Feature matrix dtype, see DTYPE_POLICIES
+            score_cache_path: SQLite file that persists CV fold losses across runs (the
+                              in-memory score cache is always used and kept between runs)
+            selection_cache_dir: Directory for feature selection artifacts; a run whose data,
+                                 selector, estimator and loss match a stored artifact reuses
+                                 its selection instead of fitting the selector
+        """
+        if dtype_policy not in self.DTYPE_POLICIES:
+            raise ValueError(f"Unknown dtype_policy '{dtype_policy}'. Available: {list(self.DTYPE_POLICIES)}")
         self.target_col = target_col
         self.test_split = test_split
         self.cv_folds = cv_folds
+        self.dtype_policy = dtype_policy
+        self.score_cache = ScoreCache(path=score_cache_path)
+        self.selection_store = SelectionStore(selection_cache_dir) if selection_cache_dir is not None else None
         
         # Components that will be fitted
         self.scaler = StandardScaler()
@@ -77,106 +106,180 @@ class SimpleAutoML:
         
         return main_path
 
+    @staticmethod
+    def load_selected_features(filepath: str) -> Dict[str, List[str]]:
+        """
+        Selected features per model from a package written by save_model.
+
+        Uses the per-model selectors in the stored results, or only the best
+        model's selector for packages saved without results.
+
+        Returns:
+            {model_name: selected_features_}, for run_automl(initial_features=...)
+        """
+        package = joblib.load(filepath)
+        models = package.get('results', {}).get('models', {})
+        selected = {
+            name: list(result['feature_selector'].selected_features_)
+            for name, result in models.items()
+            if result.get('feature_selector') is not None and result['feature_selector'].selected_features_
+        }
+        if not selected and package.get('feature_selector') is not None:
+            selected[package['model_metadata']['best_model_name']] = list(package['feature_selector'].selected_features_)
+        return selected
+
 
 
-    def run_automl(self, df: pd.DataFrame, 
+    def run_automl(self, df: Union[pd.DataFrame, str, os.PathLike], 
                feature_selection_fn=None,
                hypertuning_fn=None,
                models_to_run: Optional[List[str]] = None,
                n_splits=5,
                test_split=0.2,
                verbose=1, param_amount='small',
-               loss_fn=None) -> Dict[str, Any]:
+               loss_fn=None,
+               parallel_models: bool = False,
+               n_jobs: int = -1,
+               run_dir: Optional[str] = None,
+               resume_from: Optional[str] = None,
+               time_budget_s: Optional[float] = None,
+               max_evaluations: Optional[int] = None,
+               trace_memory: bool = False,
+               model_race: bool = False,
+               race_survivors: int = 1,
+               race_eta: int = 2,
+               columns: Optional[List[str]] = None,
+               row_range: Optional[Tuple[int, int]] = None,
+               initial_features: Optional[Union[Dict[str, List[str]], List[str], str]] = None,
+               early_stopping_rounds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run feature selection, tuning and final training for every model.
+
+        Args:
+            df: DataFrame, or path to a parquet file / directory of parquet files with
+                time-ordered rows, which is streamed row group by row group
+                (see helper/parquet_source.py)
+            parallel_models: Run each model's pipeline in a separate worker process; each
+                             pipeline's tuner (and selector, if it takes n_jobs) then uses
+                             cpu_count // n_workers jobs instead of all cores
+            n_jobs: Maximum number of worker processes for parallel_models (-1: one per model)
+            run_dir: Directory to checkpoint completed models, selector steps and
+                     evaluated tuning candidates to
+            resume_from: Existing run directory to continue; finished work is skipped
+            time_budget_s: Wall-clock budget for the whole run, split across models and stages
+            max_evaluations: Maximum number of candidate CV evaluations for the whole run
+            trace_memory: Also measure per-stage peak Python allocations with tracemalloc
+                          (stored with the timings in results['profile'])
+            model_race: Race all models with default parameters on growing numbers of CV
+                        folds first and only select/tune the survivors (see helper/model_race.py)
+            race_survivors: Number of models that survive the race
+            race_eta: Keep the best 1/race_eta of the models after every race rung
+            columns: Feature columns to use (default: all except 'date' and the target);
+                     for parquet input only these and the target are read
+            row_range: (start, stop) rows of the time-ordered data to train and test on,
+                       e.g. (n - 1_000_000, None) for the most recent million rows
+            initial_features: Warm-start feature selection from a previous selection:
+                              {model_name: features}, one feature list for every model, or
+                              the path of a save_model package (see load_selected_features).
+                              Passed as initial_features= to selectors of models with a seed;
+                              selectors without that argument run cold (with a warning).
+            early_stopping_rounds: Stop boosters (xgboost, lightgbm) after this many rounds without
+                                   improvement on the CV validation fold during selection, racing
+                                   and tuning; the final fit uses the tuned mean best iteration
+        """
 
         print("Starting AutoML Pipeline - Training ALL available models...")
+        if isinstance(initial_features, (str, os.PathLike)):
+            initial_features = self.load_selected_features(initial_features)
+        run_start = time.time()
         
+        run_profiler = StageProfiler(trace_memory)
+
         # Step 1: Split data (without scaling - we'll scale within CV)
-        X_train, X_test, y_train, y_test = self._prepare_data_splits_no_scaling(df, test_split)
+        with run_profiler.stage('data_split'):
+            train_data, test_data, y_train, y_test = self._prepare_datasets(df, test_split, columns, row_range)
+            # DataFrame views over the same matrix for the selector/tuner APIs (no copies)
+            X_train, X_test = train_data.to_frame(), test_data.to_frame()
         
         # Create CV splitter for feature selection and hypertuning
         cv = TimeSeriesSplit(n_splits=n_splits)
+
+        # Scale every CV fold once and share it between selectors, tuners and final training
+        with run_profiler.stage('fold_scaling'):
+            fold_cache = FoldCache(train_data, y_train, cv)
+            fold_cache.build()  # Build the cached folds now so scaling time is attributed here
         
         # Step 2: Train ALL available models (with individual feature selection)
         model_results = {}
         all_model_names = models_to_run if models_to_run is not None else self.model_registry.list_models()
         print(f"Training {len(all_model_names)} models: {all_model_names}")
-        
-        for model_name in all_model_names:
-            print(f"\nTraining {model_name}...")
-            try:
-                model_config = self.model_registry.get_model_config(model_name)
-                
-                # Create copies of data for this model
-                X_train_model = X_train.copy()
-                X_test_model = X_test.copy()
-                
-                # Step 2a: Feature selection for THIS specific model (if provided)
-                feature_selector = None
-                if feature_selection_fn is not None:
-                    print(f"  Running feature selection for {model_name}...")
-                    
-                    # Create a quick model instance for feature selection
-                    selector_model = model_config.get_model(loss_fn=loss_fn)
-                    
-                    # Create feature selector with CV parameter
-                    feature_selector = feature_selection_fn(
-                        estimator=selector_model,
-                         loss_fn=loss_fn,
-                        cv=cv,  # Pass CV splitter
-                        verbose=verbose,
-                    )
-
-                    # Fit on training data, transform both sets
-                    X_train_model = feature_selector.fit_transform(X_train_model, y_train)
-                    X_test_model = feature_selector.transform(X_test_model)
-                    
-                    print(f"  Features after selection for {model_name}: {X_train_model.shape[1]}")
-                
-                # Step 2b: Hyperparameter tuning for THIS model (if provided)
-                if hypertuning_fn is not None:
-                    print(f"  Running hyperparameter tuning for {model_name}...")
-                    
-                    # Get parameter grid
-                   
-                    param_grid = model_config.get_param_grid(param_amount)
-                    base_model = model_config.get_model(loss_fn=loss_fn)
-                    # Create and fit tuner with CV parameter
-                    tuner = hypertuning_fn(
-                        estimator=base_model,
-                        loss_fn=loss_fn,
-                        param_grid=param_grid,
-                        cv=cv,  # Pass same CV splitter
-                        n_jobs=-1,
-                        verbose=verbose
-                    )
 
-                    tuner.fit(X_train_model, y_train)  # Uses feature-selected data
-                    best_params = tuner.best_params_
-                    cv_score = tuner.best_score_
-                    
-                    print(f"  Best params for {model_name}: {best_params}")
-                else:
-                    # Use default parameters
-                    best_params = {}
-                    cv_score = None
-                    print(f"  Using default parameters for {model_name}")
-                
-                # Step 2c: Train final model with proper scaling
-                result = self._train_and_evaluate_with_scaling(
-                    model_config, best_params, X_train_model, y_train, X_test_model, y_test, loss_fn, cv_score
-                )
-                
-                # Store feature selector info in results
-                result['feature_selector'] = feature_selector
-                result['n_features_selected'] = X_train_model.shape[1]
-                result['original_features'] = X_train.shape[1]
-                
-                model_results[model_name] = result
-                print(f"✓ {model_name} - Test {loss_fn.name}: {result['metrics']['test_loss']:.2f} (Features: {X_train_model.shape[1]})")
+        # Checkpointing: the fingerprint ties a run directory to this exact data and configuration
+        checkpoint = None
+        if run_dir is not None or resume_from is not None:
+            describe = SelectionStore.describe_selector
+            settings = json.dumps([
+                all_model_names, n_splits, test_split, param_amount, self.dtype_policy,
+                describe(feature_selection_fn) if feature_selection_fn is not None else None,
+                describe(hypertuning_fn) if hypertuning_fn is not None else None,
+                loss_fn.name if loss_fn is not None else None,
+                (race_survivors, race_eta) if model_race else None, initial_features, early_stopping_rounds,
+            ], sort_keys=True, default=_stable)
+            fingerprint = f"{train_data.fingerprint(y_train)}-{test_data.fingerprint(y_test)}-{settings}"
+            checkpoint = RunCheckpoint(resume_from or run_dir, fingerprint, resume=resume_from is not None)
+            print(f"Checkpointing run to: {checkpoint.run_dir}")
 
-            except Exception as e:
-                print(f"✗ {model_name} failed: {str(e)}")
-                model_results[model_name] = {'error': str(e)}
+        # Optional successive-halving race: cheap default-parameter fits decide which models get the full treatment.
+        # A resumed run reuses the checkpointed outcome instead of racing again.
+        race_summary = checkpoint.load_race() if checkpoint is not None else None
+        if race_summary is not None:
+            all_model_names = race_summary['survivors']
+            print(f"Model race survivors (from checkpoint): {all_model_names} "
+                  f"(eliminated: {race_summary['eliminated']})")
+        elif model_race and len(all_model_names) > race_survivors:
+            with run_profiler.stage('model_race'):
+                race = ModelRace(fold_cache, loss_fn, eta=race_eta, min_survivors=race_survivors, verbose=verbose,
+                                 score_cache=self.score_cache)
+                all_model_names = race.run({
+                    name: self._get_model(self.model_registry.get_model_config(name), loss_fn, early_stopping_rounds)
+                    for name in all_model_names
+                })
+            race_summary = race.summary()
+            if checkpoint is not None:
+                checkpoint.save_race(race_summary)
+            print(f"Model race survivors: {all_model_names} (eliminated: {race.eliminated_})")
+
+        # Central budget scheduler; selectors/tuners stop with their best-so-far result when their share runs out
+        stages = [stage for stage, fn in [('feature_selection', feature_selection_fn), ('tuning', hypertuning_fn)]
+                  if fn is not None]
+        scheduler = BudgetScheduler(all_model_names, stages, time_budget_s, max_evaluations,
+                                    parallel=parallel_models and len(all_model_names) > 1, start_time=run_start)
+        scheduler = scheduler if scheduler.enabled else None
+
+        # Tuners (and selectors with n_jobs) use all cores, or this worker's share of them under parallel_models
+        n_workers = 1
+        stage_n_jobs = -1
+        if parallel_models and len(all_model_names) > 1:
+            n_workers = len(all_model_names) if n_jobs is None or n_jobs < 1 else min(n_jobs, len(all_model_names))
+            stage_n_jobs = max(1, joblib.cpu_count() // n_workers)
+
+        pipeline_args = (X_train, X_test, y_train, y_test, cv, fold_cache, checkpoint, scheduler,
+                         feature_selection_fn, hypertuning_fn, param_amount, loss_fn, verbose, trace_memory,
+                         initial_features, early_stopping_rounds, stage_n_jobs)
+
+        # Per-model stages are profiled inside each pipeline (also in worker processes)
+        with run_profiler.stage('model_pipelines'):
+            if n_workers > 1:
+                # Each model's pipeline is independent, so run them in separate worker processes
+                print(f"Running model pipelines in parallel ({n_workers} workers, {stage_n_jobs} jobs each)")
+                outputs = joblib.Parallel(n_jobs=n_workers, backend='loky')(
+                    joblib.delayed(self._run_model_pipeline)(model_name, *pipeline_args)
+                    for model_name in all_model_names
+                )
+                model_results = dict(zip(all_model_names, outputs))
+            else:
+                for model_name in all_model_names:
+                    model_results[model_name] = self._run_model_pipeline(model_name, *pipeline_args)
         
         # Step 3: Find best model and store results
         best_model_name, best_result = self._get_best_model(model_results , loss_fn)
@@ -187,55 +290,287 @@ class SimpleAutoML:
         self.results = {
             'models': model_results,
             'best_model': best_model_name,
+            'fold_cache': self._merge_fold_cache_stats(model_results),
+            'score_cache': self._merge_score_cache_stats(model_results),
+            'race': race_summary,
+            'budget': self._summarize_budget(model_results, time_budget_s, max_evaluations) if scheduler is not None else None,
+            'profile': {
+                'run': run_profiler.to_dict(),
+                'models': {name: result.get('profile', {}) for name, result in model_results.items()}
+            },
             'data_info': {
                 'train_size': len(X_train),
                 'test_size': len(X_test),
                 'original_features': X_train.shape[1],
                 'feature_selection_used': feature_selection_fn is not None,
                 'hypertuning_used': hypertuning_fn is not None,
-                'models_trained': len(all_model_names)
+                'models_trained': len(all_model_names),
+                'dtype_policy': self.dtype_policy,
+                'feature_matrix_bytes': train_data.nbytes + test_data.nbytes,
+                'indicator_columns': len(train_data.indicator_block_columns),
+                'parallel_models': bool(parallel_models)
             }
         }
 
         self._print_results(loss_fn)
         return self.results
 
+    def _run_model_pipeline(self, model_name, X_train, X_test, y_train, y_test, cv, fold_cache, checkpoint,
+                            scheduler, feature_selection_fn, hypertuning_fn, param_amount, loss_fn, verbose,
+                            trace_memory=False, initial_features=None, early_stopping_rounds=None, stage_n_jobs=-1):
+        """Run feature selection, tuning and final training for a single model.
+
+        stage_n_jobs is the tuner's n_jobs, also given to selectors that take
+        n_jobs (unless bound in a functools.partial) when it is not -1.
+        Failures are caught and returned as {'error': ...} so one model cannot
+        take down the rest of the run (also when executed in a worker process).
+        """
+        print(f"\nTraining {model_name}...")
+        if checkpoint is not None:
+            saved_result = checkpoint.load_model_result(model_name)
+            if saved_result is not None:
+                print(f"✓ {model_name} - already completed in {checkpoint.run_dir}, skipping")
+                if scheduler is not None:
+                    scheduler.skip_model(model_name)
+                return saved_result
+
+        cache_before = fold_cache.stats()
+        profiler = StageProfiler(trace_memory)
+        try:
+            model_config = self.model_registry.get_model_config(model_name)
+            
+            # Selectors return new frames, so the shared (read-only) views are used as-is
+            X_train_model = X_train
+            X_test_model = X_test
+            
+            # Step 2a: Feature selection for THIS specific model (if provided)
+            feature_selector = None
+            selection_artifact = None
+            tuner = None
+            if feature_selection_fn is not None:
+                print(f"  Running feature selection for {model_name}...")
+                
+                # Create a quick model instance for feature selection
+                selector_model = self._get_model(model_config, loss_fn, early_stopping_rounds)
+                
+                # Create feature selector with CV parameter
+                budget = scheduler.stage_budget(model_name, 'feature_selection') if scheduler is not None else None
+                # Warm start from a previous selection (only passed when there is one for this model)
+                seed = initial_features.get(model_name) if isinstance(initial_features, dict) else initial_features
+                if seed is not None and not self._accepts_kwarg(feature_selection_fn, 'initial_features'):
+                    selector_name = SelectionStore.describe_selector(feature_selection_fn)['name']
+                    print(f"  Warning: {selector_name} takes no initial_features (or has them bound), "
+                          f"selecting {model_name} features without the warm start")
+                    seed = None
+                selector_kwargs = {'initial_features': seed} if seed is not None else {}
+                if stage_n_jobs != -1 and self._accepts_kwarg(feature_selection_fn, 'n_jobs'):
+                    selector_kwargs['n_jobs'] = stage_n_jobs
+                feature_selector = feature_selection_fn(
+                    estimator=selector_model,
+                     loss_fn=loss_fn,
+                    cv=cv,  # Pass CV splitter
+                    verbose=verbose,
+                    fold_cache=fold_cache,
+                    checkpoint=checkpoint.stage(model_name, 'feature_selection') if checkpoint is not None else None,
+                    budget=budget,
+                    score_cache=self.score_cache,
+                    **selector_kwargs
+                )
+
+                # Reuse a stored selection for the same data, selector, estimator and loss
+                artifact = None
+                if self.selection_store is not None:
+                    artifact_key = SelectionStore.key(fold_cache.fingerprint, feature_selection_fn, selector_model,
+                                                      loss_fn, seed)
+                    artifact = self.selection_store.load(artifact_key)
+                    selection_artifact = {'path': self.selection_store.path(artifact_key), 'reused': artifact is not None}
+
+                # Fit on training data, transform both sets
+                with profiler.stage('feature_selection'):
+                    if artifact is not None:
+                        print(f"  Reusing feature selection from {selection_artifact['path']}")
+                        X_train_model = feature_selector.load_artifact(artifact).transform(X_train_model)
+                    else:
+                        X_train_model = feature_selector.fit_transform(X_train_model, y_train)
+                        if self.selection_store is not None:
+                            self.selection_store.save(artifact_key, feature_selector.to_artifact(),
+                                                      fold_cache.fingerprint)
+                    X_test_model = feature_selector.transform(X_test_model)
+                if scheduler is not None:
+                    scheduler.finish(model_name, 'feature_selection', budget)
+                
+                print(f"  Features after selection for {model_name}: {X_train_model.shape[1]}")
+            
+            # Step 2b: Hyperparameter tuning for THIS model (if provided)
+            if hypertuning_fn is not None:
+                print(f"  Running hyperparameter tuning for {model_name}...")
+                
+                # Get parameter grid
+               
+                param_grid = model_config.get_param_grid(param_amount)
+                base_model = self._get_model(model_config, loss_fn, early_stopping_rounds)
+                budget = scheduler.stage_budget(model_name, 'tuning') if scheduler is not None else None
+                # Create and fit tuner with CV parameter
+                tuner = hypertuning_fn(
+                    estimator=base_model,
+                    loss_fn=loss_fn,
+                    param_grid=param_grid,
+                    cv=cv,  # Pass same CV splitter
+                    n_jobs=stage_n_jobs,
+                    verbose=verbose,
+                    fold_cache=fold_cache,
+                    checkpoint=checkpoint.stage(model_name, 'tuning') if checkpoint is not None else None,
+                    budget=budget,
+                    score_cache=self.score_cache
+                )
+
+                with profiler.stage('tuning'):
+                    tuner.fit(X_train_model, y_train)  # Uses feature-selected data
+                if scheduler is not None:
+                    scheduler.finish(model_name, 'tuning', budget)
+                # A tuner whose budget ran out before any evaluation falls back to default parameters;
+                # early-stopped boosters are refitted with the mean best iteration of their CV folds
+                best_params = tuner.get_final_params() if tuner.best_params_ is not None else {}
+                cv_score = tuner.best_score_ if tuner.best_params_ is not None else None
+                
+                print(f"  Best params for {model_name}: {best_params}")
+                if tuner.best_iteration_ is not None:
+                    print(f"  Early stopping: final fit with {tuner.best_iteration_} rounds (mean CV best iteration)")
+            else:
+                # Use default parameters
+                best_params = {}
+                cv_score = None
+                print(f"  Using default parameters for {model_name}")
+            
+            # Step 2c: Train final model with proper scaling
+            with profiler.stage('final_training'):
+                result = self._train_and_evaluate_with_scaling(
+                    model_config, best_params, X_train_model, y_train, X_test_model, y_test, loss_fn, cv_score,
+                    fold_cache=fold_cache
+                )
+            
+            # Store feature selector info in results
+            result['feature_selector'] = feature_selector
+            result['selection_artifact'] = selection_artifact
+            result['n_features_selected'] = X_train_model.shape[1]
+            result['original_features'] = X_train.shape[1]
+            if scheduler is not None:
+                result['budget'] = scheduler.model_usage(model_name)
+            result['score_cache_stats'] = {
+                stage: component.score_cache_stats_
+                for stage, component in [('feature_selection', feature_selector), ('tuning', tuner)]
+                if component is not None and hasattr(component, 'score_cache_stats_')
+            }
+            if getattr(tuner, 'fit_report_', None) is not None:
+                result['tuning_fits'] = tuner.fit_report_
+            if tuner is not None and tuner.best_iteration_ is not None:
+                result['best_iteration'] = tuner.best_iteration_
+            result['fold_cache_stats'] = {
+                key: fold_cache.stats()[key] - cache_before[key] for key in ('hits', 'misses')
+            }
+            result['profile'] = profiler.to_dict()
+            
+            if checkpoint is not None:
+                checkpoint.save_model_result(model_name, result)
+
+            print(f"✓ {model_name} - Test {loss_fn.name}: {result['metrics']['test_loss']:.2f} (Features: {X_train_model.shape[1]})")
+            return result
+
+        except Exception as e:
+            print(f"✗ {model_name} failed: {str(e)}")
+            if scheduler is not None:
+                scheduler.skip_model(model_name)
+            return {'error': str(e), 'profile': profiler.to_dict()}
+
+    @staticmethod
+    def _get_model(model_config, loss_fn, early_stopping_rounds=None):
+        """model_config's default model; boosters also get early_stopping_rounds"""
+        model = model_config.get_model(loss_fn=loss_fn)
+        if early_stopping_rounds is not None and 'early_stopping_rounds' in model.get_params():
+            model.set_params(early_stopping_rounds=early_stopping_rounds)
+        return model
+
+    @staticmethod
+    def _accepts_kwarg(feature_selection_fn, name) -> bool:
+        """Whether a selector class (or functools.partial of one) takes keyword name that was not bound already"""
+        if name in SelectionStore.describe_selector(feature_selection_fn)['kwargs']:
+            return False
+        try:
+            return name in inspect.signature(feature_selection_fn).parameters
+        except (TypeError, ValueError):
+            return False
+
     def _prepare_data_splits_no_scaling(self, df, test_split):
         """Split data without scaling - scaling happens within CV"""
-        # Get features and target
-        feature_cols = [col for col in df.columns if col not in ['date', self.target_col]]
-        X = df[feature_cols].copy()
-        y = df[self.target_col].copy()
+        train_data, test_data, y_train, y_test = self._prepare_datasets(df, test_split)
+        return train_data.to_frame(), test_data.to_frame(), y_train, y_test
+
+    def _prepare_datasets(self, df, test_split, columns=None, row_range=None):
+        """Split data into array-backed train/test views over one contiguous feature matrix"""
+        start, stop = row_range if row_range is not None else (0, None)
+        dtype = self.DTYPE_POLICIES[self.dtype_policy]
+
+        if isinstance(df, (str, os.PathLike)):
+            from helper.parquet_source import ParquetSource  # pyarrow is only needed for parquet input
+            source = ParquetSource(df)
+            feature_cols = list(columns) if columns is not None else \
+                [col for col in source.columns if col not in ['date', self.target_col]]
+            values, y, index = source.read(feature_cols, self.target_col, start, stop, dtype=dtype)
+            print(f"Read {len(values)} rows, {len(feature_cols)} features from {len(source.files)} parquet file(s)"
+                  + (f", sorted by {source.time_col}" if source.time_order is not None else ""))
+        else:
+            if row_range is not None:
+                df = df.iloc[start:stop]
+            feature_cols = list(columns) if columns is not None else \
+                [col for col in df.columns if col not in ['date', self.target_col]]
+            y = df[self.target_col]
+            index = df.index
+            values = None
 
         # --- NEW: Sanitize column names ---
-        self.original_feature_names = X.columns.tolist()
-        sanitized_cols = {col: re.sub(r'[^a-zA-Z0-9_]', '_', col) for col in X.columns}
-        X = X.rename(columns=sanitized_cols)
-        self.sanitized_feature_names = X.columns.tolist()
+        self.original_feature_names = feature_cols
+        self.sanitized_feature_names = [re.sub(r'[^a-zA-Z0-9_]', '_', col) for col in feature_cols]
         self.feature_columns = self.sanitized_feature_names  # Store for saving
         # --- End of new code ---
+
+        # The only copy of the features: one matrix in the dtype_policy dtype (float64 or float32),
+        # plus a uint8 block of the indicator columns under 'compact'; everything else is a view
+        compact = self.dtype_policy == 'compact'
+        if values is None:
+            data = ArrayDataset.from_frame(df, feature_cols, dtype=dtype, compact=compact)
+        else:
+            data = ArrayDataset(values, feature_cols, index)
+            data = data.compact() if compact else data
+        sanitized = dict(zip(feature_cols, self.sanitized_feature_names))
+        data = ArrayDataset(data.values, self.sanitized_feature_names, index, data.indicators,
+                            [sanitized[col] for col in data.indicator_block_columns])
         
         # Simple time series split for final train/test
-        split_point = int(len(df) * (1 - test_split))
+        split_point = int(len(data) * (1 - test_split))
         
-        X_train = X.iloc[:split_point].copy()
-        X_test = X.iloc[split_point:].copy()
-        y_train = y.iloc[:split_point].copy()
-        y_test = y.iloc[split_point:].copy()
+        train_data = data.rows(0, split_point)
+        test_data = data.rows(split_point)
+        y_train = y.iloc[:split_point]
+        y_test = y.iloc[split_point:]
         
-        print(f"Data split - Train: {len(X_train)}, Test: {len(X_test)}")
-        return X_train, X_test, y_train, y_test
+        print(f"Data split - Train: {len(train_data)}, Test: {len(test_data)}")
+        return train_data, test_data, y_train, y_test
 
-    def _train_and_evaluate_with_scaling(self, model_config, params, X_train, y_train, X_test, y_test, loss_fn, cv_score=None):
+    def _train_and_evaluate_with_scaling(self, model_config, params, X_train, y_train, X_test, y_test, loss_fn, cv_score=None,
+                                         fold_cache=None):
         """Train final model with proper scaling"""
         from helper.helper import helper  # Import helper
         
-        # Scale final train/test data
-        data_scaler = helper()
-        X_train_scaled, X_test_scaled, fitted_scaler = data_scaler.scale_with_scaler(X_train, X_test)
+        # Scale final train/test data (reusing the cached full-train statistics when available)
+        if fold_cache is not None:
+            X_train_scaled, X_test_scaled, fitted_scaler = fold_cache.scale_final(X_train, X_test)
+        else:
+            data_scaler = helper()
+            X_train_scaled, X_test_scaled, fitted_scaler = data_scaler.scale_with_scaler(X_train, X_test)
         
         # Train model on scaled data
         model, y_pred = model_config.train_and_predict(X_train_scaled, y_train, X_test_scaled, loss_fn=loss_fn, **params)
+        count_fit()
         
         # Calculate metrics using consistent naming
         y_train_pred = model.predict(X_train_scaled)
@@ -257,6 +592,39 @@ class SimpleAutoML:
         return result
 
 
+    def _merge_fold_cache_stats(self, model_results):
+        """Sum the per-model fold cache counters (workers each hold their own cache copy)"""
+        hits = sum(r.get('fold_cache_stats', {}).get('hits', 0) for r in model_results.values())
+        misses = sum(r.get('fold_cache_stats', {}).get('misses', 0) for r in model_results.values())
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+    def _merge_score_cache_stats(self, model_results):
+        """Sum the score cache lookups of every model's selector and tuner"""
+        stage_stats = [stats for r in model_results.values() for stats in r.get('score_cache_stats', {}).values()]
+        hits = sum(stats['hits'] for stats in stage_stats)
+        misses = sum(stats['misses'] for stats in stage_stats)
+        total = hits + misses
+        return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+    def _summarize_budget(self, model_results, time_budget_s, max_evaluations):
+        """Run-level budget usage from the per-stage usage stored with each model"""
+        stage_usage = [usage for r in model_results.values() for usage in r.get('budget', {}).values()]
+        return {
+            'time_budget_s': time_budget_s,
+            'max_evaluations': max_evaluations,
+            'stage_time_used_s': sum(usage['time_used_s'] for usage in stage_usage),
+            'evaluations': sum(usage['evaluations'] for usage in stage_usage),
+            'stages_exhausted': sum(usage['exhausted'] for usage in stage_usage)
+        }
+
+    def export_profile(self, filepath: str):
+        """Write the per-stage timings and memory figures of the last run as JSON"""
+        if not self.results or 'profile' not in self.results:
+            raise ValueError("No profile available. Call run_automl() first.")
+        with open(filepath, 'w') as f:
+            json.dump(self.results['profile'], f, indent=2)
+
     # Add this method to automl.py:
     def _get_best_model(self, model_results, loss_fn):
         """Get best model based on test metric"""
@@ -1,5 +1,8 @@
 from .backwards import BackwardFeatureSelector
+from .forward import ForwardFeatureSelector
+from .importance_pruning import ImportancePruningSelector
+from .permutation_importance import PermutationImportanceSelector
 from .feature_selection_interface import FeatureSelectionInterface
-# from .forward import ForwardFeatureSelector  # Temporarily commented out
 
-__all__ = ['BackwardFeatureSelector', 'FeatureSelectionInterface']  # 'ForwardFeatureSelector' temporarily removed
+__all__ = ['BackwardFeatureSelector', 'ForwardFeatureSelector', 'ImportancePruningSelector',
+           'PermutationImportanceSelector', 'FeatureSelectionInterface']
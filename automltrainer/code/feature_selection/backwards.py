@@ -1,80 +1,148 @@
+import time
+
 import pandas as pd
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.metrics import mean_squared_error
 from sklearn.model_selection import TimeSeriesSplit
 from .feature_selection_interface import FeatureSelectionInterface
-
-class BackwardFeatureSelector(FeatureSelectionInterface):
-    def __init__(self, estimator, loss_fn, cv=None, verbose=0):
-        super().__init__(estimator, loss_fn, cv, verbose)
+from .linear_fast_path import LinearSubsetScorer
+from .feature_groups import resolve_feature_groups
+from .local_search import LocalSearchMixin
+
+class BackwardFeatureSelector(LocalSearchMixin, FeatureSelectionInterface):
+    def __init__(self, estimator, loss_fn, cv=None, verbose=0, fold_cache=None, checkpoint=None, budget=None,
+                 score_cache=None, n_jobs=1, linear_fast_path=True, feature_groups=None, early_abandon_margin=None,
+                 initial_features=None):
+        """
+        Args:
+            n_jobs: Number of candidate drops scored in parallel per step (-1: all cores).
+                    Results do not depend on n_jobs: ties go to the earliest feature.
+            linear_fast_path: Score the candidates of 'linear' / 'ridge' LinearRegressionConfig
+                              estimators in closed form (see linear_fast_path.py)
+            feature_groups: Drop whole groups instead of single columns: 'auto' (one-hot
+                            prefixes btype_ / omr_de_), a list of prefixes or {name: columns},
+                            see feature_groups.py
+            early_abandon_margin: Stop scoring a candidate once it cannot beat the step's best
+                                  even if its remaining folds came in at (1 - margin) times
+                                  the best loss seen on them (1.0: exact for non-negative
+                                  losses, lower: skips more fits). None disables it.
+            initial_features: Warm start from these features (e.g. the previous run's
+                              selected_features_) with a drop / re-add local search instead
+                              of eliminating from the full column set, see local_search.py
+        """
+        super().__init__(estimator, loss_fn, cv, verbose, fold_cache, checkpoint, budget, score_cache)
+        self.n_jobs = n_jobs
+        self.linear_fast_path = linear_fast_path
+        self.feature_groups = feature_groups
+        self.early_abandon_margin = early_abandon_margin
+        self.initial_features = initial_features
+        self.selected_groups_ = None
         self.scoring = 'neg_mean_squared_error'  # Keep for compatibility
 
     def fit(self, X, y):
         """Fit using provided CV splitter with proper scaling per split"""
-        from helper.helper import helper  # Import helper
-        
         available_features = list(X.columns)
         selected_features = list(X.columns)  # Start with all features
-        self.best_score_ = float('-inf')  # Initialize with a very low score
-
-        if self.verbose > 0:
+        self.best_score_ = float('-inf') if self.loss_fn.higher_is_better else float('inf')
+        finished = False
+        self._n_skipped_fits = 0
+        self.score_trace_ = []
+
+        # Continue from the last completed step of an interrupted run
+        state = self.checkpoint.load_state() if self.checkpoint is not None else None
+        if state is not None:
+            selected_features = state['selected_features']
+            self.best_score_ = state['best_score']
+            finished = state['finished']
+            self.score_trace_ = state.get('score_trace', [])
+            if self.verbose > 0:
+                print(f"Resuming backward feature selection with {len(selected_features)} features")
+
+        # Candidates are groups of columns (single columns unless feature_groups is given)
+        groups = resolve_feature_groups(available_features, self.feature_groups)
+        selected_groups = [name for name, cols in groups.items() if all(c in selected_features for c in cols)]
+
+        scorer = None
+        if self.linear_fast_path and LinearSubsetScorer.supports(self.estimator) and not finished:
+            scorer = LinearSubsetScorer(self.estimator, self.loss_fn, X, y, self.cv, self.fold_cache)
+
+        if self.initial_features is not None:
+            # Warm start: the elimination below only runs if the budget ran out (and then scores nothing)
+            if state is None:
+                selected_groups = self._seed_groups(groups, self.initial_features, self.verbose)
+            if self.verbose > 0:
+                print(f"Starting local search from {len(selected_groups)} seed features")
+            selected_groups, finished = self._local_search(X, y, groups, selected_groups, finished, scorer,
+                                                           self.n_jobs, self.early_abandon_margin)
+            selected_features = [f for name in selected_groups for f in groups[name]]
+        elif self.verbose > 0:
             print(f"Starting backward feature selection with {len(selected_features)} features")
 
-        while len(selected_features) > 1:
-            scores = {}
-            
-            for feature_to_drop in selected_features:
-                temp_features = [f for f in selected_features if f != feature_to_drop]
-                temp_X = X[temp_features]
-
-                # Use cross-validation with proper scaling per split
-                cv_scores = []
-                
-                for train_idx, val_idx in self.cv.split(temp_X):
-                    X_train_cv = temp_X.iloc[train_idx]
-                    X_val_cv = temp_X.iloc[val_idx]
-                    y_train_cv = y.iloc[train_idx]
-                    y_val_cv = y.iloc[val_idx]
-
-                    # Scale this specific split using helper
-                    data_scaler = helper()
-                    X_train_scaled, X_val_scaled = data_scaler.scale(X_train_cv, X_val_cv)
-
-                    # Clone estimator to avoid fitting issues
-                    temp_estimator = self.estimator.__class__(**self.estimator.get_params())
-                    temp_estimator.fit(X_train_scaled, y_train_cv)
-                    predictions = temp_estimator.predict(X_val_scaled)
-
-
-
-                    score = self.loss_fn(y_val_cv, predictions)  # Negative for maximization
-
-
-                    cv_scores.append(score)
-
-                # Average CV score
-                scores[feature_to_drop] = np.mean(cv_scores)
-
-            best_feature_to_drop = max(scores, key=scores.get)
+        while not finished and len(selected_groups) > 1:
+            step_start = time.time()
+            # Average CV score of every single-group drop, using cross-validation with proper scaling per split
+            if scorer is not None:
+                step_scores = self._charge_budget(
+                    scorer.backward_scores(selected_features, [groups[name] for name in selected_groups]))
+            else:
+                candidates = [([f for f in selected_features if f not in groups[group_to_drop]], None)
+                              for group_to_drop in selected_groups]
+                step_scores = self._score_candidates(X, y, candidates, self.n_jobs, self.early_abandon_margin,
+                                                     self.best_score_)
+            scores = dict(zip(selected_groups, step_scores))
+
+            if not scores:
+                break  # Budget used up before this step evaluated any candidate
+
+            # Ties go to the first group in column order (max/min keep the first extremum)
+            if self.loss_fn.higher_is_better:
+                best_group_to_drop = max(scores, key=scores.get)
+            else:
+                best_group_to_drop = min(scores, key=scores.get)
 
-            if scores[best_feature_to_drop] > self.best_score_:  # Improvement
-                self.best_score_ = scores[best_feature_to_drop]
-                selected_features.remove(best_feature_to_drop)
+            if self._is_improvement(scores[best_group_to_drop]):
+                self.best_score_ = scores[best_group_to_drop]
+                selected_groups.remove(best_group_to_drop)
+                selected_features = [f for f in selected_features if f not in groups[best_group_to_drop]]
                 if self.verbose > 0:
-                    print(f"Dropped feature: {best_feature_to_drop}, CV Score: {self.best_score_:.4f}, Remaining: {len(selected_features)}")
+                    print(f"Dropped feature: {best_group_to_drop}, CV Score: {self.best_score_:.4f}, Remaining: {len(selected_features)}")
+            elif len(scores) < len(selected_groups):
+                break  # Budget ran out mid-step; the unscored drops may still improve, so a resumed run finishes it
             else:
                 if self.verbose > 0:
                     print("No improvement found, stopping feature selection")
-                break  # Stop if no improvement
+                finished = True  # Stop if no improvement
+
+            self._trace_step(len(selected_features), None if finished else best_group_to_drop, step_start)
+            self._save_step(selected_features, finished)
 
+            if self._budget_exhausted():
+                if self.verbose > 0:
+                    print("Budget exhausted, keeping the best feature set found so far")
+                break
+
+        self._save_step(selected_features, finished or not self._budget_exhausted())
         self.selected_features_ = selected_features  # Store the final selected features
+        self.selected_groups_ = selected_groups
         
         if self.verbose > 0:
             print(f"Feature selection complete. Selected {len(self.selected_features_)} features")
+            if self.n_skipped_fits_:
+                print(f"Early abandonment skipped {self.n_skipped_fits_} fold fits")
         
         return self
 
+    def _save_step(self, selected_features, finished):
+        """Persist the selector state after a completed step"""
+        if self.checkpoint is not None:
+            self.checkpoint.save_state({
+                'selected_features': selected_features,
+                'best_score': self.best_score_,
+                'finished': finished,
+                'score_trace': self.score_trace_
+            })
+
     def transform(self, X):
         """Transform any dataset using selected features"""
         if self.selected_features_ is None:
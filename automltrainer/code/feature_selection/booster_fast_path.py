@@ -0,0 +1,163 @@
+import warnings
+
+import numpy as np
+from helper.cross_validation import fit_columns, scaled_folds
+from helper.profiler import count_fit
+from models.Xgboost import XGBoostConfig
+from models.lightgbm import LightgbmConfig
+
+
+# Native column / row sampling parameters the wrappers pass through in kwargs
+_SAMPLING_KWARGS = ['colsample_bylevel', 'colsample_bynode', 'feature_fraction', 'feature_fraction_bynode',
+                    'bagging_fraction']
+
+
+class BoosterSubsetScorer:
+    """CV scoring of feature subsets for XGBoost / LightGBM on shared per-fold data.
+
+    Feature binning is done once per fold instead of once per candidate and
+    fold:
+
+    - LightGBM: every column of a fold is binned once into its own Dataset. A
+      candidate's Dataset is assembled from those with add_features_from onto
+      a constant column (which is never split on), so only the merge is paid
+      per candidate.
+    - XGBoost: one QuantileDMatrix per fold holds all columns. A candidate is
+      trained on it with feature_weights 1 on the subset and 0 elsewhere and
+      colsample_bytree covering exactly the subset size, so every tree
+      samples exactly the subset. Histograms still span the whole matrix, so
+      this pays off when rows dominate columns.
+
+    Bins are computed per feature, so the models equal those that
+    cross_val_scores fits on the column subset: candidates are trained in
+    the canonical column order of fit_columns (whatever order the selector
+    listed them in) and losses are cached under the same keys. This requires
+    colsample_bytree=1 and subsample=1 on the estimator: column and row
+    sampling would draw different random numbers on the full matrix.
+    """
+
+    def __init__(self, estimator, loss_fn, X, y, cv, fold_cache=None, score_cache=None, cache_stats=None):
+        self.estimator = estimator
+        self.loss_fn = loss_fn
+        self.columns = fit_columns(X, None, fold_cache)
+        self._col_index = {col: i for i, col in enumerate(self.columns)}
+        self.score_cache = score_cache if fold_cache is not None else None
+        self.cache_stats = cache_stats
+        self._fingerprint = fold_cache.fingerprint if fold_cache is not None else None
+        self._lightgbm = isinstance(estimator, LightgbmConfig)
+
+        self._folds = []
+        for X_tr, X_val, y_tr, y_val in scaled_folds(X, y, cv, fold_cache, self.columns):
+            X_tr, X_val = np.asarray(X_tr), np.asarray(X_val)
+            if self._lightgbm:
+                import lightgbm as lgb
+                params = self._lgb_params(estimator)
+                train = [lgb.Dataset(X_tr[:, [j]], np.asarray(y_tr), params=params).construct()
+                         for j in range(X_tr.shape[1])]
+            else:
+                import xgboost as xgb
+                train = xgb.QuantileDMatrix(X_tr, np.asarray(y_tr), max_bin=estimator.kwargs.get('max_bin'))
+            self._folds.append({'train': train, 'y_train': np.asarray(y_tr), 'X_val': X_val, 'y_val': y_val})
+
+    @staticmethod
+    def supports(estimator) -> bool:
+        """
+        True for booster wrappers whose fit a feature mask reproduces exactly
+        (no early stopping, column or row sampling)
+        """
+        if getattr(estimator, 'early_stopping_rounds', None) is not None:
+            return False
+        if not isinstance(estimator, (LightgbmConfig, XGBoostConfig)):
+            return False
+        if estimator.subsample < 1.0 or any(estimator.kwargs.get(name, 1.0) < 1.0 for name in _SAMPLING_KWARGS):
+            return False
+        if isinstance(estimator, LightgbmConfig):
+            return estimator.colsample_bytree == 1.0
+        if isinstance(estimator, XGBoostConfig):
+            return estimator.colsample_bytree == 1.0 and estimator.kwargs.get('tree_method', 'hist') == 'hist'
+        return False
+
+    @staticmethod
+    def _lgb_params(model) -> dict:
+        """Native LightGBM parameters of a LightgbmConfig (as its LGBMRegressor passes them)"""
+        return {
+            'objective': model._get_lgb_objective(model.loss_fn),
+            'learning_rate': model.learning_rate,
+            'max_depth': model.max_depth,
+            'num_leaves': model.num_leaves,
+            'subsample': model.subsample,
+            'colsample_bytree': model.colsample_bytree,
+            'random_state': model.random_state,
+            'verbose': -1,
+            **model.kwargs
+        }
+
+    @staticmethod
+    def _xgb_params(model) -> dict:
+        """Native XGBoost parameters of an XGBoostConfig (as its XGBRegressor passes them)"""
+        return {
+            'objective': model._get_xgb_objective(model.loss_fn),
+            'learning_rate': model.learning_rate,
+            'max_depth': model.max_depth,
+            'subsample': model.subsample,
+            'random_state': model.random_state,
+            'tree_method': 'hist',
+            **model.kwargs
+        }
+
+    def _fit_predict(self, fold, model, idx):
+        """Validation predictions of model trained on the fold restricted to column positions idx"""
+        if self._lightgbm:
+            import lightgbm as lgb
+            params = self._lgb_params(model)
+            train = lgb.Dataset(np.zeros((len(fold['y_train']), 1)), fold['y_train'], params=params).construct()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')  # Merging warns about categorical features, there are none
+                for j in idx:
+                    train.add_features_from(fold['train'][j])
+            booster = lgb.train(params, train, num_boost_round=model.n_estimators)
+            X_val = np.column_stack([np.zeros(len(fold['X_val'])), fold['X_val'][:, idx]])
+            return booster.predict(X_val)
+
+        import xgboost as xgb
+        params = self._xgb_params(model)
+        weights = np.zeros(len(self.columns), dtype=np.float32)
+        weights[idx] = 1.0
+        fold['train'].set_info(feature_weights=weights)
+        # Half a column of slack so rounding inside XGBoost samples exactly len(idx) columns
+        params['colsample_bytree'] = min(1.0, (len(idx) + 0.5) / len(self.columns))
+        booster = xgb.train(params, fold['train'], num_boost_round=model.n_estimators)
+        return booster.inplace_predict(fold['X_val'])
+
+    def fold_losses(self, columns, params=None, bound=None) -> list:
+        """
+        Per-fold validation losses of the estimator (with params applied) on columns.
+
+        Fits in the canonical column order and uses the same score cache keys
+        as cross_val_scores, and stops once bound.should_stop(fold_losses) is
+        True (see FoldBound).
+        """
+        params = params or {}
+        model = self.estimator.__class__(**{**self.estimator.get_params(), **params})
+        columns = sorted(columns, key=self._col_index.__getitem__)
+        idx = [self._col_index[col] for col in columns]
+
+        keys = None
+        if self.score_cache is not None:
+            keys = [self.score_cache.key(self._fingerprint, columns, self.estimator, params, self.loss_fn,
+                                         fold_idx) for fold_idx in range(len(self._folds))]
+
+        losses = []
+        for fold_idx, fold in enumerate(self._folds):
+            loss = self.score_cache.get(keys[fold_idx]) if keys is not None else None
+            if self.cache_stats is not None and keys is not None:
+                self.cache_stats['hits' if loss is not None else 'misses'] += 1
+            if loss is None:
+                loss = self.loss_fn(fold['y_val'], self._fit_predict(fold, model, idx))
+                count_fit(cv_fold=True)
+                if keys is not None:
+                    self.score_cache.put(keys[fold_idx], loss)
+            losses.append(loss)
+            if bound is not None and bound.should_stop(losses):
+                break
+        return losses
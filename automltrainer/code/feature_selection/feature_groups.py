@@ -0,0 +1,63 @@
+from typing import Dict, List
+
+# One-hot encoded inputs of the housing data (building type and region dummies)
+DEFAULT_GROUP_PREFIXES = ('btype_', 'omr_de_')
+
+
+def infer_feature_groups(columns, prefixes=DEFAULT_GROUP_PREFIXES) -> Dict[str, List[str]]:
+    """
+    Group columns sharing one of the given prefixes; every other column is its own group.
+
+    Returns:
+        Ordered {group_name: columns}, named after the prefix (without the trailing '_')
+        for prefix groups and after the column otherwise
+    """
+    groups = {}
+    for col in columns:
+        prefix = next((p for p in prefixes if col.startswith(p)), None)
+        name = prefix.rstrip('_') if prefix is not None else col
+        groups.setdefault(name, []).append(col)
+    return groups
+
+
+def resolve_feature_groups(columns, feature_groups=None) -> Dict[str, List[str]]:
+    """
+    Candidate groups for a selector.
+
+    Args:
+        columns: Columns of the data the selector is fitted on
+        feature_groups: None (every column on its own), 'auto' (DEFAULT_GROUP_PREFIXES),
+                        a list of prefixes, or an explicit {group_name: columns} dict
+                        (columns not listed stay on their own)
+
+    Returns:
+        Ordered {group_name: columns} covering every column exactly once
+    """
+    columns = list(columns)
+    if feature_groups is None:
+        return {col: [col] for col in columns}
+    if feature_groups == 'auto':
+        return infer_feature_groups(columns)
+    if not isinstance(feature_groups, dict):
+        return infer_feature_groups(columns, tuple(feature_groups))
+
+    owner = {}
+    for name, group_columns in feature_groups.items():
+        for col in group_columns:
+            if col not in columns:
+                raise ValueError(f"Column '{col}' of feature group '{name}' is not in the data")
+            if col in owner:
+                raise ValueError(f"Column '{col}' is in feature groups '{owner[col]}' and '{name}'")
+            owner[col] = name
+    for name in feature_groups:
+        if name in columns and name not in owner:
+            raise ValueError(f"Feature group name '{name}' clashes with an ungrouped column")
+
+    # Groups are ordered by their first column, so results follow column order as without groups
+    groups = {}
+    for col in columns:
+        name = owner.get(col, col)
+        if name in groups:
+            continue
+        groups[name] = [c for c in columns if owner.get(c, c) == name]
+    return groups
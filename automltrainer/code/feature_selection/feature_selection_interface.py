@@ -1,13 +1,16 @@
+import time
 from abc import ABC, abstractmethod
 import pandas as pd
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 from typing import Any, Tuple
+from helper.cross_validation import CandidateScoringMixin
 
-class FeatureSelectionInterface(ABC, BaseEstimator, TransformerMixin):
+class FeatureSelectionInterface(CandidateScoringMixin, ABC, BaseEstimator, TransformerMixin):
     """Abstract interface for feature selection methods."""
     
-    def __init__(self, estimator, loss_fn, cv=None, verbose=0):
+    def __init__(self, estimator, loss_fn, cv=None, verbose=0, fold_cache=None, checkpoint=None, budget=None,
+                 score_cache=None):
         """
         Initialize feature selector.
         
@@ -16,13 +19,24 @@ class FeatureSelectionInterface(ABC, BaseEstimator, TransformerMixin):
             loss_fn: Loss function to optimize
             cv: Cross-validation splitter
             verbose: Verbosity level
+            fold_cache: Optional shared FoldCache with pre-scaled CV folds
+            budget: Optional Budget; when exhausted the best result so far is kept
+            checkpoint: Optional StageCheckpoint to persist progress and resume from
+            score_cache: Optional ScoreCache to reuse fold losses of identical fits
         """
         self.estimator = estimator
         self.loss_fn = loss_fn
         self.cv = cv
         self.verbose = verbose
+        self.fold_cache = fold_cache
+        self.checkpoint = checkpoint
+        self.budget = budget
+        self.score_cache = score_cache
+        self._score_cache_stats = {'hits': 0, 'misses': 0}
+        self._n_skipped_fits = 0
         self.selected_features_ = None
         self.best_score_ = None
+        self.score_trace_ = []
     
     @abstractmethod
     def fit(self, X: pd.DataFrame, y: pd.Series) -> 'FeatureSelectionInterface':
@@ -75,3 +89,35 @@ class FeatureSelectionInterface(ABC, BaseEstimator, TransformerMixin):
     def feature_names(self) -> list:
         """Names of selected features."""
         return self.selected_features_ if self.selected_features_ is not None else []
+
+    def _trace_step(self, n_features: int, changed, step_start: float):
+        """Append a completed step (feature count, score, changed feature or None, duration) to score_trace_"""
+        self.score_trace_.append({
+            'n_features': n_features,
+            'score': float(self.best_score_),
+            'changed': changed,
+            'time_s': time.time() - step_start
+        })
+
+    def to_artifact(self) -> dict:
+        """JSON-serialisable summary of the fitted selection (see helper/selection_store.py)"""
+        if self.selected_features_ is None:
+            raise ValueError(f"{type(self).__name__} not fitted. Call fit() first.")
+        return {
+            'selector': type(self).__name__,
+            'selected_features': list(self.selected_features_),
+            'selected_groups': getattr(self, 'selected_groups_', None),
+            'best_score': float(self.best_score_) if self.best_score_ is not None else None,
+            'score_trace': self.score_trace_,
+            'estimator': type(self.estimator).__name__,
+            'estimator_params': self.estimator.get_params(),
+        }
+
+    def load_artifact(self, artifact: dict) -> 'FeatureSelectionInterface':
+        """Restore a fitted selection from to_artifact() output instead of fitting"""
+        self.selected_features_ = list(artifact['selected_features'])
+        self.best_score_ = artifact['best_score']
+        self.score_trace_ = artifact['score_trace']
+        if artifact.get('selected_groups') is not None:
+            self.selected_groups_ = artifact['selected_groups']
+        return self
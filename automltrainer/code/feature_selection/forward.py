@@ -1,84 +1,162 @@
+import time
+
 import pandas as pd
 import numpy as np
 from .feature_selection_interface import FeatureSelectionInterface
+from .linear_fast_path import LinearSubsetScorer
+from .booster_fast_path import BoosterSubsetScorer
+from .feature_groups import resolve_feature_groups
+from .local_search import LocalSearchMixin
 
-class ForwardFeatureSelector(FeatureSelectionInterface):
+class ForwardFeatureSelector(LocalSearchMixin, FeatureSelectionInterface):
     """Forward feature selection - starts with no features and adds them one by one."""
     
-    def __init__(self, estimator, loss_fn, cv=None, verbose=0, max_features=None):
-        super().__init__(estimator, loss_fn, cv, verbose)
+    def __init__(self, estimator, loss_fn, cv=None, verbose=0, max_features=None, fold_cache=None,
+                 checkpoint=None, budget=None, score_cache=None, linear_fast_path=True, feature_groups=None,
+                 early_abandon_margin=None, booster_fast_path=False, initial_features=None):
+        """
+        Args:
+            linear_fast_path: Score the candidates of 'linear' / 'ridge' LinearRegressionConfig
+                              estimators in closed form (see linear_fast_path.py)
+            feature_groups: Add whole groups instead of single columns: 'auto' (one-hot
+                            prefixes btype_ / omr_de_), a list of prefixes or {name: columns},
+                            see feature_groups.py
+            early_abandon_margin: Stop scoring a candidate once it cannot beat the step's best,
+                                  see BackwardFeatureSelector. None disables it.
+            booster_fast_path: Performance mode for XGBoost / LightGBM estimators: bin every
+                               fold once and train candidates on it through feature masks
+                               instead of rebuilding the data per candidate. Gives the same
+                               losses and selection as refitting (both fit in the canonical
+                               column order); boosters with row or column sampling or early
+                               stopping are refitted, see booster_fast_path.py
+            initial_features: Warm start from these features with a drop / re-add local search
+                              instead of adding from scratch, see BackwardFeatureSelector
+        """
+        super().__init__(estimator, loss_fn, cv, verbose, fold_cache, checkpoint, budget, score_cache)
         self.max_features = max_features
+        self.linear_fast_path = linear_fast_path
+        self.feature_groups = feature_groups
+        self.early_abandon_margin = early_abandon_margin
+        self.booster_fast_path = booster_fast_path
+        self.initial_features = initial_features
+        self.selected_groups_ = None
     
     def fit(self, X: pd.DataFrame, y: pd.Series) -> 'ForwardFeatureSelector':
         """Fit using forward feature selection with proper CV scaling."""
-        from helper.helper import helper
-        
         available_features = list(X.columns)
         selected_features = []
         self.best_score_ = float('-inf') if self.loss_fn.higher_is_better else float('inf')
+        finished = False
+        self._n_skipped_fits = 0
+        self.score_trace_ = []
         
-        if self.verbose > 0:
-            print(f"Starting forward feature selection with {len(available_features)} available features")
+        # Continue from the last completed step of an interrupted run
+        state = self.checkpoint.load_state() if self.checkpoint is not None else None
+        if state is not None:
+            selected_features = state['selected_features']
+            self.best_score_ = state['best_score']
+            finished = state['finished']
+            self.score_trace_ = state.get('score_trace', [])
+            if self.verbose > 0:
+                print(f"Resuming forward feature selection with {len(selected_features)} selected features")
         
         max_features = self.max_features or len(available_features)
+
+        # Candidates are groups of columns (single columns unless feature_groups is given)
+        groups = resolve_feature_groups(available_features, self.feature_groups)
+        selected_groups = [name for name, cols in groups.items() if all(c in selected_features for c in cols)]
+
+        scorer = None
+        if self.linear_fast_path and LinearSubsetScorer.supports(self.estimator) and not finished:
+            scorer = LinearSubsetScorer(self.estimator, self.loss_fn, X, y, self.cv, self.fold_cache)
+        fold_scorer = None
+        if self.booster_fast_path and BoosterSubsetScorer.supports(self.estimator) and not finished:
+            fold_scorer = BoosterSubsetScorer(self.estimator, self.loss_fn, X, y, self.cv, self.fold_cache,
+                                              self.score_cache, self._score_cache_stats).fold_losses
+
+        if self.initial_features is not None:
+            # Warm start: the additions below only run if the budget ran out (and then score nothing)
+            if state is None:
+                selected_groups = self._seed_groups(groups, self.initial_features, self.verbose)
+            if self.verbose > 0:
+                print(f"Starting local search from {len(selected_groups)} seed features")
+            selected_groups, finished = self._local_search(X, y, groups, selected_groups, finished, scorer,
+                                                           abandon_margin=self.early_abandon_margin,
+                                                           fold_scorer=fold_scorer, max_features=max_features)
+            selected_features = [f for name in selected_groups for f in groups[name]]
+        elif self.verbose > 0:
+            print(f"Starting forward feature selection with {len(available_features)} available features")
         
-        while len(selected_features) < max_features and len(selected_features) < len(available_features):
-            scores = {}
-            remaining_features = [f for f in available_features if f not in selected_features]
+        while not finished and len(selected_features) < max_features and len(selected_groups) < len(groups):
+            step_start = time.time()
+            # Groups whose columns would take the selection past max_features are not candidates
+            remaining_groups = [name for name in groups if name not in selected_groups
+                                and len(selected_features) + len(groups[name]) <= max_features]
+            if not remaining_groups:
+                finished = True
+                break
+            
+            if scorer is not None:
+                step_scores = self._charge_budget(
+                    scorer.forward_scores(selected_features, [groups[name] for name in remaining_groups]))
+            else:
+                # Average CV score, using cross-validation with proper scaling per split
+                candidates = [(selected_features + groups[name], None) for name in remaining_groups]
+                step_scores = self._score_candidates(X, y, candidates, abandon_margin=self.early_abandon_margin,
+                                                     abandon_reference=self.best_score_, fold_scorer=fold_scorer)
+            scores = dict(zip(remaining_groups, step_scores))
             
-            for feature_to_add in remaining_features:
-                temp_features = selected_features + [feature_to_add]
-                temp_X = X[temp_features]
-                
-                # Cross-validation with proper scaling per split
-                cv_scores = []
-                
-                for train_idx, val_idx in self.cv.split(temp_X):
-                    X_train_cv = temp_X.iloc[train_idx]
-                    X_val_cv = temp_X.iloc[val_idx]
-                    y_train_cv = y.iloc[train_idx]
-                    y_val_cv = y.iloc[val_idx]
-                    
-                    # Scale this specific split
-                    data_scaler = helper()
-                    X_train_scaled, X_val_scaled = data_scaler.scale(X_train_cv, X_val_cv)
-                    
-                    # Clone estimator to avoid fitting issues
-                    temp_estimator = self.estimator.__class__(**self.estimator.get_params())
-                    temp_estimator.fit(X_train_scaled, y_train_cv)
-                    predictions = temp_estimator.predict(X_val_scaled)
-                    
-                    score = self.loss_fn(y_val_cv, predictions)
-                    cv_scores.append(score)
-                
-                # Average CV score
-                scores[feature_to_add] = np.mean(cv_scores)
+            if not scores:
+                break  # Budget used up before this step evaluated any candidate
             
             # Find best feature to add
             if self.loss_fn.higher_is_better:
                 best_feature_to_add = max(scores, key=scores.get)
-                improvement = scores[best_feature_to_add] > self.best_score_
             else:
                 best_feature_to_add = min(scores, key=scores.get)
-                improvement = scores[best_feature_to_add] < self.best_score_
             
-            if improvement or len(selected_features) == 0:  # Always add first feature
+            if self._is_improvement(scores[best_feature_to_add]) or len(selected_features) == 0:  # Always add first feature
                 self.best_score_ = scores[best_feature_to_add]
-                selected_features.append(best_feature_to_add)
+                selected_groups.append(best_feature_to_add)
+                selected_features.extend(groups[best_feature_to_add])
                 if self.verbose > 0:
                     print(f"Added feature: {best_feature_to_add}, CV Score: {self.best_score_:.4f}, Selected: {len(selected_features)}")
+            elif len(scores) < len(remaining_groups):
+                break  # Budget ran out mid-step; the unscored additions may still improve, so a resumed run finishes it
             else:
                 if self.verbose > 0:
                     print("No improvement found, stopping feature selection")
+                finished = True
+            
+            self._trace_step(len(selected_features), None if finished else best_feature_to_add, step_start)
+            self._save_step(selected_features, finished)
+            
+            if self._budget_exhausted():
+                if self.verbose > 0:
+                    print("Budget exhausted, keeping the best feature set found so far")
                 break
         
+        self._save_step(selected_features, finished or not self._budget_exhausted())
         self.selected_features_ = selected_features
+        self.selected_groups_ = selected_groups
         
         if self.verbose > 0:
             print(f"Forward feature selection complete. Selected {len(self.selected_features_)} features")
+            if self.n_skipped_fits_:
+                print(f"Early abandonment skipped {self.n_skipped_fits_} fold fits")
         
         return self
     
+    def _save_step(self, selected_features, finished):
+        """Persist the selector state after a completed step"""
+        if self.checkpoint is not None:
+            self.checkpoint.save_state({
+                'selected_features': selected_features,
+                'best_score': self.best_score_,
+                'finished': finished,
+                'score_trace': self.score_trace_
+            })
+    
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
         """Transform dataset using selected features."""
         if self.selected_features_ is None:
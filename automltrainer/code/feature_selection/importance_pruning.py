@@ -0,0 +1,161 @@
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from helper.cross_validation import fit_on_fold, scaled_folds
+from helper.profiler import count_fit
+from .feature_selection_interface import FeatureSelectionInterface
+from .feature_groups import resolve_feature_groups
+
+
+class ImportancePruningSelector(FeatureSelectionInterface):
+    """Recursive feature elimination driven by the model's own importances.
+
+    Every round fits the estimator once per CV fold on the current features.
+    The same fits give the round's CV score and the feature importances
+    (averaged over folds after normalising each fold to sum 1). The least
+    important drop_fraction of the features is then removed. Selection stops
+    when the CV score has not improved for `patience` rounds (a plateau) or
+    min_features is reached, and keeps the best scoring feature set.
+
+    This needs O(log p) rounds of one fit per fold instead of the p refits
+    per step of BackwardFeatureSelector. The estimator must provide
+    get_feature_importance(importance_type, X), as the XGBoost, LightGBM and
+    linear model wrappers do.
+    """
+
+    def __init__(self, estimator, loss_fn, cv=None, verbose=0, fold_cache=None, checkpoint=None, budget=None,
+                 score_cache=None, importance_type='gain', drop_fraction=0.2, min_features=1, patience=2, tolerance=0.0,
+                 feature_groups=None):
+        """
+        Args:
+            importance_type: 'gain', 'split' or 'shap' (mean absolute contribution on the validation fold)
+            drop_fraction: Fraction of the current features removed per round (at least one)
+            min_features: Never go below this many features (groups, with feature_groups)
+            patience: Stop after this many rounds without a CV improvement
+            tolerance: Minimum CV improvement that counts as one
+            feature_groups: Prune whole groups (importance = sum over the group's columns):
+                            'auto', a list of prefixes or {name: columns}, see feature_groups.py
+        """
+        super().__init__(estimator, loss_fn, cv, verbose, fold_cache, checkpoint, budget, score_cache)
+        if not 0 < drop_fraction < 1:
+            raise ValueError("drop_fraction must be between 0 and 1")
+        self.importance_type = importance_type
+        self.drop_fraction = drop_fraction
+        self.min_features = min_features
+        self.patience = patience
+        self.tolerance = tolerance
+        self.feature_groups = feature_groups
+
+    def _evaluate(self, X, y, features):
+        """Mean CV loss and fold-averaged normalised importances from one fit per fold"""
+        losses, importances = [], []
+        for X_train_scaled, X_val_scaled, y_train_cv, y_val_cv in scaled_folds(X, y, self.cv, self.fold_cache,
+                                                                              features):
+            model = self.estimator.__class__(**self.estimator.get_params())
+            fit_on_fold(model, X_train_scaled, y_train_cv, X_val_scaled, y_val_cv)
+            count_fit(cv_fold=True)
+            losses.append(self.loss_fn(y_val_cv, model.predict(X_val_scaled)))
+
+            importance = np.asarray(model.get_feature_importance(importance_type=self.importance_type,
+                                                                 X=X_val_scaled), dtype=float)
+            total = importance.sum()
+            importances.append(importance / total if total > 0 else importance)
+        if self.budget is not None:
+            self.budget.consume()
+        return float(np.mean(losses)), np.mean(importances, axis=0)
+
+    def _is_better(self, score, reference):
+        if self.loss_fn.higher_is_better:
+            return score > reference + self.tolerance
+        return score < reference - self.tolerance
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> 'ImportancePruningSelector':
+        """Prune features round by round using the fitted models' importances"""
+        features = list(X.columns)
+        best_features = list(features)
+        self.best_score_ = None
+        self.score_trace_ = []
+        rounds_without_improvement = 0
+        finished = False
+
+        # Continue from the last completed round of an interrupted run
+        state = self.checkpoint.load_state() if self.checkpoint is not None else None
+        if state is not None:
+            features, best_features = state['features'], state['best_features']
+            self.best_score_ = state['best_score']
+            self.score_trace_ = state['score_trace']
+            rounds_without_improvement = state['rounds_without_improvement']
+            finished = state['finished']
+            if self.verbose > 0:
+                print(f"Resuming importance pruning with {len(features)} features")
+
+        if self.verbose > 0:
+            print(f"Starting importance pruning ({self.importance_type}) with {len(features)} features")
+
+        while not finished:
+            if self._budget_exhausted():
+                if self.verbose > 0:
+                    print("Budget exhausted, keeping the best feature set found so far")
+                break
+
+            round_start = time.time()
+            score, importance = self._evaluate(X, y, features)
+            self.score_trace_.append({'n_features': len(features), 'score': score, 'time_s': time.time() - round_start})
+
+            if self.best_score_ is None or self._is_better(score, self.best_score_):
+                self.best_score_ = score
+                best_features = list(features)
+                rounds_without_improvement = 0
+            else:
+                rounds_without_improvement += 1
+
+            if self.verbose > 0:
+                print(f"Round {len(self.score_trace_)}: {len(features)} features, CV Score: {score:.4f}")
+
+            # Candidates are groups of columns (single columns unless feature_groups is given)
+            importance_of = dict(zip(features, importance))
+            groups = resolve_feature_groups(features, self.feature_groups)
+            group_importance = [sum(importance_of[col] for col in cols) for cols in groups.values()]
+            group_names = list(groups)
+
+            if rounds_without_improvement >= self.patience or len(groups) <= self.min_features:
+                finished = True
+            else:
+                # Drop the least important groups (equal importances: earlier column first)
+                n_drop = max(1, math.floor(len(groups) * self.drop_fraction))
+                n_drop = min(n_drop, len(groups) - self.min_features)
+                order = np.argsort(group_importance, kind='stable')
+                dropped = {col for i in order[:n_drop] for col in groups[group_names[i]]}
+                if self.verbose > 1:
+                    print(f"  Dropping: {sorted(group_names[i] for i in order[:n_drop])}")
+                features = [f for f in features if f not in dropped]
+
+            self._save_round(features, best_features, rounds_without_improvement, finished)
+
+        self.selected_features_ = best_features
+
+        if self.verbose > 0:
+            print(f"Importance pruning complete. Selected {len(self.selected_features_)} features "
+                  f"after {len(self.score_trace_)} rounds")
+
+        return self
+
+    def _save_round(self, features, best_features, rounds_without_improvement, finished):
+        """Persist the selector state after a completed round"""
+        if self.checkpoint is not None:
+            self.checkpoint.save_state({
+                'features': features,
+                'best_features': best_features,
+                'best_score': self.best_score_,
+                'score_trace': self.score_trace_,
+                'rounds_without_improvement': rounds_without_improvement,
+                'finished': finished
+            })
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Transform dataset using selected features."""
+        if self.selected_features_ is None:
+            raise ValueError("ImportancePruningSelector not fitted. Call fit() first.")
+        return X[self.selected_features_]
@@ -0,0 +1,159 @@
+import numpy as np
+from helper.cross_validation import scaled_folds
+from models.linear_regression import LinearRegressionConfig
+
+
+class LinearSubsetScorer:
+    """Closed-form CV scoring of feature subsets for linear / ridge regression.
+
+    Every fold's centred Gram matrix X'X and X'y are computed once for all
+    columns. A candidate subset S is then solved from G[S, S] (+ alpha*I)
+    instead of refitting the model, and a whole backward or forward step is
+    scored from one factorisation of the current subset:
+
+    - dropping feature j: coef[-j] = coef - A[:, j] * coef[j] / A[j, j] with
+      A = inverse(G[S, S] + alpha*I) (block inverse downdate); a group J of
+      columns: coef[K] - A[K, J] inverse(A[J, J]) coef[J]
+    - adding feature j: Schur complement G[j, j] + alpha - G[j, S] A G[S, j]
+
+    The validation predictions of all candidates come from one matrix product
+    per fold. Singular systems (ordinary least squares with collinear columns,
+    e.g. a full set of one-hot dummies) are solved per candidate with the
+    minimum-norm least squares solution, which is what sklearn returns too.
+    """
+
+    # Condition number above which the inverse of G[S, S] is not trusted
+    MAX_CONDITION = 1e10
+
+    def __init__(self, estimator, loss_fn, X, y, cv, fold_cache=None):
+        self.loss_fn = loss_fn
+        self.alpha = estimator.alpha if estimator.model_type == 'ridge' else 0.0
+        self.fit_intercept = estimator.fit_intercept
+        self.columns = list(X.columns)
+        self._col_index = {col: i for i, col in enumerate(self.columns)}
+
+        self._folds = []
+        for X_tr, X_val, y_tr, y_val in scaled_folds(X, y, cv, fold_cache):
+            X_tr = np.asarray(X_tr, dtype=np.float64)
+            X_val = np.asarray(X_val, dtype=np.float64)
+            y_tr = np.asarray(y_tr, dtype=np.float64)
+            if self.fit_intercept:
+                x_mean, y_mean = X_tr.mean(axis=0), y_tr.mean()
+            else:
+                x_mean, y_mean = np.zeros(X_tr.shape[1]), 0.0
+            X_c = X_tr - x_mean
+            self._folds.append({
+                'gram': X_c.T @ X_c,
+                'xty': X_c.T @ (y_tr - y_mean),
+                'X_val': X_val - x_mean,
+                'y_mean': y_mean,
+                'y_val': np.asarray(y_val),
+            })
+
+    @staticmethod
+    def supports(estimator) -> bool:
+        """True for estimators whose fit this scorer reproduces exactly"""
+        return isinstance(estimator, LinearRegressionConfig) and estimator.model_type in ('linear', 'ridge')
+
+    def _system(self, fold, idx):
+        """G[S, S] + alpha*I and X'y[S] for the column positions idx"""
+        G = fold['gram'][np.ix_(idx, idx)]
+        if self.alpha:
+            G = G + self.alpha * np.eye(len(idx))
+        return G, fold['xty'][idx]
+
+    def _inverse(self, G):
+        """Inverse of G, or None when it is too ill-conditioned to downdate/update"""
+        if len(G) == 0:
+            return G.copy()
+        if np.linalg.cond(G) > self.MAX_CONDITION:
+            return None
+        return np.linalg.inv(G)
+
+    def _solve(self, fold, idx):
+        """Coefficients for the column positions idx (minimum-norm when singular)"""
+        if len(idx) == 0:
+            return np.zeros(0)
+        G, b = self._system(fold, idx)
+        return np.linalg.lstsq(G, b, rcond=None)[0]
+
+    def _losses(self, fold, idx_per_candidate, coefs):
+        """Validation loss per candidate from one batched prediction"""
+        idx_all = sorted({i for idx in idx_per_candidate for i in idx})
+        position = {i: k for k, i in enumerate(idx_all)}
+        W = np.zeros((len(idx_all), len(coefs)))
+        for c, (idx, coef) in enumerate(zip(idx_per_candidate, coefs)):
+            W[[position[i] for i in idx], c] = coef
+        predictions = fold['y_mean'] + fold['X_val'][:, idx_all] @ W
+        return [self.loss_fn(fold['y_val'], predictions[:, c]) for c in range(len(coefs))]
+
+    def backward_scores(self, selected_features, drop_groups=None) -> list:
+        """
+        Mean CV loss after dropping each candidate from selected_features, in order.
+
+        Args:
+            drop_groups: Lists of columns to drop together (default: every column on its own)
+        """
+        S = [self._col_index[col] for col in selected_features]
+        position = {col: k for k, col in enumerate(selected_features)}
+        if drop_groups is None:
+            drop_groups = [[col] for col in selected_features]
+        dropped = [[position[col] for col in group] for group in drop_groups]
+        candidates = [[S[k] for k in range(len(S)) if k not in set(J)] for J in dropped]
+
+        fold_losses = []
+        for fold in self._folds:
+            G, b = self._system(fold, S)
+            A = self._inverse(G)
+            if A is None:
+                coefs = [self._solve(fold, idx) for idx in candidates]
+            elif all(len(J) == 1 for J in dropped):
+                coef = A @ b
+                # Row j: coefficients of S without feature j (its own entry becomes 0)
+                downdated = coef[None, :] - A * (coef / np.diag(A))[:, None]
+                coefs = [np.delete(downdated[J[0]], J[0]) for J in dropped]
+            else:
+                coef = A @ b
+                coefs = []
+                for J in dropped:
+                    # Block downdate: coef[K] - A[K, J] A[J, J]^-1 coef[J] for the kept positions K
+                    K = [k for k in range(len(S)) if k not in set(J)]
+                    coefs.append(coef[K] - A[np.ix_(K, J)] @ np.linalg.solve(A[np.ix_(J, J)], coef[J]))
+            fold_losses.append(self._losses(fold, candidates, coefs))
+        return list(np.mean(fold_losses, axis=0))
+
+    def forward_scores(self, selected_features, add_groups) -> list:
+        """
+        Mean CV loss after adding each candidate to selected_features, in order.
+
+        Args:
+            add_groups: Lists of columns to add together (single columns use a rank-one update)
+        """
+        S = [self._col_index[col] for col in selected_features]
+        added = [[self._col_index[col] for col in group] for group in add_groups]
+        candidates = [S + R for R in added]
+        single = [R[0] for R in added if len(R) == 1]
+
+        fold_losses = []
+        for fold in self._folds:
+            G, b = self._system(fold, S)
+            A = self._inverse(G)
+            if A is None:
+                coefs = [self._solve(fold, idx) for idx in candidates]
+            else:
+                coef = A @ b
+                U = fold['gram'][np.ix_(S, single)]
+                AU = A @ U
+                schur = fold['gram'][single, single] + self.alpha - np.einsum('ij,ij->j', U, AU)
+                update = {r: k for k, r in enumerate(single)}
+                coefs = []
+                for R, idx in zip(added, candidates):
+                    k = update.get(R[0]) if len(R) == 1 else None
+                    if k is None or schur[k] <= fold['gram'][R[0], R[0]] * 1e-10 + 1e-12:
+                        # Groups, or a column collinear with the selected features: solve directly
+                        coefs.append(self._solve(fold, idx))
+                        continue
+                    c_r = (fold['xty'][R[0]] - U[:, k] @ coef) / schur[k]
+                    coefs.append(np.append(coef - AU[:, k] * c_r, c_r))
+            fold_losses.append(self._losses(fold, candidates, coefs))
+        return list(np.mean(fold_losses, axis=0))
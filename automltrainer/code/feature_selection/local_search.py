@@ -0,0 +1,124 @@
+import time
+
+# Relative margin a score must beat best_score_ by to count as an improvement, so that
+# rounding noise (e.g. a constant column, or the linear fast path against plain fits)
+# does not decide between two equal feature sets
+IMPROVEMENT_RTOL = 1e-9
+
+
+class LocalSearchMixin:
+    """
+    Warm-started selection: drop / re-add search around a seed feature set.
+
+    Used by BackwardFeatureSelector and ForwardFeatureSelector when they get
+    initial_features (e.g. the previous run's selected_features_). Every step
+    scores dropping each selected group and adding each unselected group and
+    applies the best move if it improves the CV score, so a seed close to the
+    optimum needs a few steps of about p candidates instead of the full
+    elimination or addition path.
+
+    Expects the host to provide the CandidateScoringMixin methods, best_score_,
+    loss_fn, verbose, _trace_step and _save_step.
+    """
+
+    @staticmethod
+    def _seed_groups(groups, initial_features, verbose=0):
+        """Groups with at least one column in the seed (columns no longer in the data are ignored)"""
+        seed = set(initial_features)
+        missing = seed - {col for cols in groups.values() for col in cols}
+        if missing and verbose > 0:
+            print(f"Ignoring {len(missing)} seed features not in the data: {sorted(missing)}")
+        return [name for name, cols in groups.items() if seed.intersection(cols)]
+
+    def _is_improvement(self, score) -> bool:
+        """Whether score beats best_score_ by more than IMPROVEMENT_RTOL (relative)"""
+        if self.best_score_ in (float('inf'), float('-inf')):
+            return score != self.best_score_
+        margin = IMPROVEMENT_RTOL * abs(self.best_score_)
+        if self.loss_fn.higher_is_better:
+            return score > self.best_score_ + margin
+        return score < self.best_score_ - margin
+
+    def _local_search(self, X, y, groups, selected_groups, finished, linear_scorer=None, n_jobs=1,
+                      abandon_margin=None, fold_scorer=None, max_features=None):
+        """
+        Improve selected_groups by single drops and re-adds until no move improves the CV score.
+
+        Args:
+            groups: Ordered {group_name: columns} of all candidates
+            selected_groups: Seed (or resumed) selection
+            finished: True when a resumed search had already converged
+            linear_scorer: LinearSubsetScorer for closed-form scoring, if supported
+            max_features: Adds that would exceed this many features are not tried
+
+        Returns:
+            (selected group names in column order, whether the search converged)
+        """
+        def features_of(names):
+            return [col for name in groups if name in names for col in groups[name]]
+
+        selected_groups = [name for name in groups if name in selected_groups]
+        if not selected_groups:
+            raise ValueError("initial_features does not contain any column of the data")
+
+        if self.best_score_ in (float('inf'), float('-inf')):
+            # Score of the seed itself, the reference every move has to beat
+            step_start = time.time()
+            seed_features = features_of(selected_groups)
+            if linear_scorer is not None:
+                seed_score = self._charge_budget(linear_scorer.forward_scores([], [seed_features]))
+            else:
+                seed_score = self._score_candidates(X, y, [(seed_features, None)], fold_scorer=fold_scorer)
+            if not seed_score:
+                return selected_groups, finished
+            self.best_score_ = seed_score[0]
+            self._trace_step(len(seed_features), None, step_start)
+            if self.verbose > 0:
+                print(f"Seed: {len(seed_features)} features, CV Score: {self.best_score_:.4f}")
+
+        while not finished and not self._budget_exhausted():
+            step_start = time.time()
+            selected_features = features_of(selected_groups)
+            drops = selected_groups if len(selected_groups) > 1 else []
+            adds = [name for name in groups if name not in selected_groups
+                    and (max_features is None or len(selected_features) + len(groups[name]) <= max_features)]
+            moves = [('Dropped', name) for name in drops] + [('Added', name) for name in adds]
+            if not moves:
+                break
+
+            if linear_scorer is not None:
+                step_scores = []
+                if drops:
+                    step_scores += linear_scorer.backward_scores(selected_features, [groups[n] for n in drops])
+                if adds:
+                    step_scores += linear_scorer.forward_scores(selected_features, [groups[n] for n in adds])
+                step_scores = self._charge_budget(step_scores)
+            else:
+                candidates = [(features_of(set(selected_groups) - {name}), None) for name in drops]
+                candidates += [(features_of(set(selected_groups) | {name}), None) for name in adds]
+                step_scores = self._score_candidates(X, y, candidates, n_jobs, abandon_margin, self.best_score_,
+                                                     fold_scorer)
+            if not step_scores:
+                break  # Budget used up before this step evaluated any candidate
+
+            # Ties go to the first move (drops before adds, then column order)
+            pick = max if self.loss_fn.higher_is_better else min
+            best = pick(range(len(step_scores)), key=step_scores.__getitem__)
+            action, name = moves[best]
+            if self._is_improvement(step_scores[best]):
+                self.best_score_ = step_scores[best]
+                selected_groups = [g for g in groups if (g in selected_groups) != (g == name)]
+                if self.verbose > 0:
+                    print(f"{action} feature: {name}, CV Score: {self.best_score_:.4f}, "
+                          f"Selected: {len(features_of(selected_groups))}")
+            elif len(step_scores) < len(moves):
+                break  # Budget ran out mid-step; the unscored moves may still improve, so a resumed run finishes it
+            else:
+                if self.verbose > 0:
+                    print("No improving move found, stopping local search")
+                finished = True
+
+            self._trace_step(len(features_of(selected_groups)), None if finished else name, step_start)
+            self._save_step(features_of(selected_groups), finished)
+
+        return selected_groups, finished
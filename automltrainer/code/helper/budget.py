@@ -0,0 +1,100 @@
+import time
+
+
+class Budget:
+    """Wall-clock and evaluation allowance for one stage of one model.
+
+    Selectors and tuners check `exhausted` before every candidate evaluation and
+    return their best result so far once it is used up. A limit of None means
+    unlimited.
+    """
+
+    def __init__(self, time_s=None, max_evaluations=None):
+        self.time_s = time_s
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0
+        self._start = time.time()
+
+    @property
+    def elapsed(self) -> float:
+        return time.time() - self._start
+
+    @property
+    def exhausted(self) -> bool:
+        if self.time_s is not None and self.elapsed >= self.time_s:
+            return True
+        return self.max_evaluations is not None and self.evaluations >= self.max_evaluations
+
+    def consume(self, n: int = 1):
+        """Count n candidate evaluations against the budget"""
+        self.evaluations += n
+
+    def usage(self) -> dict:
+        return {
+            'time_budget_s': self.time_s,
+            'time_used_s': self.elapsed,
+            'max_evaluations': self.max_evaluations,
+            'evaluations': self.evaluations,
+            'exhausted': self.exhausted
+        }
+
+
+class BudgetScheduler:
+    """Splits a run-wide time / evaluation budget across models and their stages.
+
+    Every stage gets an equal share of what is still left when it starts, so
+    budget unused by fast stages carries over to later ones. Time is measured
+    from the start of the run, which also accounts for data preparation and
+    final fits. With parallel=True every model runs in its own worker: each gets
+    the full wall-clock window and an equal share of the evaluations.
+    """
+
+    def __init__(self, model_names, stages, time_budget_s=None, max_evaluations=None, parallel=False,
+                 start_time=None):
+        self.time_budget_s = time_budget_s
+        self.max_evaluations = max_evaluations
+        self.parallel = parallel
+        self.n_models = len(model_names)
+        self.start_time = time.time() if start_time is None else start_time
+
+        self._pending = {name: list(stages) for name in model_names}
+        self._evaluations_used = {name: 0 for name in model_names}
+        self._usage = {name: {} for name in model_names}
+
+    @property
+    def enabled(self) -> bool:
+        return self.time_budget_s is not None or self.max_evaluations is not None
+
+    def stage_budget(self, model_name, stage) -> Budget:
+        """Budget for the given stage, to be reported back through finish()"""
+        if self.parallel:
+            n_pending = len(self._pending[model_name])
+            evaluations_left = None if self.max_evaluations is None else \
+                self.max_evaluations // self.n_models - self._evaluations_used[model_name]
+        else:
+            n_pending = sum(len(stages) for stages in self._pending.values())
+            evaluations_left = None if self.max_evaluations is None else \
+                self.max_evaluations - sum(self._evaluations_used.values())
+
+        n_pending = max(n_pending, 1)
+        time_s = None
+        if self.time_budget_s is not None:
+            time_s = max(self.time_budget_s - (time.time() - self.start_time), 0.0) / n_pending
+        max_evaluations = None
+        if evaluations_left is not None:
+            max_evaluations = max(evaluations_left, 0) // n_pending if n_pending > 1 else max(evaluations_left, 0)
+        return Budget(time_s, max_evaluations)
+
+    def finish(self, model_name, stage, budget: Budget):
+        """Record what a stage used and release its share"""
+        if stage in self._pending[model_name]:
+            self._pending[model_name].remove(stage)
+        self._evaluations_used[model_name] += budget.evaluations
+        self._usage[model_name][stage] = budget.usage()
+
+    def skip_model(self, model_name):
+        """Release the remaining stages of a model (failed or restored from a checkpoint)"""
+        self._pending[model_name] = []
+
+    def model_usage(self, model_name) -> dict:
+        return dict(self._usage[model_name])
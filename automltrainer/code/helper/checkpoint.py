@@ -0,0 +1,123 @@
+import json
+import os
+
+import joblib
+
+
+def _atomic_write(path, text):
+    """Write text to path so a crash never leaves a half-written file behind"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class StageCheckpoint:
+    """Progress of one stage (feature selection or tuning) of one model.
+
+    Holds a small JSON state (e.g. the selector's current feature set) and an
+    append-only log of evaluated candidates, so an interrupted stage can pick
+    up where it stopped.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._state_path = os.path.join(directory, 'state.json')
+        self._log_path = os.path.join(directory, 'candidates.jsonl')
+        self._candidates = {}
+
+        if os.path.exists(self._log_path):
+            with open(self._log_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Truncated last line from an interrupted write
+                    self._candidates[entry['key']] = entry['value']
+
+    @staticmethod
+    def key(obj) -> str:
+        """Stable string key for a candidate (param dict, feature list, ...)"""
+        return json.dumps(obj, sort_keys=True, default=str)
+
+    def load_state(self):
+        """Saved stage state, or None when the stage has not started"""
+        if not os.path.exists(self._state_path):
+            return None
+        with open(self._state_path) as f:
+            return json.load(f)
+
+    def save_state(self, state: dict):
+        _atomic_write(self._state_path, json.dumps(state, default=str))
+
+    def lookup(self, candidate):
+        """Recorded value for an already evaluated candidate, or None"""
+        return self._candidates.get(self.key(candidate))
+
+    def record(self, candidate, value):
+        key = self.key(candidate)
+        self._candidates[key] = value
+        with open(self._log_path, 'a') as f:
+            f.write(json.dumps({'key': key, 'value': value}) + '\n')
+
+    @property
+    def n_recorded(self) -> int:
+        return len(self._candidates)
+
+
+class RunCheckpoint:
+    """Run directory with completed model results and per-stage progress.
+
+    Layout:
+        meta.json                          data fingerprint and run settings
+        race.json                          model race outcome (survivors, rungs)
+        models/<model>.pkl                 completed model results (joblib)
+        stages/<model>/<stage>/...         StageCheckpoint files
+    """
+
+    def __init__(self, run_dir, fingerprint: str, resume: bool = False):
+        self.run_dir = run_dir
+        self.fingerprint = fingerprint
+        meta_path = os.path.join(run_dir, 'meta.json')
+
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if not resume:
+                raise ValueError(f"Run directory {run_dir} already holds a checkpoint. "
+                                 "Pass resume_from= to continue it or choose a new directory.")
+            if meta.get('fingerprint') != fingerprint:
+                raise ValueError(f"Checkpoint in {run_dir} was created for different data or settings")
+        elif resume:
+            raise ValueError(f"No checkpoint found in {run_dir}")
+        else:
+            os.makedirs(os.path.join(run_dir, 'models'), exist_ok=True)
+            _atomic_write(meta_path, json.dumps({'fingerprint': fingerprint}))
+
+    def _model_path(self, model_name):
+        return os.path.join(self.run_dir, 'models', f"{model_name}.pkl")
+
+    def load_model_result(self, model_name):
+        """Completed result for model_name, or None"""
+        path = self._model_path(model_name)
+        return joblib.load(path) if os.path.exists(path) else None
+
+    def save_model_result(self, model_name, result):
+        path = self._model_path(model_name)
+        joblib.dump(result, f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+    def load_race(self):
+        """Recorded model race summary (see ModelRace.summary), or None"""
+        path = os.path.join(self.run_dir, 'race.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save_race(self, summary: dict):
+        _atomic_write(os.path.join(self.run_dir, 'race.json'), json.dumps(summary, default=str))
+
+    def stage(self, model_name, stage_name) -> StageCheckpoint:
+        return StageCheckpoint(os.path.join(self.run_dir, 'stages', model_name, stage_name))
@@ -0,0 +1,528 @@
+import os
+
+import joblib
+import numpy as np
+from .checkpoint import StageCheckpoint
+from .profiler import count_fit
+from .score_cache import ScoreCache
+
+
+def cpu_share() -> int:
+    """
+    Cores available to this process.
+
+    In a worker of an outer process pool (run_automl(parallel_models=True))
+    joblib sets OMP_NUM_THREADS to the worker's share, cpu_count // n_workers,
+    so candidate pools started there split that share instead of every core.
+    """
+    try:
+        return max(1, min(int(os.environ['OMP_NUM_THREADS']), joblib.cpu_count()))
+    except (KeyError, ValueError):
+        return joblib.cpu_count()
+
+
+def fit_columns(X, columns=None, fold_cache=None) -> list:
+    """
+    The given columns (all by default) in canonical order: the fold cache's
+    column order, or X's without one. Fits and score cache keys use this
+    order, so a feature set scores the same whatever order a selector listed
+    it in (column-sampling boosters depend on the column order).
+    """
+    columns = list(X.columns) if columns is None else list(columns)
+    order = fold_cache.columns if fold_cache is not None else X.columns
+    position = {col: i for i, col in enumerate(order)}
+    return sorted(columns, key=position.__getitem__)
+
+
+def scaled_folds(X, y, cv, fold_cache=None, columns=None):
+    """
+    Yield scaled CV folds for X (restricted to columns, if given).
+
+    Uses the shared FoldCache when one is given, otherwise scales every split
+    with a fresh helper (the original behaviour).
+
+    Yields:
+        X_train_scaled, X_val_scaled, y_train, y_val
+    """
+    columns = list(X.columns) if columns is None else list(columns)
+    if fold_cache is not None:
+        # Column subsets come straight from the cache, X itself is never sliced
+        yield from fold_cache.folds(columns)
+        return
+
+    from helper.helper import helper
+
+    X = X[columns]
+    for train_idx, val_idx in cv.split(X):
+        data_scaler = helper()
+        X_train_scaled, X_val_scaled = data_scaler.scale(X.iloc[train_idx], X.iloc[val_idx])
+        yield X_train_scaled, X_val_scaled, y.iloc[train_idx], y.iloc[val_idx]
+
+
+def cross_val_scores(estimator, X, y, cv, loss_fn, params=None, fold_cache=None, columns=None,
+                     score_cache=None, cache_stats=None, stop_early=None, n_threads=None):
+    """
+    Fit a clone of estimator (with params applied) on every CV fold, using only
+    the given columns of X (all columns by default, in the order of fit_columns).
+
+    With a ScoreCache (requires fold_cache, whose fingerprint identifies the
+    folds) fold losses of identical earlier fits are reused; hits and misses
+    are added to cache_stats when given. stop_early(fold_losses) is asked after
+    every fold; when it returns True the remaining folds are skipped.
+    n_threads caps the model's own thread count, as in fit_fold_loss.
+
+    Returns:
+        List of per-fold losses (shorter than the number of folds when stopped early)
+    """
+    params = params or {}
+    columns = fit_columns(X, columns, fold_cache)
+    keys = None
+    if score_cache is not None and fold_cache is not None:
+        keys = [score_cache.key(fold_cache.fingerprint, columns, estimator, params, loss_fn, fold_idx)
+                for fold_idx in range(fold_cache.n_splits)]
+        cached = [score_cache.get(key) for key in keys]
+        if cache_stats is not None:
+            cache_stats['hits'] += sum(value is not None for value in cached)
+            cache_stats['misses'] += sum(value is None for value in cached)
+        if all(value is not None for value in cached):
+            return cached
+
+    cv_scores = []
+    for fold_idx, (X_train_scaled, X_val_scaled, y_train_cv, y_val_cv) in \
+            enumerate(scaled_folds(X, y, cv, fold_cache, columns)):
+        if keys is not None and cached[fold_idx] is not None:
+            cv_scores.append(cached[fold_idx])
+        else:
+            # Clone estimator to avoid fitting issues
+            model = estimator.__class__(**_model_params(estimator, params, n_threads))
+            fit_on_fold(model, X_train_scaled, y_train_cv, X_val_scaled, y_val_cv)
+            count_fit(cv_fold=True)
+            predictions = model.predict(X_val_scaled)
+            cv_scores.append(loss_fn(y_val_cv, predictions))
+            if keys is not None:
+                score_cache.put(keys[fold_idx], cv_scores[-1])
+        if stop_early is not None and stop_early(cv_scores):
+            break
+    return cv_scores
+
+
+def fit_on_fold(model, X_train, y_train, X_val, y_val):
+    """Fit model on a CV fold; boosters with early_stopping_rounds stop on the validation fold"""
+    if getattr(model, 'early_stopping_rounds', None) is not None:
+        return model.fit(X_train, y_train, eval_set=(X_val, y_val))
+    return model.fit(X_train, y_train)
+
+
+def _model_params(estimator, params, n_threads=None) -> dict:
+    """
+    Parameters of a clone of estimator with params applied; n_threads caps its
+    thread count (see BaseModelConfig.thread_param) unless that was set explicitly
+    """
+    model_params = {**estimator.get_params(), **(params or {})}
+    thread_param = getattr(estimator, 'thread_param', None)
+    if n_threads is not None and thread_param is not None and thread_param not in model_params:
+        model_params[thread_param] = n_threads
+    return model_params
+
+
+def fit_fold_loss(estimator, params, X_train, y_train, X_val, y_val, loss_fn, n_threads=None, prefixes=None):
+    """
+    Validation loss and early-stopping best iteration (None without early
+    stopping) of one fold fit of estimator (with params applied).
+
+    Module-level so process workers can run it. n_threads caps the model's own
+    thread count (see BaseModelConfig.thread_param) unless it was set explicitly.
+    With prefixes (values of BaseModelConfig.prefix_param, e.g. n_estimators)
+    the model is fitted once with the largest value and the list of
+    (loss, best iteration) for every value is returned.
+    """
+    model_params = _model_params(estimator, params, n_threads)
+    if prefixes is not None:
+        model_params[estimator.prefix_param] = max(prefixes)
+    model = estimator.__class__(**model_params)
+    fit_on_fold(model, X_train, y_train, X_val, y_val)
+    early_stopped = getattr(model, 'best_iteration_', None) is not None
+    if prefixes is not None:
+        return [(loss_fn(y_val, model.predict(X_val, **{estimator.prefix_param: value})),
+                 model.best_iteration_within(value) if early_stopped else None) for value in prefixes]
+    return loss_fn(y_val, model.predict(X_val)), model.best_iteration_ if early_stopped else None
+
+
+def _tail(values, n_rows):
+    """Last n_rows rows of an array, DataFrame or Series"""
+    return values.iloc[-n_rows:] if hasattr(values, 'iloc') else values[-n_rows:]
+
+
+class FoldBound:
+    """
+    Early-abandon rule for the candidates of one selector step.
+
+    After k of n folds a candidate's final mean loss is at least
+    (sum of its k fold losses + sum of floors of the remaining folds) / n,
+    where the floor of fold j is (1 - margin) times the loss the best complete
+    candidate so far (the incumbent) had on fold j. Once that bound is worse
+    than the incumbent's mean, the candidate cannot win and its remaining
+    folds are skipped. margin=1 (floor 0) is an exact bound for non-negative
+    losses; smaller margins skip more but may abandon a winner. Without the
+    incumbent's fold losses (a checkpointed or reference score) the floor is 0
+    for losses and nothing is abandoned when higher is better.
+    """
+
+    def __init__(self, n_folds: int, margin: float, higher_is_better: bool = False):
+        self.n_folds = n_folds
+        self.margin = margin
+        self.higher_is_better = higher_is_better
+        self.best = None
+        self.best_folds = None
+
+    def bound(self, fold_losses):
+        """Most optimistic final mean for the given partial fold losses (None if unknown)"""
+        if self.best_folds is not None:
+            factor = 1 + self.margin if self.higher_is_better else 1 - self.margin
+            rest = factor * sum(self.best_folds[len(fold_losses):])
+        elif self.higher_is_better:
+            return None
+        else:
+            rest = 0.0
+        return (sum(fold_losses) + rest) / self.n_folds
+
+    def should_stop(self, fold_losses) -> bool:
+        if self.best is None or len(fold_losses) >= self.n_folds:
+            return False
+        bound = self.bound(fold_losses)
+        if bound is None:
+            return False
+        return bound < self.best if self.higher_is_better else bound > self.best
+
+    def update(self, score, fold_losses=None):
+        """Take a completed candidate into account"""
+        improved = self.best is None or (score > self.best if self.higher_is_better else score < self.best)
+        if improved:
+            self.best = score
+            self.best_folds = list(fold_losses) if fold_losses is not None else None
+
+
+class CandidateScoringMixin:
+    """
+    Candidate scoring shared by feature selectors and hyperparameter tuners.
+
+    Expects the host to define estimator, loss_fn, cv, fold_cache, checkpoint, budget
+    and score_cache.
+    """
+
+    @property
+    def score_cache_stats_(self) -> dict:
+        """Score cache lookups made by this selector / tuner (per fold)"""
+        stats = self._score_cache_stats
+        total = stats['hits'] + stats['misses']
+        return {**stats, 'hit_rate': stats['hits'] / total if total else 0.0}
+
+    @property
+    def n_skipped_fits_(self) -> int:
+        """Fold fits skipped by early abandonment"""
+        return self._n_skipped_fits
+
+    def _n_folds(self) -> int:
+        return self.fold_cache.n_splits if self.fold_cache is not None else self.cv.get_n_splits()
+
+    def _fold_bound(self, margin, reference=None):
+        """
+        FoldBound for one step, or None when early abandonment is off.
+
+        Args:
+            reference: Score a candidate has to beat to matter (e.g. the current
+                       selection's score), so candidates are abandoned from the start
+        """
+        if margin is None:
+            return None
+        bound = FoldBound(self._n_folds(), margin, self.loss_fn.higher_is_better)
+        if reference is not None and np.isfinite(reference):
+            bound.update(reference)
+        return bound
+
+    def _cross_val_scores(self, X, y, columns=None, params=None, bound=None, n_threads=None) -> list:
+        """cross_val_scores with the host's folds and score cache"""
+        return cross_val_scores(self.estimator, X, y, self.cv, self.loss_fn, params=params,
+                                fold_cache=self.fold_cache, columns=columns,
+                                score_cache=self.score_cache, cache_stats=self._score_cache_stats,
+                                stop_early=bound.should_stop if bound is not None else None, n_threads=n_threads)
+
+    def _budget_exhausted(self) -> bool:
+        """True once the stage budget is used up (never without a budget)"""
+        return self.budget is not None and self.budget.exhausted
+
+    @staticmethod
+    def _candidate_key(columns=None, params=None) -> dict:
+        return {'features': sorted(columns) if columns is not None else None, 'params': params or {}}
+
+    def _record_score(self, candidate, cv_scores, bound=None) -> float:
+        n_folds = len(cv_scores) if bound is None else bound.n_folds
+        if len(cv_scores) < n_folds:
+            # Abandoned early: its optimistic bound, kept strictly worse than the step's best
+            score = float(bound.bound(cv_scores))
+            limit = float(np.nextafter(bound.best, -np.inf if bound.higher_is_better else np.inf))
+            score = min(score, limit) if bound.higher_is_better else max(score, limit)
+            self._n_skipped_fits = self.n_skipped_fits_ + n_folds - len(cv_scores)
+        else:
+            score = float(np.mean(cv_scores))
+            if bound is not None:
+                bound.update(score, cv_scores)
+        if self.budget is not None:
+            self.budget.consume()
+        if self.checkpoint is not None:
+            self.checkpoint.record(candidate, score)
+        return score
+
+    def _record_best_iteration(self, candidate, fold_rounds):
+        """Keep the mean early-stopping best iteration over a candidate's folds (when every fold has one)"""
+        if not fold_rounds or any(rounds is None for rounds in fold_rounds):
+            return
+        best_iteration = int(round(np.mean(fold_rounds)))
+        self._best_iterations[StageCheckpoint.key(candidate)] = best_iteration
+        if self.checkpoint is not None:
+            self.checkpoint.record({'best_iteration': candidate}, best_iteration)
+
+    def _score_candidate(self, X, y, columns=None, params=None, bound=None, fold_scorer=None,
+                         n_threads=None) -> float:
+        """
+        Mean CV loss of the estimator on the given columns of X with params applied.
+
+        Candidates already recorded in the stage checkpoint are not refitted. With
+        a FoldBound the candidate is abandoned as soon as it cannot beat the best
+        candidate of the step; its score is then the bound it failed.
+        fold_scorer(columns, params, bound) replaces the refits per fold (e.g.
+        BoosterSubsetScorer.fold_losses). n_threads caps the model's thread count.
+        """
+        candidate = self._candidate_key(columns, params)
+        if self.checkpoint is not None:
+            recorded = self.checkpoint.lookup(candidate)
+            if recorded is not None:
+                if bound is not None:
+                    bound.update(recorded)
+                return recorded
+
+        if fold_scorer is not None:
+            cv_scores = fold_scorer(columns, params, bound)
+        else:
+            cv_scores = self._cross_val_scores(X, y, columns=columns, params=params, bound=bound, n_threads=n_threads)
+        return self._record_score(candidate, cv_scores, bound)
+
+    def _charge_budget(self, scores) -> list:
+        """
+        Count scores computed in one batch (e.g. in closed form) against the budget.
+
+        Returns the prefix of scores the budget allows, as if they had been
+        evaluated one by one.
+        """
+        if self.budget is None:
+            return list(scores)
+        if self.budget.exhausted:
+            return []
+        if self.budget.max_evaluations is not None:
+            scores = scores[:self.budget.max_evaluations - self.budget.evaluations]
+        self.budget.consume(len(scores))
+        return list(scores)
+
+    def _score_candidates(self, X, y, candidates, n_jobs=1, abandon_margin=None, abandon_reference=None,
+                          fold_scorer=None, backend='threads') -> list:
+        """
+        Mean CV losses for a list of (columns, params) candidates, in candidate order.
+
+        With n_jobs != 1 the candidates are scored in chunks of n_jobs on a
+        thread pool (model fits release the GIL; the fold cache is shared, not
+        copied). backend='processes' always goes through
+        _score_candidates_processes (in this process for n_jobs=1), which also
+        shares fits along n_estimators. The budget is checked before every
+        candidate (sequential) or chunk (parallel); once it is exhausted only the
+        scores of the candidates evaluated so far are returned. With
+        abandon_margin set, candidates that cannot beat the best one so far (or
+        abandon_reference) stop early, see FoldBound. Like the process path,
+        every fit's thread count is capped at cpu_share() // n_jobs so the
+        workers do not oversubscribe the cores.
+        Candidates are scored sequentially with a fold_scorer (see _score_candidate),
+        which may keep state per fold.
+        """
+        bound = self._fold_bound(abandon_margin, abandon_reference)
+        n_workers = joblib.effective_n_jobs(n_jobs)
+        if fold_scorer is None and backend == 'processes':
+            return self._score_candidates_processes(X, y, candidates, n_workers, bound)
+        n_threads = max(1, cpu_share() // n_workers)
+        if n_workers == 1 or fold_scorer is not None:
+            scores = []
+            for columns, params in candidates:
+                if self._budget_exhausted():
+                    break
+                scores.append(self._score_candidate(X, y, columns=columns, params=params, bound=bound,
+                                                    fold_scorer=fold_scorer, n_threads=n_threads))
+            return scores
+
+        if self.fold_cache is not None:
+            self.fold_cache.build()  # Build the cached folds before the workers share them
+
+        scores = []
+        with joblib.Parallel(n_jobs=n_workers, prefer='threads') as parallel:
+            while len(scores) < len(candidates) and not self._budget_exhausted():
+                chunk_size = n_workers
+                if self.budget is not None and self.budget.max_evaluations is not None:
+                    chunk_size = min(chunk_size, self.budget.max_evaluations - self.budget.evaluations)
+                chunk = candidates[len(scores):len(scores) + chunk_size]
+
+                keys = [self._candidate_key(columns, params) for columns, params in chunk]
+                recorded = [self.checkpoint.lookup(key) if self.checkpoint is not None else None for key in keys]
+                pending = [i for i, value in enumerate(recorded) if value is None]
+                # The bound only changes between chunks, so every worker sees the same threshold
+                fold_scores = parallel(
+                    joblib.delayed(self._cross_val_scores)(X, y, columns=chunk[i][0], params=chunk[i][1], bound=bound,
+                                                         n_threads=n_threads)
+                    for i in pending
+                )
+                for i, value in enumerate(recorded):
+                    if value is not None and bound is not None:
+                        bound.update(value)
+                for i, cv_scores in zip(pending, fold_scores):
+                    recorded[i] = self._record_score(keys[i], cv_scores, bound)
+                scores.extend(recorded)
+        return scores
+
+    def _score_candidates_processes(self, X, y, candidates, n_workers, bound=None, folds=None,
+                                    train_fraction=None) -> list:
+        """
+        _score_candidates on a process pool, one task per candidate and fold.
+
+        Chunks of n_workers candidates (units, see below) are expanded into
+        their fold fits, which are dispatched together so the pool stays busy even when a chunk's
+        candidates differ in cost. Checkpoint lookups, score cache lookups and
+        recording happen in this process; workers only fit. Results are
+        gathered in candidate order, so they do not depend on n_workers.
+        Models with a thread count (boosters) get cpu_share() / n_workers
+        threads each so the workers do not oversubscribe the cores. Candidates
+        are not abandoned early: every fold of a chunk is fitted.
+
+        Consecutive candidates that differ only in the estimator's prefix_param
+        (n_estimators for boosters) count as one unit of a chunk and share one
+        fit per fold at the largest value; the smaller values are scored from
+        the same model (see fit_fold_loss). Order candidates so those runs are
+        adjacent to benefit.
+
+        With early stopping (estimator.early_stopping_rounds) every fold's
+        best iteration is kept next to its loss, in the score cache and, as
+        the mean over folds, per candidate (see HypertuningInterface.best_iteration_).
+
+        Reduced-resource evaluations (see SuccessiveHalvingTuner):
+
+        Args:
+            folds: Indices of the folds to fit (all by default)
+            train_fraction: Fit on this most recent fraction of every fold's training
+                            rows. Such fits are not stored in the score cache.
+        """
+        n_threads = max(1, cpu_share() // n_workers)
+        partial_rows = train_fraction is not None and train_fraction < 1
+        prefix_param = getattr(self.estimator, 'prefix_param', None)
+        units = self._prefix_units(candidates, prefix_param)
+        early_stopping = getattr(self.estimator, 'early_stopping_rounds', None) is not None
+
+        scores = []
+        next_unit = 0
+        with joblib.Parallel(n_jobs=n_workers, backend='loky') as parallel:
+            while next_unit < len(units) and not self._budget_exhausted():
+                chunk_units = units[next_unit:next_unit + n_workers]
+                next_unit += len(chunk_units)
+                start, stop = len(scores), chunk_units[-1][-1] + 1
+                if self.budget is not None and self.budget.max_evaluations is not None:
+                    stop = min(stop, start + self.budget.max_evaluations - self.budget.evaluations)
+                chunk = candidates[start:stop]
+                chunk_units = [[i - start for i in unit if i < stop] for unit in chunk_units]
+
+                keys = [self._candidate_key(columns, params) for columns, params in chunk]
+                if folds is not None or partial_rows:
+                    keys = [{**key, 'folds': folds, 'train_fraction': train_fraction} for key in keys]
+                recorded = [self.checkpoint.lookup(key) if self.checkpoint is not None else None for key in keys]
+                fold_losses = {i: {} for i, value in enumerate(recorded) if value is None}
+                fold_rounds = {i: {} for i in fold_losses}
+                cache_keys = {}
+                if self.score_cache is not None and self.fold_cache is not None and not partial_rows:
+                    for i in fold_losses:
+                        columns, params = chunk[i]
+                        features = fit_columns(X, columns, self.fold_cache)
+                        cache_keys[i] = [self.score_cache.key(self.fold_cache.fingerprint, features, self.estimator,
+                                                              params or {}, self.loss_fn, fold_idx)
+                                         for fold_idx in range(self.fold_cache.n_splits)]
+
+                tasks = []
+                for unit in chunk_units:
+                    pending = [i for i in unit if i in fold_losses]
+                    if not pending:
+                        continue
+                    columns = fit_columns(X, chunk[pending[0]][0], self.fold_cache)
+                    for fold_idx, (X_train, X_val, y_train, y_val) in \
+                            enumerate(scaled_folds(X, y, self.cv, self.fold_cache, columns)):
+                        if folds is not None and fold_idx not in folds:
+                            continue
+                        if partial_rows:
+                            n_rows = max(1, int(round(train_fraction * len(y_train))))
+                            X_train, y_train = _tail(X_train, n_rows), _tail(y_train, n_rows)
+                        needed = []
+                        for i in pending:
+                            cached = self.score_cache.get(cache_keys[i][fold_idx]) if i in cache_keys else None
+                            rounds = None
+                            if cached is not None and early_stopping:
+                                # Only a hit with the fold's best iteration, which the final fit needs
+                                rounds = self.score_cache.get(ScoreCache.best_iteration_key(cache_keys[i][fold_idx]))
+                                cached = cached if rounds is not None else None
+                            if i in cache_keys:
+                                self._score_cache_stats['hits' if cached is not None else 'misses'] += 1
+                            if cached is not None:
+                                fold_losses[i][fold_idx] = cached
+                                fold_rounds[i][fold_idx] = rounds
+                            else:
+                                needed.append(i)
+                        if not needed:
+                            continue
+                        params = chunk[needed[0]][1] or {}
+                        prefixes = [chunk[i][1][prefix_param] for i in needed] if len(needed) > 1 else None
+                        tasks.append((needed, fold_idx, joblib.delayed(fit_fold_loss)(
+                            self.estimator, params, X_train, y_train, X_val, y_val, self.loss_fn, n_threads, prefixes)))
+
+                results = parallel(task for *_, task in tasks)
+                for (needed, fold_idx, _), losses in zip(tasks, results):
+                    count_fit(cv_fold=True)
+                    for i, (loss, rounds) in zip(needed, losses if len(needed) > 1 else [losses]):
+                        fold_losses[i][fold_idx] = loss
+                        fold_rounds[i][fold_idx] = rounds
+                        if i in cache_keys:
+                            self.score_cache.put(cache_keys[i][fold_idx], loss)
+                            if rounds is not None:
+                                self.score_cache.put(ScoreCache.best_iteration_key(cache_keys[i][fold_idx]), rounds)
+
+                for i, value in enumerate(recorded):
+                    if value is None:
+                        cv_scores = [loss for _, loss in sorted(fold_losses[i].items())]
+                        recorded[i] = self._record_score(keys[i], cv_scores, bound)
+                        self._record_best_iteration(keys[i], list(fold_rounds[i].values()))
+                    else:
+                        if bound is not None:
+                            bound.update(value)
+                        if early_stopping:
+                            self._record_best_iteration(
+                                keys[i], [self.checkpoint.lookup({'best_iteration': keys[i]})])
+                scores.extend(recorded)
+        return scores
+
+    @staticmethod
+    def _prefix_units(candidates, prefix_param) -> list:
+        """
+        Candidate indices grouped into runs of consecutive candidates that differ
+        only in prefix_param (one candidate per run without a prefix_param)
+        """
+        def rest(candidate):
+            columns, params = candidate
+            return columns, {name: value for name, value in (params or {}).items() if name != prefix_param}
+
+        units = []
+        for i, candidate in enumerate(candidates):
+            if units and prefix_param is not None and prefix_param in (candidate[1] or {}) \
+                    and prefix_param in (candidates[i - 1][1] or {}) and rest(candidate) == rest(candidates[i - 1]):
+                units[-1].append(i)
+            else:
+                units.append([i])
+        return units
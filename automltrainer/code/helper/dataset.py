@@ -0,0 +1,157 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+def as_slice(idx):
+    """Return an equivalent slice for a contiguous, increasing index array (else the array itself)"""
+    idx = np.asarray(idx)
+    if len(idx) and idx[-1] - idx[0] == len(idx) - 1 and np.all(np.diff(idx) == 1):
+        return slice(int(idx[0]), int(idx[-1]) + 1)
+    return idx
+
+
+class ArrayDataset:
+    """Internal array-backed feature matrix.
+
+    Holds one C-contiguous float matrix plus its column names. Row ranges and
+    contiguous column subsets are numpy views, so folds and feature subsets
+    do not copy the data. DataFrames are only built (without copying) when a
+    public API needs one, see to_frame().
+
+    A compact dataset (see compact()) keeps its 0/1 indicator columns in a
+    separate uint8 block instead of the float matrix: values then holds only
+    value_columns, indicators holds indicator_block_columns, and columns keeps
+    the original order of both.
+    """
+
+    def __init__(self, values: np.ndarray, columns, index=None, indicators: np.ndarray = None,
+                 indicator_columns=()):
+        """
+        Args:
+            values: Float matrix of the columns not in indicator_columns, in column order
+            columns: All column names, in order
+            indicators: uint8 matrix of indicator_columns (compact datasets only)
+        """
+        self.columns = list(columns)
+        self.indicator_block_columns = list(indicator_columns)
+        indicator_set = set(self.indicator_block_columns)
+        self.value_columns = [col for col in self.columns if col not in indicator_set]
+        if values.ndim != 2 or values.shape[1] != len(self.value_columns):
+            raise ValueError(f"Expected a 2D array with {len(self.value_columns)} columns, got shape {values.shape}")
+        if (indicators is None) != (not self.indicator_block_columns) or \
+                (indicators is not None and indicators.shape != (len(values), len(indicator_set))):
+            raise ValueError(f"Expected a uint8 block for the indicator columns {self.indicator_block_columns}")
+        self.values = values
+        self.indicators = indicators
+        self.index = index if index is not None else pd.RangeIndex(len(values))
+        self._col_index = {col: i for i, col in enumerate(self.value_columns)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns=None, dtype=np.float64, compact=False) -> 'ArrayDataset':
+        """
+        Build a dataset from (a subset of) a DataFrame's columns with a single copy.
+
+        With compact=True the 0/1 indicator columns go straight into the uint8
+        block, so the float matrix is never allocated for them.
+        """
+        columns = list(df.columns) if columns is None else list(columns)
+        if not compact:
+            return cls(np.ascontiguousarray(df[columns].to_numpy(dtype=dtype)), columns, df.index)
+        is_indicator = df[columns].isin([0, 1]).all(axis=0)
+        indicator_columns = [col for col in columns if is_indicator[col]]
+        value_columns = [col for col in columns if not is_indicator[col]]
+        return cls(np.ascontiguousarray(df[value_columns].to_numpy(dtype=dtype)), columns, df.index,
+                   np.ascontiguousarray(df[indicator_columns].to_numpy(dtype=np.uint8)), indicator_columns)
+
+    def compact(self, indicator_columns=None) -> 'ArrayDataset':
+        """
+        Dataset with the given 0/1 columns (default: every indicator column)
+        moved from the float matrix into the uint8 block. Copies the float
+        matrix once; returns self when there is nothing to move.
+        """
+        if indicator_columns is None:
+            indicator_columns = self.indicator_columns()
+        moving = set(indicator_columns) - set(self.indicator_block_columns)
+        if not moving:
+            return self
+        value_columns = [col for col in self.value_columns if col not in moving]
+        moved = [col for col in self.value_columns if col in moving]
+        new = np.ascontiguousarray(self.take(columns=moved)).astype(np.uint8)
+        indicators = new if self.indicators is None else np.hstack([self.indicators, new])
+        return ArrayDataset(np.ascontiguousarray(self.take(columns=value_columns)), self.columns, self.index,
+                            indicators, self.indicator_block_columns + moved)
+
+    @property
+    def shape(self):
+        return len(self.values), len(self.columns)
+
+    def __len__(self):
+        return len(self.values)
+
+    def column_indexer(self, columns=None):
+        """Slice for contiguous columns of the float matrix (a view), index array otherwise"""
+        if columns is None:
+            return slice(None)
+        return as_slice([self._col_index[col] for col in columns])
+
+    def rows(self, start, stop=None) -> 'ArrayDataset':
+        """View of a contiguous row range"""
+        indicators = self.indicators[start:stop] if self.indicators is not None else None
+        return ArrayDataset(self.values[start:stop], self.columns, self.index[start:stop], indicators,
+                            self.indicator_block_columns)
+
+    def take(self, rows=None, columns=None) -> np.ndarray:
+        """
+        Raw float matrix for the given row indexer and columns (a view whenever
+        both are slices); columns default to value_columns
+        """
+        if rows is None:
+            rows = slice(None)
+        elif not isinstance(rows, slice):
+            rows = as_slice(rows)
+        cols = self.column_indexer(columns)
+        if isinstance(rows, slice) or isinstance(cols, slice):
+            return self.values[rows][:, cols]
+        return self.values[np.ix_(rows, cols)]
+
+    def indicator_columns(self) -> list:
+        """Columns whose values are all 0 or 1 (e.g. one-hot encodings), in column order"""
+        is_indicator = ((self.values == 0) | (self.values == 1)).all(axis=0)
+        flagged = {col for col, flag in zip(self.value_columns, is_indicator) if flag}
+        flagged.update(self.indicator_block_columns)
+        return [col for col in self.columns if col in flagged]
+
+    def fingerprint(self, y=None) -> str:
+        """Content hash of the matrix, column names and (optionally) the target"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((self.columns, self.values.shape, str(self.values.dtype))).encode())
+        digest.update(memoryview(np.ascontiguousarray(self.values)).cast('B'))
+        if self.indicators is not None:
+            digest.update(repr(self.indicator_block_columns).encode())
+            digest.update(memoryview(np.ascontiguousarray(self.indicators)).cast('B'))
+        if y is not None:
+            digest.update(memoryview(np.ascontiguousarray(np.asarray(y, dtype=np.float64))).cast('B'))
+        return digest.hexdigest()
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + (self.indicators.nbytes if self.indicators is not None else 0)
+
+    def to_frame(self, columns=None) -> pd.DataFrame:
+        """DataFrame wrapper around the matrix (no copy for contiguous columns; indicator columns stay uint8)"""
+        columns = self.columns if columns is None else list(columns)
+        if self.indicators is None:
+            return pd.DataFrame(self.take(columns=columns), columns=columns, index=self.index, copy=False)
+        return column_frame(columns, self.values, self._col_index, self.indicators,
+                            {col: i for i, col in enumerate(self.indicator_block_columns)}, index=self.index)
+
+
+def column_frame(columns, values, value_pos, indicators, indicator_pos, rows=slice(None), index=None) -> pd.DataFrame:
+    """
+    DataFrame of column views into a float block and a uint8 indicator block
+    (rows of the indicator block), in the given column order, without copying
+    """
+    return pd.DataFrame({col: values[:, value_pos[col]] if col in value_pos else indicators[rows, indicator_pos[col]]
+                         for col in columns}, index=index, copy=False)
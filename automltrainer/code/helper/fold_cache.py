@@ -0,0 +1,206 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from .helper import helper
+from .dataset import ArrayDataset, as_slice, column_frame
+
+
+class FoldCache:
+    """Cache of per-fold scaling statistics and scaled matrices.
+
+    Every CV split is scaled exactly once (on all columns). Selectors, tuners and
+    the final training step then take column subsets of the cached arrays instead
+    of refitting a StandardScaler for every candidate. Scaling is column-wise, so
+    a column subset of the scaled matrix is identical to scaling the subset.
+
+    With scaler_mode='prefix' the statistics of all expanding-window folds (and
+    of the full training set) come from one pass of cumulative sums, see
+    helper.prefix_scalers. Splits that are not prefixes fall back to fitting a
+    StandardScaler per fold.
+
+    Indicator (0/1) columns can be left unscaled: they then live only in the
+    dataset's uint8 block (see ArrayDataset.compact), are shared by every fold
+    without a float copy, and folds that include them are DataFrames of column
+    views that keep them uint8. Their final scaler entries are the identity
+    (mean 0, scale 1).
+    """
+
+    def __init__(self, X, y, cv, scaler_mode='prefix', indicator_columns=None):
+        """
+        Args:
+            X: Training features (ArrayDataset, or DataFrame which is converted once)
+            y: Training target
+            cv: Cross-validation splitter
+            scaler_mode: 'prefix' (cumulative statistics) or 'standard'
+            indicator_columns: Columns to keep unscaled and stored as uint8, in
+                addition to the uint8 block of a compact ArrayDataset
+        """
+        data = X if isinstance(X, ArrayDataset) else ArrayDataset.from_frame(X)
+        if indicator_columns:
+            data = data.compact(indicator_columns)
+        self._data = data
+        self.columns = data.columns
+        self._X = data.values  # float (scaled) columns only
+        self._y = np.asarray(y)
+        self.cv = cv
+        self.scaler_mode = scaler_mode
+
+        indicator_set = set(data.indicator_block_columns)
+        self.indicator_columns = [col for col in self.columns if col in indicator_set]
+        self._scaled_columns = data.value_columns
+        self._scaled_pos = {col: i for i, col in enumerate(self._scaled_columns)}
+        self._indicator_pos = {col: i for i, col in enumerate(data.indicator_block_columns)}
+        self._indicators = data.indicators  # uint8 matrix shared by every fold
+
+        self._folds = None     # list of per-fold dicts, built lazily
+        self._final_scaler = None
+        self._final = None     # full-train scaled matrix for the final fit
+        self._fingerprint = None
+        self.hits = 0
+        self.misses = 0
+
+    def _fold_scalers(self, splits):
+        """One fitted scaler per split, plus one for the full training set"""
+        n_rows = len(self._X)
+        is_prefix = all(
+            len(train_idx) > 0 and np.array_equal(train_idx, np.arange(len(train_idx)))
+            for train_idx, _ in splits
+        )
+        if self.scaler_mode == 'prefix' and is_prefix:
+            lengths = [len(train_idx) for train_idx, _ in splits] + [n_rows]
+            scalers = helper(mode='prefix').prefix_scalers(self._X, lengths)
+        else:
+            scalers = [StandardScaler().fit(self._data.take(rows=train_idx)) for train_idx, _ in splits] + \
+                [StandardScaler().fit(self._X)]
+        return scalers
+
+    def _scale(self, scaler, rows):
+        """Scale the non-indicator columns of the given rows"""
+        dtype = self._X.dtype
+        return (self._data.take(rows=rows) - scaler.mean_.astype(dtype)) / scaler.scale_.astype(dtype)
+
+    def _build_folds(self):
+        splits = list(self.cv.split(self._X))
+        *fold_scalers, final_scaler = self._fold_scalers(splits)
+        self._final_scaler = final_scaler
+
+        self._folds = []
+        for (train_idx, val_idx), scaler in zip(splits, fold_scalers):
+            # Contiguous folds are read through slices (views) rather than fancy indexing
+            train_rows, val_rows = as_slice(train_idx), as_slice(val_idx)
+            self._folds.append({
+                'mean': scaler.mean_,
+                'scale': scaler.scale_,
+                'X_train': self._scale(scaler, train_rows),
+                'X_val': self._scale(scaler, val_rows),
+                'train_rows': train_rows,
+                'val_rows': val_rows,
+                'y_train': self._y[train_rows],
+                'y_val': self._y[val_rows],
+                'used': False,
+            })
+
+    def _assemble(self, scaled, rows, columns):
+        """
+        Column subset of a cached scaled block: a numpy array when every column
+        is scaled, otherwise a DataFrame of column views with the indicator
+        columns read from the shared uint8 block
+        """
+        columns = self.columns if columns is None else list(columns)
+        if not any(col in self._indicator_pos for col in columns):
+            return scaled[:, as_slice([self._scaled_pos[col] for col in columns])]
+        return column_frame(columns, scaled, self._scaled_pos, self._indicators, self._indicator_pos, rows)
+
+    def _record(self, entry):
+        if entry['used']:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry['used'] = True
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the data, target, CV splitter and scaling setup (identifies the folds' contents)"""
+        if self._fingerprint is None:
+            setup = repr((self.cv, self.scaler_mode, self.indicator_columns))
+            digest = hashlib.blake2b(f"{self._data.fingerprint(self._y)}-{setup}".encode(), digest_size=16)
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def build(self) -> 'FoldCache':
+        """Scale every fold now instead of on first access (no-op once built)"""
+        if self._folds is None:
+            self._build_folds()
+        return self
+
+    @property
+    def n_splits(self) -> int:
+        self.build()
+        return len(self._folds)
+
+    def get_fold(self, fold_idx: int, columns=None):
+        """
+        Get a scaled fold restricted to the given columns.
+
+        Returns:
+            X_train_scaled, X_val_scaled, y_train, y_val (numpy arrays; the
+            features are DataFrames when they include uint8 indicator columns)
+        """
+        self.build()
+        entry = self._folds[fold_idx]
+        self._record(entry)
+        return (self._assemble(entry['X_train'], entry['train_rows'], columns),
+                self._assemble(entry['X_val'], entry['val_rows'], columns),
+                entry['y_train'], entry['y_val'])
+
+    def folds(self, columns=None):
+        """Iterate over all scaled folds for the given columns"""
+        for fold_idx in range(self.n_splits):
+            yield self.get_fold(fold_idx, columns)
+
+    def scale_final(self, X_train: pd.DataFrame, X_test: pd.DataFrame):
+        """
+        Scale final train/test data from the cached full-train statistics.
+
+        Drop-in replacement for helper.scale_with_scaler when X_train holds the
+        rows the cache was built on (any subset of its columns).
+
+        Returns:
+            X_train_scaled, X_test_scaled, scaler (fitted scaler for later use)
+        """
+        if self._final is None:
+            self.build()
+            self._final = {'X_train': self._scale(self._final_scaler, slice(None)), 'used': False}
+        self._record(self._final)
+
+        columns = list(X_train.columns)
+        full_scaler = self._final_scaler
+
+        # Fitted scaler restricted to the selected columns, as if fitted on them directly;
+        # indicator columns pass through unscaled (mean 0, variance 1)
+        pos = [self._scaled_pos.get(col) for col in columns]
+        mean = np.array([full_scaler.mean_[i] if i is not None else 0.0 for i in pos])
+        var = np.array([full_scaler.var_[i] if i is not None else 1.0 for i in pos])
+        scaler = helper._scaler_from_stats(mean, var, full_scaler.n_samples_seen_, np.asarray(columns, dtype=object))
+
+        X_train_scaled = self._assemble(self._final['X_train'], slice(None), columns)
+        if isinstance(X_train_scaled, pd.DataFrame):
+            X_train_scaled.index = X_train.index
+        else:
+            X_train_scaled = pd.DataFrame(X_train_scaled, columns=columns, index=X_train.index, copy=False)
+        X_test_scaled = pd.DataFrame(scaler.transform(X_test), columns=X_test.columns, index=X_test.index)
+        indicators = [col for col in columns if col in self._indicator_pos and X_test[col].dtype == np.uint8]
+        if indicators:
+            X_test_scaled[indicators] = X_test_scaled[indicators].astype(np.uint8)
+        return X_train_scaled, X_test_scaled, scaler
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """Cache usage counters"""
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate}
@@ -7,10 +7,81 @@ from sklearn.preprocessing import StandardScaler
 class helper:
     """Helper class to handle scaling within CV splits"""
     
-    def __init__(self):
+    def __init__(self, mode='standard'):
+        """
+        Args:
+            mode: 'standard' fits a StandardScaler per call, 'prefix' derives the
+                  statistics from cumulative column sums (see prefix_scalers)
+        """
+        self.mode = mode
         self.scaler = StandardScaler()
     
+    def _fit_scaler(self, X_train):
+        """Fit a StandardScaler (or its prefix-statistics equivalent) on X_train"""
+        if self.mode == 'prefix':
+            return self.prefix_scalers(X_train, [len(X_train)])[0]
+        return StandardScaler().fit(X_train)
+
+    def prefix_scalers(self, X, prefix_lengths):
+        """
+        Fitted StandardScalers for the expanding windows X[:n] for every n in prefix_lengths.
+
+        TimeSeriesSplit training folds are nested prefixes of the same data, so the
+        column sums and sums of squares are accumulated in a single pass over X and
+        each window's mean/variance is then derived in O(features). Values are
+        shifted by the first window's mean before accumulating to keep the
+        sum-of-squares variance numerically stable.
+        
+        Args:
+            X: Training data (DataFrame or array), rows in time order
+            prefix_lengths: Number of leading rows for each requested scaler
+            
+        Returns:
+            List of fitted StandardScaler objects, in the order of prefix_lengths
+        """
+        feature_names = np.asarray(X.columns, dtype=object) if hasattr(X, 'columns') else None
+        values = np.asarray(X, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+
+        ends = sorted(set(int(n) for n in prefix_lengths))
+        if not ends or ends[0] < 1 or ends[-1] > len(values):
+            raise ValueError(f"Prefix lengths must be between 1 and {len(values)}, got {list(prefix_lengths)}")
+
+        shift = values[:ends[0]].mean(axis=0)
+        col_sum = np.zeros(values.shape[1])
+        col_sumsq = np.zeros(values.shape[1])
+        stats = {}
+        start = 0
+        for end in ends:
+            block = values[start:end] - shift
+            col_sum += block.sum(axis=0)
+            col_sumsq += np.einsum('ij,ij->j', block, block)
+            shifted_mean = col_sum / end
+            var = np.maximum(col_sumsq / end - shifted_mean ** 2, 0.0)
+            stats[end] = (shifted_mean + shift, var)
+            start = end
 
+        return [self._scaler_from_stats(*stats[int(n)], int(n), feature_names) for n in prefix_lengths]
+
+    @staticmethod
+    def _scaler_from_stats(mean, var, n_samples, feature_names=None):
+        """Build a fitted StandardScaler from precomputed column statistics"""
+        eps = np.finfo(np.float64).eps
+        # Same near-constant rule as StandardScaler (scale of 1.0 for constant columns)
+        constant = var <= n_samples * eps * var + (n_samples * mean * eps) ** 2
+        scale = np.sqrt(var)
+        scale[constant] = 1.0
+
+        scaler = StandardScaler()
+        scaler.mean_ = mean
+        scaler.var_ = var
+        scaler.scale_ = scale
+        scaler.n_samples_seen_ = n_samples
+        scaler.n_features_in_ = len(mean)
+        if feature_names is not None:
+            scaler.feature_names_in_ = feature_names
+        return scaler
 
     def scale_with_scaler(self, X_train, X_test):
         """
@@ -23,10 +94,10 @@ class helper:
         Returns:
             X_train_scaled, X_test_scaled, scaler (fitted scaler for later use)
         """
-        final_scaler = StandardScaler()
+        final_scaler = self._fit_scaler(X_train)
         
         X_train_scaled = pd.DataFrame(
-            final_scaler.fit_transform(X_train),
+            final_scaler.transform(X_train),
             columns=X_train.columns,
             index=X_train.index
         )
@@ -50,18 +121,6 @@ class helper:
         Returns:
             X_train_scaled, X_test_scaled, scaler (fitted scaler for later use)
         """
-        final_scaler = StandardScaler()
-        
-        X_train_scaled = pd.DataFrame(
-            final_scaler.fit_transform(X_train),
-            columns=X_train.columns,
-            index=X_train.index
-        )
-        
-        X_test_scaled = pd.DataFrame(
-            final_scaler.transform(X_test),
-            columns=X_test.columns,
-            index=X_test.index
-        )
+        X_train_scaled, X_test_scaled, _ = self.scale_with_scaler(X_train, X_test)
         
-        return X_train_scaled, X_test_scaled
\ No newline at end of file
+        return X_train_scaled, X_test_scaled
@@ -0,0 +1,127 @@
+import math
+
+import numpy as np
+from .cross_validation import fit_on_fold
+from .profiler import count_fit
+
+
+class ModelRace:
+    """Successive-halving race between model families on default parameters.
+
+    Every rung fits the remaining models on more CV folds (1, 2, 4, ... of the
+    cached expanding-window folds, so later rungs also train on more rows) and
+    keeps the best 1/eta of them by mean fold loss. The race ends when
+    min_survivors models are left or all folds have been used. Only the
+    survivors go on to feature selection and tuning.
+    """
+
+    def __init__(self, fold_cache, loss_fn, eta: int = 2, min_survivors: int = 1, verbose: int = 0,
+                 score_cache=None):
+        """
+        Args:
+            fold_cache: FoldCache holding the scaled CV folds
+            loss_fn: Loss used to rank the models
+            eta: Keep ceil(n / eta) models after every rung
+            min_survivors: Number of models that always survive the race
+            verbose: Print every rung
+            score_cache: Optional ScoreCache to reuse fold losses of identical fits
+        """
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        if min_survivors < 1:
+            raise ValueError("min_survivors must be at least 1")
+        self.fold_cache = fold_cache
+        self.loss_fn = loss_fn
+        self.eta = eta
+        self.min_survivors = min_survivors
+        self.verbose = verbose
+        self.score_cache = score_cache
+
+        self.rungs_ = []
+        self.survivors_ = None
+        self.eliminated_ = None
+        self.failed_ = {}
+        self.n_fits_ = 0
+
+    def _rung_sizes(self):
+        """Number of folds per rung: 1, 2, 4, ... up to all folds"""
+        n_splits = self.fold_cache.n_splits
+        sizes = []
+        n_folds = 1
+        while n_folds < n_splits:
+            sizes.append(n_folds)
+            n_folds *= 2
+        return sizes + [n_splits]
+
+    def _fold_score(self, estimator, fold_idx):
+        if self.score_cache is not None:
+            key = self.score_cache.key(self.fold_cache.fingerprint, self.fold_cache.columns, estimator, None,
+                                       self.loss_fn, fold_idx)
+            cached = self.score_cache.get(key)
+            if cached is not None:
+                return cached
+
+        X_tr, X_val, y_tr, y_val = self.fold_cache.get_fold(fold_idx)
+        model = estimator.__class__(**estimator.get_params())
+        fit_on_fold(model, X_tr, y_tr, X_val, y_val)
+        count_fit(cv_fold=True)
+        self.n_fits_ += 1
+        loss = self.loss_fn(y_val, model.predict(X_val))
+        if self.score_cache is not None:
+            self.score_cache.put(key, loss)
+        return loss
+
+    def run(self, estimators: dict) -> list:
+        """
+        Race the given {model_name: estimator} and return the surviving names
+        (in their original order).
+        """
+        fold_scores = {name: [] for name in estimators}
+        failed = self.failed_
+        alive = list(estimators)
+        sign = -1 if self.loss_fn.higher_is_better else 1
+
+        for n_folds in self._rung_sizes():
+            if len(alive) <= self.min_survivors:
+                break
+            for name in alive:
+                if name in failed:
+                    continue
+                try:
+                    while len(fold_scores[name]) < n_folds:
+                        fold_scores[name].append(self._fold_score(estimators[name], len(fold_scores[name])))
+                except Exception as e:
+                    failed[name] = str(e)
+
+            scores = {name: float(np.mean(fold_scores[name])) if name not in failed else None for name in alive}
+            # Failed models rank last; ties keep the registry order
+            ranked = sorted(alive, key=lambda name: (name in failed,
+                                                     sign * scores[name] if name not in failed else 0.0))
+            n_keep = max(self.min_survivors, math.ceil(len(alive) / self.eta))
+            survivors = [name for name in alive if name in ranked[:n_keep]]
+
+            self.rungs_.append({
+                'n_folds': n_folds,
+                'scores': scores,
+                'survivors': survivors,
+            })
+            if self.verbose:
+                formatted = ', '.join(f"{name}: {score:.4f}" if score is not None else f"{name}: failed"
+                                      for name, score in scores.items())
+                print(f"  Race rung {len(self.rungs_)} ({n_folds} folds) - {formatted} -> keep {survivors}")
+            alive = survivors
+
+        self.survivors_ = alive
+        self.eliminated_ = [name for name in estimators if name not in alive]
+        return alive
+
+    def summary(self) -> dict:
+        return {
+            'eta': self.eta,
+            'min_survivors': self.min_survivors,
+            'rungs': self.rungs_,
+            'survivors': self.survivors_,
+            'eliminated': self.eliminated_,
+            'failed': self.failed_,
+            'n_fits': self.n_fits_,
+        }
@@ -0,0 +1,128 @@
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def _natural_key(path):
+    """Sort key that orders embedded numbers numerically (..._2 before ..._10)"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', path.name)]
+
+
+class ParquetSource:
+    """Training data stored in one parquet file or a directory of them, read in time order.
+
+    Files are concatenated in name order with numbers compared numerically
+    (DKHousingprices_2.parquet before DKHousingprices_10.parquet). When the
+    time column (time_col) is present, rows are returned sorted by it (stably,
+    so ties keep their file order); without it the file order is taken to be
+    time order. Only the requested columns are read, one row group at a time,
+    straight into a preallocated matrix, so no intermediate DataFrame of the
+    full history is ever built. Row groups without rows in the requested range
+    are skipped without being read.
+    """
+
+    def __init__(self, path, pattern: str = '*.parquet', time_col: str = 'date'):
+        """
+        Args:
+            path: Parquet file or directory containing parquet files
+            pattern: Glob pattern for the files in a directory
+            time_col: Column that orders the rows in time (None: trust the file order)
+        """
+        path = Path(path)
+        self.time_col = time_col
+        self._order = None
+        self.files = sorted(path.glob(pattern), key=_natural_key) if path.is_dir() else [path]
+        if not self.files:
+            raise FileNotFoundError(f"No parquet files matching {pattern} in {path}")
+        self._parquet_files = [pq.ParquetFile(file) for file in self.files]
+
+        schemas = [parquet_file.schema_arrow for parquet_file in self._parquet_files]
+        self.columns = list(schemas[0].names)
+        for file, schema in zip(self.files[1:], schemas[1:]):
+            missing = [col for col in self.columns if col not in schema.names]
+            if missing:
+                raise ValueError(f"{file} is missing columns {missing}")
+        self._types = dict(zip(schemas[0].names, schemas[0].types))
+
+    @property
+    def num_rows(self) -> int:
+        """Total number of rows (from the file metadata, nothing is read)"""
+        return sum(parquet_file.metadata.num_rows for parquet_file in self._parquet_files)
+
+    def _row_groups(self):
+        """Yield (parquet_file, row_group_index, first_row, n_rows) over all files in order"""
+        offset = 0
+        for parquet_file in self._parquet_files:
+            for i in range(parquet_file.num_row_groups):
+                n_rows = parquet_file.metadata.row_group(i).num_rows
+                yield parquet_file, i, offset, n_rows
+                offset += n_rows
+
+    @property
+    def time_order(self):
+        """
+        Row positions (in file order) sorted by time_col, or None when the rows
+        already are in time order or there is no time column. Reads only time_col.
+        """
+        if self._order is None and self.time_col in self.columns:
+            times = np.concatenate([parquet_file.read(columns=[self.time_col]).column(self.time_col).to_numpy()
+                                    for parquet_file in self._parquet_files])
+            in_order = len(times) < 2 or bool(np.all(times[1:] >= times[:-1]))
+            self._order = False if in_order else np.argsort(times, kind='stable')
+        return self._order if self._order is not False else None
+
+    def read(self, feature_cols, target_col, start: int = 0, stop: int = None, dtype=np.float64):
+        """
+        Read the rows [start, stop) of the given columns in time order (negative bounds count from the end).
+
+        Returns:
+            values (C-contiguous (n_rows, n_features) matrix of dtype),
+            y (pandas Series), index (RangeIndex of the row numbers in time order)
+        """
+        feature_cols = list(feature_cols)
+        missing = [col for col in feature_cols + [target_col] if col not in self.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in {self.files[0].parent}")
+        # Checked before anything is read: strings / categories cannot go into the float matrix
+        non_numeric = [f"{col} ({self._types[col]})" for col in feature_cols + [target_col]
+                       if not (pa.types.is_integer(self._types[col]) or pa.types.is_floating(self._types[col])
+                               or pa.types.is_boolean(self._types[col]))]
+        if non_numeric:
+            raise ValueError(f"Non-numeric columns cannot be used as features or target: {', '.join(non_numeric)}. "
+                             "Pass numeric columns= (or encode these columns first).")
+
+        # Negative bounds count from the end, as in Python slicing
+        total = self.num_rows
+        start = max(start + total, 0) if start < 0 else start
+        stop = total if stop is None else min(stop + total if stop < 0 else stop, total)
+        if not 0 <= start < stop:
+            raise ValueError(f"Empty row range [{start}, {stop}) for {total} rows")
+
+        values = np.empty((stop - start, len(feature_cols)), dtype=dtype)
+        y = np.empty(stop - start, dtype=np.float64)
+        order = self.time_order
+        # File-order positions of the requested rows, when the files are not in time order
+        positions = order[start:stop] if order is not None else None
+        for parquet_file, group, first_row, n_rows in self._row_groups():
+            if positions is None:
+                lo, hi = max(start, first_row), min(stop, first_row + n_rows)
+                if lo >= hi:
+                    continue  # Row group outside the requested range is never read
+                table = parquet_file.read_row_group(group, columns=feature_cols + [target_col])
+                table, rows, out = table.slice(lo - first_row, hi - lo), slice(None), slice(lo - start, hi - start)
+            else:
+                out = np.flatnonzero((positions >= first_row) & (positions < first_row + n_rows))
+                if len(out) == 0:
+                    continue
+                table = parquet_file.read_row_group(group, columns=feature_cols + [target_col])
+                rows = positions[out] - first_row
+            for j, col in enumerate(feature_cols):
+                values[out, j] = table.column(col).to_numpy()[rows]
+            y[out] = table.column(target_col).to_numpy()[rows]
+
+        index = pd.RangeIndex(start, stop)
+        return values, pd.Series(y, index=index, name=target_col), index
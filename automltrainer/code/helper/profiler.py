@@ -0,0 +1,80 @@
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Process-wide work counters, incremented by cross_val_scores and the final fit.
+# Every worker process has its own copy; stage profiles record differences.
+counters = {'model_fits': 0, 'cv_folds': 0}
+_counter_lock = threading.Lock()  # Candidates may be scored from several threads
+
+
+def count_fit(cv_fold: bool = False):
+    """Record one model fit (and one evaluated CV fold if cv_fold)"""
+    with _counter_lock:
+        counters['model_fits'] += 1
+        if cv_fold:
+            counters['cv_folds'] += 1
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class StageProfiler:
+    """Collects wall time, CPU time, memory and fit counts per pipeline stage.
+
+    Peak RSS is the process high-water mark at the end of the stage. With
+    trace_memory=True the peak of Python-level allocations during the stage is
+    measured with tracemalloc as well (noticeable overhead, off by default).
+
+    CPU time, RSS and counters cover the profiling process only: work done in
+    loky worker processes (tuners and selectors with n_jobs) is not included.
+    Under parallel_models each model's stages are profiled inside its own
+    worker, so those figures are that worker's.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Profile the enclosed block under the given stage name"""
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        fits_before, folds_before = counters['model_fits'], counters['cv_folds']
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                'wall_time_s': time.perf_counter() - wall_start,
+                'cpu_time_s': time.process_time() - cpu_start,
+                'peak_rss_mb': _peak_rss_mb(),
+                'model_fits': counters['model_fits'] - fits_before,
+                'cv_folds': counters['cv_folds'] - folds_before,
+            }
+            if self.trace_memory:
+                record['tracemalloc_peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stages[name] = record
+
+    def to_dict(self) -> dict:
+        return dict(self.stages)
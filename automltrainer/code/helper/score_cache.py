@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def _stable(obj):
+    """JSON fallback for parameter values: loss objects by name, anything else by type"""
+    return getattr(obj, 'name', type(obj).__name__)
+
+
+class ScoreCache:
+    """Memoised per-fold validation losses.
+
+    Keys hash the data fingerprint (see FoldCache.fingerprint), the ordered
+    list of features, the estimator class and parameters, the loss and the
+    fold index, so a value can only be reused for the identical fit. The
+    order matters (XGBoost's column sampling depends on it); producers pass
+    the canonical order of helper.cross_validation.fit_columns, so the same
+    feature set picked in a different order still hits. An in-memory
+    LRU serves repeated candidates within and across runs of the same
+    process; with path set, values are also stored in a SQLite file so
+    re-runs on unchanged data (e.g. the nightly pipeline) are cache hits.
+
+    Worker processes (parallel_models) get their own copy of the memory tier
+    and reopen the SQLite file, so only the SQLite tier is shared with them.
+    """
+
+    def __init__(self, max_entries: int = 100_000, path: str = None):
+        """
+        Args:
+            max_entries: Size of the in-memory LRU
+            path: Optional SQLite file for the persistent tier
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        state['_connection'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(data_fingerprint, features, estimator, params, loss_fn, fold_idx) -> str:
+        """Cache key for one fold fit of estimator (with params applied) on the given features, in fit order"""
+        payload = json.dumps([
+            data_fingerprint,
+            list(features),
+            type(estimator).__name__,
+            {**estimator.get_params(), **(params or {})},
+            loss_fn.name,
+            fold_idx,
+        ], sort_keys=True, default=_stable)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def best_iteration_key(key) -> str:
+        """Key of the early-stopping best iteration stored alongside the loss under key"""
+        return f"{key}:best_iteration"
+
+    def _db(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, value REAL)')
+        return self._connection
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Cached loss for key, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            if self.path is not None:
+                row = self._db().execute('SELECT value FROM scores WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value: float):
+        with self._lock:
+            self._remember(key, float(value))
+            if self.path is not None:
+                db = self._db()
+                db.execute('INSERT OR REPLACE INTO scores (key, value) VALUES (?, ?)', (key, float(value)))
+                db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        """Lookup counters ('disk_hits' are the hits served from SQLite)"""
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                'hit_rate': self.hit_rate, 'entries': len(self._memory)}
@@ -0,0 +1,67 @@
+import functools
+import hashlib
+import json
+import os
+import time
+
+from helper.checkpoint import _atomic_write
+from helper.score_cache import _stable
+
+
+class SelectionStore:
+    """Feature selection artifacts on disk, reusable across runs.
+
+    One JSON file per fitted selection holds the selected features, the score
+    trace with per-step timings, the best CV score, the data fingerprint and
+    the estimator parameters (see FeatureSelectionInterface.to_artifact). The
+    file name is a hash of everything that determines the selection: the data
+    (FoldCache.fingerprint covers the training rows, target, CV splits and
+    scaling), the selector and its settings, the estimator class and
+    parameters, the loss and the warm-start seed. A run with the same inputs
+    loads the artifact instead of selecting again.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def describe_selector(feature_selection_fn) -> dict:
+        """Name and bound keyword arguments of a selector class or functools.partial"""
+        kwargs = {}
+        while isinstance(feature_selection_fn, functools.partial):
+            kwargs = {**feature_selection_fn.keywords, **kwargs}
+            feature_selection_fn = feature_selection_fn.func
+        return {'name': getattr(feature_selection_fn, '__name__', type(feature_selection_fn).__name__),
+                'kwargs': kwargs}
+
+    @classmethod
+    def key(cls, data_fingerprint, feature_selection_fn, estimator, loss_fn, initial_features=None) -> str:
+        """Artifact key for one selection of estimator's features on the fingerprinted data"""
+        payload = json.dumps([
+            data_fingerprint,
+            cls.describe_selector(feature_selection_fn),
+            type(estimator).__name__,
+            estimator.get_params(),
+            loss_fn.name,
+            initial_features,
+        ], sort_keys=True, default=_stable)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def path(self, key) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key):
+        """Stored artifact for key, or None"""
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save(self, key, artifact: dict, data_fingerprint: str) -> str:
+        """Store a selector's to_artifact() output; returns the file path"""
+        artifact = {**artifact, 'data_fingerprint': data_fingerprint, 'created': time.time()}
+        path = self.path(key)
+        _atomic_write(path, json.dumps(artifact, indent=2, default=_stable))
+        return path
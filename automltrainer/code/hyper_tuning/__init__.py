@@ -1,6 +1,9 @@
 from .grid_search import GridSearchTuner
 from .line_search import LineSearchTuner
+from .successive_halving import SuccessiveHalvingTuner, HyperbandTuner
+from .bayesian import BayesianTuner
 from .hypertuning_interface import HypertuningInterface
 # from .random_search import RandomSearchTuner  # Temporarily commented out
 
-__all__ = ['GridSearchTuner', 'LineSearchTuner', 'HypertuningInterface']  # 'RandomSearchTuner' temporarily removed
+__all__ = ['GridSearchTuner', 'LineSearchTuner', 'SuccessiveHalvingTuner', 'HyperbandTuner', 'BayesianTuner',
+           'HypertuningInterface']  # 'RandomSearchTuner' temporarily removed
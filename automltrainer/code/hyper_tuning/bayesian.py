@@ -0,0 +1,209 @@
+import math
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import ParameterGrid
+from helper.profiler import counters
+from .hypertuning_interface import HypertuningInterface
+
+
+class _Dimension:
+    """One parameter of the search space: a list of choices or a (low, high[, 'log']) range"""
+
+    def __init__(self, name, values):
+        self.name = name
+        self.choices = None
+        if isinstance(values, tuple) and len(values) in (2, 3):
+            low, high = values[0], values[1]
+            if not low < high:
+                raise ValueError(f"Range of '{name}' must have low < high, got {values}")
+            self.log = len(values) == 3 and values[2] == 'log'
+            if self.log and low <= 0:
+                raise ValueError(f"Log range of '{name}' must be positive, got {values}")
+            self.integer = isinstance(low, int) and isinstance(high, int)
+            self.low, self.high = (math.log(low), math.log(high)) if self.log else (float(low), float(high))
+        else:
+            self.choices = list(values)
+
+    def value(self, x):
+        """Parameter value of a point of the (transformed) search space"""
+        if self.choices is not None:
+            return self.choices[int(x)]
+        x = math.exp(x) if self.log else float(x)
+        return int(round(x)) if self.integer else x
+
+    def sample_prior(self, rng, n):
+        if self.choices is not None:
+            return rng.integers(len(self.choices), size=n)
+        return rng.uniform(self.low, self.high, size=n)
+
+    def sample(self, points, rng, n):
+        """n draws from the Parzen estimator fitted to the observed points"""
+        if self.choices is not None:
+            return rng.choice(len(self.choices), size=n, p=self._choice_probs(points))
+        sigma = self._bandwidth(points)
+        # Mixture of a Gaussian per point and the uniform prior (weight of one point)
+        component = rng.integers(len(points) + 1, size=n)
+        draws = rng.uniform(self.low, self.high, size=n)
+        from_points = component < len(points)
+        draws[from_points] = rng.normal(np.asarray(points)[component[from_points]], sigma)
+        return np.clip(draws, self.low, self.high)
+
+    def log_density(self, x, points):
+        if self.choices is not None:
+            return np.log(self._choice_probs(points)[np.asarray(x, dtype=int)])
+        x, points = np.asarray(x)[:, None], np.asarray(points)[None, :]
+        sigma = self._bandwidth(points.ravel())
+        kernels = np.exp(-0.5 * ((x - points) / sigma) ** 2) / (sigma * math.sqrt(2 * math.pi))
+        density = (kernels.sum(axis=1) + 1 / (self.high - self.low)) / (points.shape[1] + 1)
+        return np.log(density)
+
+    def _choice_probs(self, points):
+        counts = np.bincount(np.asarray(points, dtype=int), minlength=len(self.choices)) + 1.0
+        return counts / counts.sum()
+
+    def _bandwidth(self, points):
+        # Scott's rule on the width of the range, so a few clustered points still explore
+        return 0.3 * (self.high - self.low) * max(len(points), 1) ** -0.2
+
+
+class BayesianTuner(HypertuningInterface):
+    """Sequential model-based tuning with a Tree-structured Parzen Estimator (TPE).
+
+    After n_initial random configurations, every round splits the completed
+    trials into the best gamma fraction and the rest, fits a Parzen estimator
+    per parameter to each group (l and g) and proposes the configuration
+    maximising l(x) / g(x) among n_ei_candidates draws from l. Parameters are
+    modelled independently, as in the original TPE.
+
+    param_grid values may be lists (the model configs' discrete choices) or
+    continuous ranges: (low, high) tuples, integer when both ends are ints,
+    and (low, high, 'log') for log-uniform ranges such as learning rates.
+
+    With batch_size > 1 every round proposes a batch for the n_jobs worker
+    processes: each proposal is added to the trials with the worst score seen
+    so far (constant liar) before the next one is drawn, so a batch spreads
+    out instead of proposing the same point repeatedly. Proposals are seeded
+    by random_state, so a resumed run proposes the same configurations and
+    finds them in its checkpoint.
+    """
+
+    def __init__(self, estimator, loss_fn, param_grid, cv=None, n_iter=30, n_initial=10, batch_size=1,
+                 gamma=0.25, n_ei_candidates=24, n_jobs=-1, verbose=0, random_state=42, fold_cache=None,
+                 checkpoint=None, budget=None, score_cache=None):
+        """
+        Args:
+            n_iter: Number of configurations to evaluate
+            n_initial: Random configurations before the model is used
+            batch_size: Configurations proposed (and evaluated in parallel) per round
+            gamma: Fraction of the trials that counts as good
+            n_ei_candidates: Draws from the good density scored per proposal
+            n_jobs: Worker processes for the fold fits of a batch, as in GridSearchTuner
+            random_state: Seed of the random and model-based proposals
+        """
+        super().__init__(estimator, loss_fn, param_grid, cv, n_jobs, verbose, fold_cache, checkpoint, budget, score_cache)
+        if n_iter < 1 or batch_size < 1:
+            raise ValueError("n_iter and batch_size must be at least 1")
+        if not 0 < gamma < 1:
+            raise ValueError("gamma must be between 0 and 1")
+        self.n_iter = n_iter
+        self.n_initial = n_initial
+        self.batch_size = batch_size
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+        self.random_state = random_state
+        self.trials_ = []
+        self.fit_report_ = None
+
+    def _propose(self, dimensions, points, scores, seen, rng, warm_up):
+        """Next point: random during the warm-up, otherwise the best l(x) / g(x) draw not evaluated yet"""
+        if warm_up:
+            candidates = np.column_stack([dim.sample_prior(rng, self.n_ei_candidates) for dim in dimensions])
+            return self._first_unseen(candidates, dimensions, seen, rng)
+
+        order = np.argsort(-np.asarray(scores) if self.loss_fn.higher_is_better else np.asarray(scores),
+                           kind='stable')
+        n_good = max(1, math.ceil(self.gamma * len(points)))
+        good, bad = np.asarray(points)[order[:n_good]], np.asarray(points)[order[n_good:]]
+
+        candidates = np.column_stack([dim.sample(good[:, d], rng, self.n_ei_candidates)
+                                      for d, dim in enumerate(dimensions)])
+        ratio = sum(dim.log_density(candidates[:, d], good[:, d]) - dim.log_density(candidates[:, d], bad[:, d])
+                    for d, dim in enumerate(dimensions))
+        return self._first_unseen(candidates[np.argsort(-ratio, kind='stable')], dimensions, seen, rng)
+
+    def _first_unseen(self, candidates, dimensions, seen, rng):
+        for point in candidates:
+            if self._key(point, dimensions) not in seen:
+                return point
+        # Every draw was evaluated before (small discrete spaces): fall back to the prior
+        for _ in range(100):
+            point = np.array([dim.sample_prior(rng, 1)[0] for dim in dimensions])
+            if self._key(point, dimensions) not in seen:
+                return point
+        return None
+
+    @staticmethod
+    def _key(point, dimensions):
+        return tuple(dim.value(x) for dim, x in zip(dimensions, point))
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> 'BayesianTuner':
+        """Fit using TPE proposals."""
+        dimensions = [_Dimension(name, values) for name, values in self.param_grid.items()]
+        rng = np.random.default_rng(self.random_state)
+        n_workers = joblib.effective_n_jobs(self.n_jobs)
+        points, scores, seen = [], [], set()
+        folds_before = counters['cv_folds']  # fit_report_ counts the fold fits that ran, not cache hits
+        self.trials_ = []
+        self.best_params_ = None
+        self.best_score_ = None
+
+        if self.verbose > 0:
+            print(f"Bayesian (TPE) search: {self.n_iter} configurations, batches of {self.batch_size}")
+
+        while len(points) < self.n_iter and not self._budget_exhausted():
+            batch = []
+            warm_up = len(points) < max(self.n_initial, 2)
+            lie = None if warm_up else (min(scores) if self.loss_fn.higher_is_better else max(scores))
+            for _ in range(min(self.batch_size, self.n_iter - len(points))):
+                point = self._propose(dimensions, points + [p for p, _ in batch],
+                                      scores + [lie] * len(batch), seen, rng, warm_up)
+                if point is None:
+                    break
+                seen.add(self._key(point, dimensions))
+                batch.append((point, dict(zip([dim.name for dim in dimensions], self._key(point, dimensions)))))
+            if not batch:
+                if self.verbose > 0:
+                    print("Search space exhausted")
+                break
+
+            batch_scores = self._score_candidates_processes(X, y, [(None, params) for _, params in batch], n_workers)
+            for (point, params), score in zip(batch, batch_scores):
+                points.append(point)
+                scores.append(score)
+                self.trials_.append({'params': params, 'score': score})
+                is_better = self.best_score_ is None or \
+                    ((score > self.best_score_) if self.loss_fn.higher_is_better else (score < self.best_score_))
+                if is_better:
+                    self.best_score_ = score
+                    self.best_params_ = params
+                    if self.verbose > 1:
+                        print(f"  Trial {len(points)}: new best score {score:.4f} with {params}")
+            if len(batch_scores) < len(batch) and self.verbose > 0:
+                print(f"Budget exhausted after {len(points)}/{self.n_iter} configurations")
+
+        discrete = all(dim.choices is not None for dim in dimensions)
+        grid_fits = len(ParameterGrid(self.param_grid)) * self._n_folds() if discrete else None
+        fits = counters['cv_folds'] - folds_before
+        self.fit_report_ = {'fits': fits, 'full_fit_equivalents': fits, 'grid_fits': grid_fits,
+                            'fit_ratio': fits / grid_fits if grid_fits else None}
+
+        if self.verbose > 0:
+            print(f"Best parameters: {self.best_params_}")
+            if self.best_score_ is not None:
+                print(f"Best CV score: {self.best_score_:.4f}")
+            if grid_fits:
+                print(f"Fold fits: {fits} vs {grid_fits} for the equivalent grid search")
+
+        return self
@@ -3,53 +3,44 @@ from sklearn.base import BaseEstimator
 from sklearn.model_selection import ParameterGrid
 from sklearn.metrics import mean_squared_error
 from .hypertuning_interface import HypertuningInterface
-from .hypertuning_interface import HypertuningInterface
 
 class GridSearchTuner(HypertuningInterface):
-    def __init__(self, estimator, loss_fn, param_grid, cv=None, n_jobs=-1, verbose=0):
-        super().__init__(estimator, loss_fn, param_grid, cv, n_jobs, verbose)
+    def __init__(self, estimator, loss_fn, param_grid, cv=None, n_jobs=-1, verbose=0, fold_cache=None,
+                 checkpoint=None, budget=None, score_cache=None):
+        """
+        Args:
+            n_jobs: Worker processes for the candidate x fold fits (-1: all cores). Boosters get
+                    cpu_share() / n_jobs threads each. Results do not depend on n_jobs: ties go to
+                    the earliest combination in grid order.
+        """
+        super().__init__(estimator, loss_fn, param_grid, cv, n_jobs, verbose, fold_cache, checkpoint, budget, score_cache)
 
     def fit(self, X, y):
         """Fit with proper scaling per CV split"""
-        from helper.helper import helper  # Import helper
-        
         param_combinations = list(ParameterGrid(self.param_grid))
-        best_score = float('-inf')
+        best_score = float('-inf') if self.loss_fn.higher_is_better else float('inf')
         best_params = None
 
         if self.verbose > 0:
             print(f"Testing {len(param_combinations)} parameter combinations")
 
+        # Average CV score of every combination (cross-validation with proper scaling)
+        order = self._evaluation_order(param_combinations)
+        scores = self._score_candidates(X, y, [(None, param_combinations[i]) for i in order], self.n_jobs,
+                                        backend='processes')
+        if len(scores) < len(param_combinations) and self.verbose > 0:
+            print(f"Budget exhausted after {len(scores)}/{len(param_combinations)} combinations")
+        scores = dict(zip(order, scores))
+
         for i, params in enumerate(param_combinations):
+            if i not in scores:
+                continue
+            avg_score = scores[i]
             if self.verbose > 1:
-                print(f"  Testing params {i+1}/{len(param_combinations)}: {params}")
-
-            # Cross-validation with proper scaling
-            cv_scores = []
-            
-            for train_idx, val_idx in self.cv.split(X):
-                X_train_cv = X.iloc[train_idx]
-                X_val_cv = X.iloc[val_idx]
-                y_train_cv = y.iloc[train_idx]
-                y_val_cv = y.iloc[val_idx]
-
-                # Scale this specific split using helper
-                data_scaler = helper()
-                X_train_scaled, X_val_scaled = data_scaler.scale(X_train_cv, X_val_cv)
-
-                # Create model with these parameters
-                model = self.estimator.__class__(**{**self.estimator.get_params(), **params})
-                model.fit(X_train_scaled, y_train_cv)
-                predictions = model.predict(X_val_scaled)
-
-                score = self.loss_fn(y_val_cv, predictions)
-
-                cv_scores.append(score)
+                print(f"  Params {i+1}/{len(param_combinations)}: {params} -> {avg_score:.4f}")
 
-            # Average CV score for these parameters
-            avg_score = np.mean(cv_scores)
-            
-            if avg_score > best_score:
+            is_better = (avg_score > best_score) if self.loss_fn.higher_is_better else (avg_score < best_score)
+            if is_better:
                 best_score = avg_score
                 best_params = params
                 if self.verbose > 1:
@@ -62,4 +53,4 @@ class GridSearchTuner(HypertuningInterface):
             print(f"Best parameters: {self.best_params_}")
             print(f"Best CV score: {self.best_score_:.4f}")
 
-        return self
\ No newline at end of file
+        return self
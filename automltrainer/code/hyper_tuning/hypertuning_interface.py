@@ -3,11 +3,14 @@ import pandas as pd
 import numpy as np
 from sklearn.base import BaseEstimator
 from typing import Dict, Any
+from helper.checkpoint import StageCheckpoint
+from helper.cross_validation import CandidateScoringMixin
 
-class HypertuningInterface(ABC, BaseEstimator):
+class HypertuningInterface(CandidateScoringMixin, ABC, BaseEstimator):
     """Abstract interface for hyperparameter tuning methods."""
     
-    def __init__(self, estimator, loss_fn, param_grid: Dict[str, Any], cv=None, n_jobs=-1, verbose=0):
+    def __init__(self, estimator, loss_fn, param_grid: Dict[str, Any], cv=None, n_jobs=-1, verbose=0,
+                 fold_cache=None, checkpoint=None, budget=None, score_cache=None):
         """
         Initialize hyperparameter tuner.
         
@@ -18,6 +21,10 @@ class HypertuningInterface(ABC, BaseEstimator):
             cv: Cross-validation splitter
             n_jobs: Number of parallel jobs
             verbose: Verbosity level
+            fold_cache: Optional shared FoldCache with pre-scaled CV folds
+            budget: Optional Budget; when exhausted the best result so far is kept
+            checkpoint: Optional StageCheckpoint to persist evaluated candidates and resume from
+            score_cache: Optional ScoreCache to reuse fold losses of identical fits
         """
         self.estimator = estimator
         self.loss_fn = loss_fn
@@ -25,6 +32,13 @@ class HypertuningInterface(ABC, BaseEstimator):
         self.cv = cv
         self.n_jobs = n_jobs
         self.verbose = verbose
+        self.fold_cache = fold_cache
+        self.checkpoint = checkpoint
+        self.budget = budget
+        self.score_cache = score_cache
+        self._score_cache_stats = {'hits': 0, 'misses': 0}
+        self._n_skipped_fits = 0
+        self._best_iterations = {}
         self.best_params_ = None
         self.best_score_ = None
     
@@ -42,19 +56,56 @@ class HypertuningInterface(ABC, BaseEstimator):
         """
         pass
     
+    def _evaluation_order(self, param_combinations) -> list:
+        """
+        Indices of param_combinations with the combinations that differ only in
+        the estimator's prefix_param (n_estimators for boosters) next to each
+        other, so each such run is fitted once per fold at its largest value
+        (see CandidateScoringMixin._score_candidates_processes)
+        """
+        prefix_param = getattr(self.estimator, 'prefix_param', None)
+        if prefix_param is None:
+            return list(range(len(param_combinations)))
+        runs = {}
+        for i, params in enumerate(param_combinations):
+            rest = tuple((name, repr(value)) for name, value in params.items() if name != prefix_param)
+            runs.setdefault(rest, []).append(i)
+        return [i for run in runs.values() for i in run]
+
+    @property
+    def best_iteration_(self):
+        """
+        Mean early-stopping best iteration over the CV folds of best_params_,
+        or None when the estimator has no early_stopping_rounds
+        """
+        if self.best_params_ is None:
+            return None
+        return self._best_iterations.get(StageCheckpoint.key(self._candidate_key(None, self.best_params_)))
+
+    def get_final_params(self) -> Dict[str, Any]:
+        """
+        Parameters for the final fit on all training data: best_params_ with
+        n_estimators set to best_iteration_ when early stopping found one
+        (the final fit has no validation fold to stop on)
+        """
+        params = self.get_best_params()
+        if self.best_iteration_ is not None:
+            params['n_estimators'] = self.best_iteration_
+        return params
+
     @property
     def optimized_estimator(self) -> BaseEstimator:
         """
         Get an estimator with the best parameters found.
         
         Returns:
-            Estimator instance with best parameters
+            Estimator instance with best parameters (see get_final_params)
         """
         if self.best_params_ is None:
             raise ValueError("Tuner has not been fitted yet")
         
         # Create new estimator with best parameters
-        return self.estimator.__class__(**{**self.estimator.get_params(), **self.best_params_})
+        return self.estimator.__class__(**{**self.estimator.get_params(), **self.get_final_params()})
     
     def get_best_params(self) -> Dict[str, Any]:
         """Get the best parameters found."""
@@ -1,11 +1,11 @@
 import numpy as np
 from sklearn.base import BaseEstimator
-from helper.helper import helper
 from .hypertuning_interface import HypertuningInterface
 
 class LineSearchTuner(HypertuningInterface):
-    def __init__(self, estimator, loss_fn, param_grid, cv=None, max_passes=2, n_jobs=-1, verbose=0):
-        super().__init__(estimator, loss_fn, param_grid, cv, n_jobs, verbose)
+    def __init__(self, estimator, loss_fn, param_grid, cv=None, max_passes=2, n_jobs=-1, verbose=0,
+                 fold_cache=None, checkpoint=None, budget=None, score_cache=None):
+        super().__init__(estimator, loss_fn, param_grid, cv, n_jobs, verbose, fold_cache, checkpoint, budget, score_cache)
         self.max_passes = max_passes
 
     def fit(self, X, y):
@@ -23,28 +23,14 @@ class LineSearchTuner(HypertuningInterface):
                 print(f"\n--- Pass {pass_num + 1}/{self.max_passes} ---")
 
             for param_name, param_values in self.param_grid.items():
-                param_scores = {}
+                # Cross-validation with proper scaling, one value at a time in this process (n_jobs is
+                # not used); a line along n_estimators shares one booster fit per fold
+                candidates = [(None, {**best_params, param_name: value}) for value in param_values]
+                line_scores = self._score_candidates(X, y, candidates, n_jobs=1, backend='processes')
+                param_scores = dict(zip(param_values, line_scores))
 
-                for value in param_values:
-                    current_params = best_params.copy()
-                    current_params[param_name] = value
-
-                    # Cross-validation with proper scaling
-                    cv_scores = []
-                    for train_idx, val_idx in self.cv.split(X):
-                        X_train_cv, X_val_cv = X.iloc[train_idx], X.iloc[val_idx]
-                        y_train_cv, y_val_cv = y.iloc[train_idx], y.iloc[val_idx]
-
-                        data_scaler = helper()
-                        X_train_scaled, X_val_scaled = data_scaler.scale(X_train_cv, X_val_cv)
-
-                        model = self.estimator.__class__(**{**self.estimator.get_params(), **current_params})
-                        model.fit(X_train_scaled, y_train_cv)
-                        predictions = model.predict(X_val_scaled)
-                        score = self.loss_fn(y_val_cv, predictions)
-                        cv_scores.append(score)
-
-                    param_scores[value] = np.mean(cv_scores)
+                if not param_scores:
+                    break  # Budget used up
 
                 # Find best value for the current parameter
                 best_value_for_param = min(param_scores, key=param_scores.get) if not self.loss_fn.higher_is_better else max(param_scores, key=param_scores.get)
@@ -60,6 +46,11 @@ class LineSearchTuner(HypertuningInterface):
                     if self.verbose > 0:
                         print(f"  New best for '{param_name}': {best_value_for_param} -> Score: {self.best_score_:.4f}")
 
+            if self._budget_exhausted():
+                if self.verbose > 0:
+                    print("Budget exhausted, keeping the best parameters found so far")
+                break
+
             if not pass_improved and pass_num > 0:
                 if self.verbose > 0:
                     print("Stopping early, no improvement in a full pass.")
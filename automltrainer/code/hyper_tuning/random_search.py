@@ -6,8 +6,9 @@ import random
 class RandomSearchTuner(HypertuningInterface):
     """Random search hyperparameter tuning - randomly samples from parameter space."""
     
-    def __init__(self, estimator, loss_fn, param_grid, cv=None, n_iter=10, n_jobs=-1, verbose=0, random_state=None):
-        super().__init__(estimator, loss_fn, param_grid, cv, n_jobs, verbose)
+    def __init__(self, estimator, loss_fn, param_grid, cv=None, n_iter=10, n_jobs=-1, verbose=0, random_state=None,
+                 fold_cache=None, checkpoint=None, budget=None, score_cache=None):
+        super().__init__(estimator, loss_fn, param_grid, cv, n_jobs, verbose, fold_cache, checkpoint, budget, score_cache)
         self.n_iter = n_iter
         self.random_state = random_state
         
@@ -17,8 +18,6 @@ class RandomSearchTuner(HypertuningInterface):
     
     def fit(self, X: pd.DataFrame, y: pd.Series) -> 'RandomSearchTuner':
         """Fit using random search."""
-        from helper.helper import helper
-        
         best_score = float('-inf') if self.loss_fn.higher_is_better else float('inf')
         best_params = None
         
@@ -26,6 +25,10 @@ class RandomSearchTuner(HypertuningInterface):
             print(f"Testing {self.n_iter} random parameter combinations")
         
         for i in range(self.n_iter):
+            if self._budget_exhausted():
+                if self.verbose > 0:
+                    print(f"Budget exhausted after {i}/{self.n_iter} combinations")
+                break
             # Generate random parameters
             params = {}
             for param_name, param_values in self.param_grid.items():
@@ -47,29 +50,8 @@ class RandomSearchTuner(HypertuningInterface):
             if self.verbose > 1:
                 print(f"  Testing params {i+1}/{self.n_iter}: {params}")
             
-            # Cross-validation with proper scaling
-            cv_scores = []
-            
-            for train_idx, val_idx in self.cv.split(X):
-                X_train_cv = X.iloc[train_idx]
-                X_val_cv = X.iloc[val_idx]
-                y_train_cv = y.iloc[train_idx]
-                y_val_cv = y.iloc[val_idx]
-                
-                # Scale this specific split
-                data_scaler = helper()
-                X_train_scaled, X_val_scaled = data_scaler.scale(X_train_cv, X_val_cv)
-                
-                # Create model with these parameters
-                model = self.estimator.__class__(**{**self.estimator.get_params(), **params})
-                model.fit(X_train_scaled, y_train_cv)
-                predictions = model.predict(X_val_scaled)
-                
-                score = self.loss_fn(y_val_cv, predictions)
-                cv_scores.append(score)
-            
-            # Average CV score for these parameters
-            avg_score = np.mean(cv_scores)
+            # Average CV score for these parameters (cross-validation with proper scaling)
+            avg_score = self._score_candidates(X, y, [(None, params)], backend='processes')[0]
             
             # Check if this is the best score
             is_better = (avg_score > best_score) if self.loss_fn.higher_is_better else (avg_score < best_score)
@@ -0,0 +1,232 @@
+import math
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import ParameterGrid
+from helper.profiler import counters
+from .hypertuning_interface import HypertuningInterface
+
+
+class SuccessiveHalvingTuner(HypertuningInterface):
+    """Successive halving: many configurations on a small resource, only the best promoted.
+
+    Every rung scores the surviving configurations with resource r and
+    promotes the best 1/eta of them to the next rung with eta times the
+    resource, until the survivors are scored with the full resource. The
+    resource is one of:
+
+    - 'rows': the most recent fraction r of every CV fold's training rows
+    - 'folds': the last r CV folds (those with the most training data)
+    - 'n_estimators': boosting rounds; the grid's n_estimators axis becomes the resource
+
+    best_params_ / best_score_ come from the last rung, so best_score_ is a
+    full CV score, comparable with GridSearchTuner's. fit_report_ compares the
+    number of fold fits actually run (score cache and checkpoint hits and
+    shared n_estimators prefixes cost none) with the equivalent grid search.
+    """
+
+    RESOURCES = ('rows', 'folds', 'n_estimators')
+
+    def __init__(self, estimator, loss_fn, param_grid, cv=None, resource='rows', eta=3, min_resource=None,
+                 n_candidates=None, n_jobs=-1, verbose=0, random_state=42, fold_cache=None, checkpoint=None,
+                 budget=None, score_cache=None):
+        """
+        Args:
+            resource: 'rows', 'folds' or 'n_estimators' (see class docstring)
+            eta: Promotion factor: 1/eta of the configurations survive a rung, the resource grows by eta
+            min_resource: Resource of the first rung (default: full resource / eta^2, one fold for 'folds')
+            n_candidates: Configurations drawn from the grid (default: all of them)
+            n_jobs: Worker processes for the fold fits of a rung, as in GridSearchTuner
+            random_state: Seed for drawing n_candidates configurations
+        """
+        super().__init__(estimator, loss_fn, param_grid, cv, n_jobs, verbose, fold_cache, checkpoint, budget, score_cache)
+        if resource not in self.RESOURCES:
+            raise ValueError(f"Unknown resource '{resource}'. Available: {', '.join(self.RESOURCES)}")
+        if resource == 'n_estimators' and 'n_estimators' not in estimator.get_params():
+            raise ValueError(f"resource='n_estimators' requires a boosted model, got {type(estimator).__name__}")
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        self.resource = resource
+        self.eta = eta
+        self.min_resource = min_resource
+        self.n_candidates = n_candidates
+        self.random_state = random_state
+        self.rungs_ = []
+        self.fit_report_ = None
+
+    def _max_resource(self):
+        if self.resource == 'rows':
+            return 1.0
+        if self.resource == 'folds':
+            return self._n_folds()
+        return max(self.param_grid.get('n_estimators', [self.estimator.get_params()['n_estimators']]))
+
+    def _rung_resources(self) -> list:
+        """Resource of every rung, from min_resource up to the full resource"""
+        max_resource = self._max_resource()
+        resource = self.min_resource
+        if resource is None:
+            resource = 1 if self.resource == 'folds' else max_resource / self.eta ** 2
+        resources = []
+        while resource < max_resource:
+            resources.append(resource if self.resource == 'rows' else max(1, int(round(resource))))
+            resource *= self.eta
+        resources.append(max_resource)
+        return sorted(set(resources))
+
+    def _search_space(self) -> list:
+        """All configurations of the grid, without the axis that is the resource"""
+        grid = {name: values for name, values in self.param_grid.items()
+                if not (self.resource == 'n_estimators' and name == 'n_estimators')}
+        return list(ParameterGrid(grid))
+
+    def _sample(self, configs, n, rng) -> list:
+        """n configurations drawn without replacement, in grid order with n_estimators runs adjacent"""
+        if n is not None and n < len(configs):
+            configs = [configs[i] for i in sorted(rng.choice(len(configs), n, replace=False))]
+        return [configs[i] for i in self._evaluation_order(configs)]
+
+    def _evaluate(self, X, y, configs, resource) -> list:
+        """Mean CV losses of configs with the given resource (fewer once the budget runs out)"""
+        n_folds = self._n_folds()
+        kwargs = {}
+        candidates = [(None, params) for params in configs]
+        if self.resource == 'n_estimators':
+            candidates = [(None, {**params, 'n_estimators': resource}) for params in configs]
+        elif self.resource == 'folds' and resource < n_folds:
+            kwargs['folds'] = list(range(n_folds - resource, n_folds))
+        elif self.resource == 'rows' and resource < 1:
+            kwargs['train_fraction'] = resource
+        folds_before = counters['cv_folds']
+        scores = self._score_candidates_processes(X, y, candidates, joblib.effective_n_jobs(self.n_jobs),
+                                                  **kwargs)
+
+        fits = counters['cv_folds'] - folds_before
+        full_fits = fits * resource / self._max_resource() if self.resource != 'folds' else fits
+        self._n_fits += fits
+        self._full_fit_equivalents += full_fits
+        return scores
+
+    def _successive_halving(self, X, y, configs, resources) -> tuple:
+        """
+        Run one set of configurations through the given rungs.
+
+        Returns:
+            (configurations, scores, resource) of the last rung that was scored
+        """
+        last = ([], [], None)
+        for rung, resource in enumerate(resources):
+            if self._budget_exhausted():
+                break
+            scores = self._evaluate(X, y, configs, resource)
+            if not scores:
+                break
+            configs = configs[:len(scores)]
+            last = (configs, scores, resource)
+            self.rungs_.append({'resource': resource, 'n_configs': len(configs),
+                                'best_score': min(scores) if not self.loss_fn.higher_is_better else max(scores)})
+            if self.verbose > 0:
+                print(f"  Rung {rung + 1}/{len(resources)}: {len(configs)} configurations, "
+                      f"{self.resource}={resource:g}, best CV score: {self.rungs_[-1]['best_score']:.4f}")
+
+            # Ties go to the earliest configuration
+            sign = -1 if self.loss_fn.higher_is_better else 1
+            order = sorted(range(len(scores)), key=lambda i: (sign * scores[i], i))
+            configs = [configs[i] for i in sorted(order[:max(1, len(configs) // self.eta)])]
+        return last
+
+    def _keep_best(self, configs, scores, resource):
+        """Take the best of a finished bracket into best_params_ / best_score_ (full-resource scores first)"""
+        full = resource == self._max_resource()
+        best_full = self._best_resource == self._max_resource()
+        if best_full and not full:
+            return
+        for params, score in zip(configs, scores):
+            is_better = self.best_score_ is None or (full and not best_full) or \
+                ((score > self.best_score_) if self.loss_fn.higher_is_better else (score < self.best_score_))
+            if is_better:
+                best_full = full
+                self.best_score_ = score
+                self.best_params_ = {**params, 'n_estimators': resource} if self.resource == 'n_estimators' \
+                    else dict(params)
+                self._best_resource = resource
+
+    def _start(self):
+        self.rungs_ = []
+        self._n_fits = 0
+        self._full_fit_equivalents = 0.0
+        self._best_resource = None
+        self.best_params_ = None
+        self.best_score_ = None
+        if self.fold_cache is not None:
+            self.fold_cache.build()  # Build the cached folds once, before the first rung
+
+    def _finish(self):
+        grid_fits = len(ParameterGrid(self.param_grid)) * self._n_folds()
+        self.fit_report_ = {
+            'fits': self._n_fits,
+            'full_fit_equivalents': self._full_fit_equivalents,
+            'grid_fits': grid_fits,
+            'fit_ratio': self._n_fits / grid_fits if grid_fits else 0.0,
+        }
+        if self.verbose > 0:
+            if self.best_params_ is not None and self._best_resource != self._max_resource():
+                print(f"Budget exhausted before the last rung, best score is for {self.resource}="
+                      f"{self._best_resource:g}")
+            print(f"Best parameters: {self.best_params_}")
+            if self.best_score_ is not None:
+                print(f"Best CV score: {self.best_score_:.4f}")
+            print(f"Fold fits: {self._n_fits} ({self._full_fit_equivalents:.0f} full-fit equivalents) "
+                  f"vs {grid_fits} for the equivalent grid search")
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> 'SuccessiveHalvingTuner':
+        """Fit using successive halving over the (sampled) grid."""
+        self._start()
+        configs = self._sample(self._search_space(), self.n_candidates, np.random.default_rng(self.random_state))
+        resources = self._rung_resources()
+        if self.verbose > 0:
+            print(f"Successive halving: {len(configs)} configurations, {self.resource} rungs {resources}")
+
+        self._keep_best(*self._successive_halving(X, y, configs, resources))
+        self._finish()
+        return self
+
+
+class HyperbandTuner(SuccessiveHalvingTuner):
+    """Hyperband: successive halving brackets from aggressive to conservative.
+
+    Bracket s starts ceil((s_max + 1) / (s + 1) * eta^s) configurations drawn
+    from the grid at the s-th smallest rung below the full resource, so the
+    first bracket explores many configurations on a tiny resource and the last
+    one scores a few with the full resource only. This hedges against a small
+    resource ranking configurations badly. The best full-resource score over
+    all brackets wins.
+    """
+
+    def __init__(self, estimator, loss_fn, param_grid, cv=None, resource='rows', eta=3, min_resource=None,
+                 n_jobs=-1, verbose=0, random_state=42, fold_cache=None, checkpoint=None, budget=None,
+                 score_cache=None):
+        super().__init__(estimator, loss_fn, param_grid, cv, resource, eta, min_resource, None, n_jobs, verbose,
+                         random_state, fold_cache, checkpoint, budget, score_cache)
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> 'HyperbandTuner':
+        """Fit using Hyperband over the grid."""
+        self._start()
+        space = self._search_space()
+        resources = self._rung_resources()
+        rng = np.random.default_rng(self.random_state)
+        s_max = len(resources) - 1
+
+        for s in range(s_max, -1, -1):
+            if self._budget_exhausted():
+                break
+            n_configs = math.ceil((s_max + 1) / (s + 1) * self.eta ** s)
+            configs = self._sample(space, n_configs, rng)
+            if self.verbose > 0:
+                print(f"Bracket {s_max - s + 1}/{s_max + 1}: {len(configs)} configurations, "
+                      f"{self.resource} rungs {resources[-(s + 1):]}")
+            self._keep_best(*self._successive_halving(X, y, configs, resources[-(s + 1):]))
+
+        self._finish()
+        return self
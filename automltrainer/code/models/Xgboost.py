@@ -1,13 +1,17 @@
+import numpy as np
 import xgboost as xgb
 from sklearn.base import BaseEstimator, RegressorMixin
 from .base_model import BaseModelConfig
 
 class XGBoostConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
     """XGBoost model with configuration - combines wrapper and config in one class"""
+
+    thread_param = 'n_jobs'  # Passed through **kwargs to the sklearn regressor
+    prefix_param = 'n_estimators'  # The first k rounds of a fitted booster equal a booster fitted with k
     
     def __init__(self, n_estimators=100, learning_rate=0.1, max_depth=6, 
                  subsample=1.0, colsample_bytree=1.0, random_state=42, 
-                 loss_fn=None, **kwargs):
+                 loss_fn=None, early_stopping_rounds=None, **kwargs):
         self.n_estimators = n_estimators
         self.learning_rate = learning_rate
         self.max_depth = max_depth
@@ -15,8 +19,11 @@ class XGBoostConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
         self.colsample_bytree = colsample_bytree
         self.random_state = random_state
         self.loss_fn = loss_fn  # Store custom loss function
+        self.early_stopping_rounds = early_stopping_rounds  # Only used when fit() gets an eval_set
         self.kwargs = kwargs
         self.model = None
+        self.best_iteration_ = None
+        self._eval_history = None
     
     def _get_xgb_objective(self, loss_fn):
         """Map custom loss function to XGBoost objective"""
@@ -30,6 +37,11 @@ class XGBoostConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
             return 'reg:squarederror'
         else:
             return 'reg:squarederror'  # Fallback
+
+    def _get_xgb_eval_metric(self, loss_fn):
+        """Map custom loss function to the XGBoost metric early stopping monitors"""
+        metrics = {'mae': 'mae', 'rmse': 'rmse', 'mape': 'mape'}
+        return metrics.get(loss_fn.name.lower(), 'rmse') if loss_fn is not None else 'rmse'
     
     # BaseModelConfig methods (configuration interface)
     def get_model(self, loss_fn=None, **kwargs):
@@ -71,10 +83,22 @@ class XGBoostConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
         return grids.get(grid_type, grids['small'])
     
     # Sklearn interface methods (model functionality)
-    def fit(self, X, y):
-        """Fit the XGBoost model"""
+    def fit(self, X, y, eval_set=None):
+        """
+        Fit the XGBoost model
+
+        Args:
+            eval_set: (X_val, y_val) to stop on when early_stopping_rounds is set; without it all
+                      n_estimators rounds are trained
+        """
         # Map custom loss to XGBoost objective
         objective = self._get_xgb_objective(self.loss_fn)
+        early_stopping = self.early_stopping_rounds is not None and eval_set is not None
+        if early_stopping:
+            stopping_params = {'early_stopping_rounds': self.early_stopping_rounds,
+                               'eval_metric': self._get_xgb_eval_metric(self.loss_fn)}
+        else:
+            stopping_params = {}
         
         self.model = xgb.XGBRegressor(
             n_estimators=self.n_estimators,
@@ -84,15 +108,37 @@ class XGBoostConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
             colsample_bytree=self.colsample_bytree,
             random_state=self.random_state,
             objective=objective,  # Use mapped objective
+            **stopping_params,
             **self.kwargs
         )
-        self.model.fit(X, y)
+        if early_stopping:
+            self.model.fit(X, y, eval_set=[eval_set], verbose=False)
+            self._eval_history = next(iter(self.model.evals_result()['validation_0'].values()))
+            self.best_iteration_ = self.model.best_iteration + 1  # Rounds kept, predict() uses only these
+        else:
+            self.model.fit(X, y)
+            self.best_iteration_ = None
+            self._eval_history = None
         return self
+
+    def best_iteration_within(self, n_estimators):
+        """Rounds an early-stopped fit would keep with n_estimators as its limit (best validation round)"""
+        if self._eval_history is None:
+            return n_estimators
+        return int(np.argmin(self._eval_history[:n_estimators])) + 1
     
-    def predict(self, X):
-        """Make predictions"""
+    def predict(self, X, n_estimators=None):
+        """
+        Make predictions
+
+        Args:
+            n_estimators: Predict as a model fitted with this n_estimators (the first rounds, or the
+                          best of them after early stopping); default: all rounds kept
+        """
         if self.model is None:
             raise ValueError("Model not fitted yet. Call fit() first.")
+        if n_estimators is not None:
+            return self.model.predict(X, iteration_range=(0, self.best_iteration_within(n_estimators)))
         return self.model.predict(X)
     
     def get_params(self, deep=True):
@@ -105,6 +151,7 @@ class XGBoostConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
             'colsample_bytree': self.colsample_bytree,
             'random_state': self.random_state,
             'loss_fn': self.loss_fn,
+            'early_stopping_rounds': self.early_stopping_rounds,
             **self.kwargs
         }
     
@@ -112,12 +159,37 @@ class XGBoostConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
         """Set the parameters of this estimator"""
         for param, value in params.items():
             if param in ['n_estimators', 'learning_rate', 'max_depth', 
-                        'subsample', 'colsample_bytree', 'random_state', 'loss_fn']:
+                        'subsample', 'colsample_bytree', 'random_state', 'loss_fn', 'early_stopping_rounds']:
                 setattr(self, param, value)
             else:
                 self.kwargs[param] = value
         return self
     
+    def get_feature_importance(self, importance_type='gain', X=None):
+        """
+        Per-feature importance of the fitted booster, in column order.
+
+        Args:
+            importance_type: 'gain', 'split' (number of splits) or 'shap'
+                             (mean absolute contribution on X)
+            X: Data to compute contributions on, required for 'shap'
+        """
+        if self.model is None:
+            raise ValueError("Model not fitted yet. Call fit() first.")
+        booster = self.model.get_booster()
+        if importance_type == 'shap':
+            if X is None:
+                raise ValueError("importance_type='shap' requires X")
+            contributions = booster.predict(xgb.DMatrix(X), pred_contribs=True)
+            return np.abs(contributions[:, :-1]).mean(axis=0)  # Last column is the bias
+
+        xgb_types = {'gain': 'gain', 'split': 'weight'}
+        if importance_type not in xgb_types:
+            raise ValueError(f"Unknown importance_type '{importance_type}'. Available: gain, split, shap")
+        names = booster.feature_names or [f"f{i}" for i in range(self.model.n_features_in_)]
+        scores = booster.get_score(importance_type=xgb_types[importance_type])
+        return np.array([scores.get(name, 0.0) for name in names])  # Unused features are missing from scores
+
     def save_model(self, filepath):
         """Save XGBoost model weights to JSON format"""
         if hasattr(self, 'model') and self.model is not None:
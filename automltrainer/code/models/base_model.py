@@ -5,6 +5,11 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
 class BaseModelConfig(ABC):
     """Abstract base class for all model configurations"""
+
+    # Keyword of the model's own thread count (None: single-threaded), capped by parallel CV workers
+    thread_param = None
+    # Parameter whose smaller values a fitted model can score itself (predict(X, n_estimators=k) for boosters)
+    prefix_param = None
     
     @abstractmethod
     def get_model(self, **kwargs):
@@ -1,13 +1,17 @@
 import lightgbm as lgb
+import numpy as np
 from sklearn.base import BaseEstimator, RegressorMixin
 from .base_model import BaseModelConfig
 
 class LightgbmConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
     """LightGBM model with configuration"""
 
+    thread_param = 'n_jobs'  # Passed through **kwargs to the sklearn regressor
+    prefix_param = 'n_estimators'  # The first k rounds of a fitted booster equal a booster fitted with k
+
     def __init__(self, n_estimators=100, learning_rate=0.1, max_depth=-1,
                  num_leaves=31, subsample=1.0, colsample_bytree=1.0,
-                 random_state=42, loss_fn=None, **kwargs):
+                 random_state=42, loss_fn=None, early_stopping_rounds=None, **kwargs):
         self.n_estimators = n_estimators
         self.learning_rate = learning_rate
         self.max_depth = max_depth
@@ -16,8 +20,11 @@ class LightgbmConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
         self.colsample_bytree = colsample_bytree
         self.random_state = random_state
         self.loss_fn = loss_fn
+        self.early_stopping_rounds = early_stopping_rounds  # Only used when fit() gets an eval_set
         self.kwargs = kwargs
         self.model = None
+        self.best_iteration_ = None
+        self._eval_history = None
 
     def _get_lgb_objective(self, loss_fn):
         """Map custom loss function to LightGBM objective"""
@@ -34,6 +41,11 @@ class LightgbmConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
         else:
             return 'regression_l2'  # Fallback
 
+    def _get_lgb_metric(self, loss_fn):
+        """Map custom loss function to the LightGBM metric early stopping monitors"""
+        metrics = {'mae': 'l1', 'rmse': 'rmse', 'mape': 'mape'}
+        return metrics.get(loss_fn.name.lower(), 'l2') if loss_fn is not None else 'l2'
+
     def get_model(self, loss_fn=None, **kwargs):
         """Create LightGBM model with default parameters"""
         default_params = {
@@ -73,9 +85,17 @@ class LightgbmConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
         }
         return grids.get(grid_type, grids['small'])
 
-    def fit(self, X, y):
-        """Fit the LightGBM model"""
+    def fit(self, X, y, eval_set=None):
+        """
+        Fit the LightGBM model
+
+        Args:
+            eval_set: (X_val, y_val) to stop on when early_stopping_rounds is set; without it all
+                      n_estimators rounds are trained
+        """
         objective = self._get_lgb_objective(self.loss_fn)
+        early_stopping = self.early_stopping_rounds is not None and eval_set is not None
+        stopping_params = {'metric': self._get_lgb_metric(self.loss_fn)} if early_stopping else {}
 
         self.model = lgb.LGBMRegressor(
             n_estimators=self.n_estimators,
@@ -86,15 +106,38 @@ class LightgbmConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
             colsample_bytree=self.colsample_bytree,
             random_state=self.random_state,
             objective=objective,
+            **stopping_params,
             **self.kwargs
         )
-        self.model.fit(X, y)
+        if early_stopping:
+            self.model.fit(X, y, eval_set=[eval_set],
+                           callbacks=[lgb.early_stopping(self.early_stopping_rounds, verbose=False)])
+            self._eval_history = next(iter(self.model.evals_result_['valid_0'].values()))
+            self.best_iteration_ = self.model.best_iteration_  # Rounds kept, predict() uses only these
+        else:
+            self.model.fit(X, y)
+            self.best_iteration_ = None
+            self._eval_history = None
         return self
 
-    def predict(self, X):
-        """Make predictions"""
+    def best_iteration_within(self, n_estimators):
+        """Rounds an early-stopped fit would keep with n_estimators as its limit (best validation round)"""
+        if self._eval_history is None:
+            return n_estimators
+        return int(np.argmin(self._eval_history[:n_estimators])) + 1
+
+    def predict(self, X, n_estimators=None):
+        """
+        Make predictions
+
+        Args:
+            n_estimators: Predict as a model fitted with this n_estimators (the first rounds, or the
+                          best of them after early stopping); default: all rounds kept
+        """
         if self.model is None:
             raise ValueError("Model not fitted yet. Call fit() first.")
+        if n_estimators is not None:
+            return self.model.predict(X, num_iteration=self.best_iteration_within(n_estimators))
         return self.model.predict(X)
 
     def get_params(self, deep=True):
@@ -108,6 +151,7 @@ class LightgbmConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
             'colsample_bytree': self.colsample_bytree,
             'random_state': self.random_state,
             'loss_fn': self.loss_fn,
+            'early_stopping_rounds': self.early_stopping_rounds,
             **self.kwargs
         }
 
@@ -120,6 +164,26 @@ class LightgbmConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
                 self.kwargs[param] = value
         return self
 
+    def get_feature_importance(self, importance_type='gain', X=None):
+        """
+        Per-feature importance of the fitted booster, in column order.
+
+        Args:
+            importance_type: 'gain', 'split' (number of splits) or 'shap'
+                             (mean absolute contribution on X)
+            X: Data to compute contributions on, required for 'shap'
+        """
+        if self.model is None:
+            raise ValueError("Model not fitted yet. Call fit() first.")
+        if importance_type == 'shap':
+            if X is None:
+                raise ValueError("importance_type='shap' requires X")
+            contributions = self.model.predict(X, pred_contrib=True)
+            return np.abs(contributions[:, :-1]).mean(axis=0)  # Last column is the bias
+        if importance_type not in ('gain', 'split'):
+            raise ValueError(f"Unknown importance_type '{importance_type}'. Available: gain, split, shap")
+        return self.model.booster_.feature_importance(importance_type=importance_type).astype(float)
+
     def save_model(self, filepath):
         """Save LightGBM model weights to text format"""
         if hasattr(self, 'model') and self.model is not None:
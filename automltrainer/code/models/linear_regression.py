@@ -1,3 +1,4 @@
+import numpy as np
 from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
 from sklearn.base import BaseEstimator, RegressorMixin
 from .base_model import BaseModelConfig
@@ -80,15 +81,23 @@ class LinearRegressionConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
             random_state=self.random_state
         )
         
-        # Fit the model
-        self.model.fit(X, y)
+        # Fit the model (solved in float64 even when the pipeline stores compact float32 features)
+        self.model.fit(self._as_float64(X), y)
         return self
+
+    @staticmethod
+    def _as_float64(X):
+        """Upcast float32 inputs, leaving float64 data untouched (no copy)"""
+        if hasattr(X, 'dtypes'):
+            return X.astype(np.float64) if any(dtype != np.float64 for dtype in X.dtypes) else X
+        X = np.asarray(X)
+        return X.astype(np.float64) if X.dtype != np.float64 else X
     
     def predict(self, X):
         """Make predictions"""
         if self.model is None:
             raise ValueError("Model not fitted. Call fit() first.")
-        return self.model.predict(X)
+        return self.model.predict(self._as_float64(X))
     
     def get_params(self, deep=True):
         """Get parameters for this estimator"""
@@ -113,8 +122,9 @@ class LinearRegressionConfig(BaseModelConfig, BaseEstimator, RegressorMixin):
             raise ValueError("Model not fitted. Call fit() first.")
         return self.model.score(X, y)
     
-    def get_feature_importance(self):
-        """Get feature importance (coefficients for linear models)"""
+    def get_feature_importance(self, importance_type='coef', X=None):
+        """Get feature importance (absolute coefficients; importance_type and X are accepted for
+        compatibility with the booster wrappers and ignored)"""
         if self.model is None:
             raise ValueError("Model not fitted. Call fit() first.")
         
@@ -305,6 +305,994 @@ def test_edge_cases():
     except Exception as e:
         print(f"Invalid loss function handling: {e}")
 
+def test_fold_cache():
+    """Test that the shared fold cache matches per-split helper scaling."""
+    print("\n" + "="*60)
+    print("TEST 9: FOLD CACHE")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.helper import helper
+    from helper.fold_cache import FoldCache
+    
+    df = create_test_data()
+    X = df[[col for col in df.columns if col not in ['target', 'date']]]
+    y = df['target']
+    cv = TimeSeriesSplit(n_splits=3)
+    cache = FoldCache(X, y, cv)
+    columns = ['feature_3', 'feature_0']
+    
+    try:
+        for fold_idx, (train_idx, val_idx) in enumerate(cv.split(X)):
+            expected_train, expected_val = helper().scale(X[columns].iloc[train_idx], X[columns].iloc[val_idx])
+            X_train_scaled, X_val_scaled, _, _ = cache.get_fold(fold_idx, columns)
+            assert np.allclose(X_train_scaled, expected_train.to_numpy())
+            assert np.allclose(X_val_scaled, expected_val.to_numpy())
+        list(cache.folds())
+        print(f"Fold cache matches helper scaling. Stats: {cache.stats()}")
+    except AssertionError:
+        print("ERROR: Fold cache scaling differs from helper scaling")
+
+def test_permutation_importance():
+    """Test that permutation importance keeps the informative features."""
+    print("\n" + "="*60)
+    print("TEST 10: PERMUTATION IMPORTANCE SELECTOR")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from feature_selection import PermutationImportanceSelector
+    from models.linear_regression import LinearRegressionConfig
+    
+    df = create_test_data()
+    X = df[[col for col in df.columns if col not in ['target', 'date']]]
+    y = df['target']
+    
+    selector = PermutationImportanceSelector(LinearRegressionConfig(), mae(), cv=TimeSeriesSplit(n_splits=3),
+                                             n_repeats=3)
+    selector.fit(X, y)
+    print(f"Importances: {selector.importances_}")
+    print(f"Selected features: {selector.selected_features_}")
+    if not {'feature_0', 'feature_1', 'feature_2'} <= set(selector.selected_features_):
+        print("ERROR: Informative features were dropped")
+
+def test_successive_halving():
+    """Test that successive halving fits less than the grid and finds its optimum."""
+    print("\n" + "="*60)
+    print("TEST 11: SUCCESSIVE HALVING TUNER")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from hyper_tuning import GridSearchTuner, SuccessiveHalvingTuner
+    from models.linear_regression import LinearRegressionConfig
+    
+    df = create_test_data()
+    X = df[[col for col in df.columns if col not in ['target', 'date']]]
+    y = df['target']
+    param_grid = {'model_type': ['linear', 'ridge', 'lasso'], 'alpha': [0.01, 0.1, 1.0, 10.0]}
+    cv = TimeSeriesSplit(n_splits=3)
+    
+    grid = GridSearchTuner(LinearRegressionConfig(), mae(), param_grid, cv=cv, n_jobs=1).fit(X, y)
+    tuner = SuccessiveHalvingTuner(LinearRegressionConfig(), mae(), param_grid, cv=cv, resource='folds',
+                                   n_jobs=1).fit(X, y)
+    print(f"Best params: {tuner.best_params_} (grid: {grid.best_params_})")
+    print(f"Fits: {tuner.fit_report_}")
+    if tuner.fit_report_['fits'] >= tuner.fit_report_['grid_fits']:
+        print("ERROR: Successive halving did not save fits")
+    if tuner.best_score_ > grid.best_score_ * 1.05:
+        print("ERROR: Successive halving is far from the grid optimum")
+
+def test_early_stopping():
+    """Test that tuned boosters stop on the validation fold and refit with the mean best iteration."""
+    print("\n" + "="*60)
+    print("TEST 12: EARLY STOPPING")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from hyper_tuning import GridSearchTuner
+    from models.Xgboost import XGBoostConfig
+    
+    df = create_test_data()
+    X = df[[col for col in df.columns if col not in ['target', 'date']]]
+    y = df['target']
+    param_grid = {'n_estimators': [200, 500], 'learning_rate': [0.1]}
+    cv = TimeSeriesSplit(n_splits=3)
+    
+    tuner = GridSearchTuner(XGBoostConfig(loss_fn=mae(), early_stopping_rounds=10), mae(), param_grid, cv=cv,
+                            n_jobs=1).fit(X, y)
+    print(f"Best params: {tuner.best_params_}, best iteration: {tuner.best_iteration_}")
+    print(f"Final params: {tuner.get_final_params()}")
+    if tuner.best_iteration_ is None or tuner.best_iteration_ > tuner.best_params_['n_estimators']:
+        print("ERROR: No valid best iteration recorded")
+    if tuner.optimized_estimator.n_estimators != tuner.best_iteration_:
+        print("ERROR: Final estimator does not use the best iteration")
+
+def test_fold_cache_prefix_scalers():
+    """Test that the prefix-statistics fold scalers match a StandardScaler fitted per fold."""
+    print("\n" + "="*60)
+    print("TEST 13: PREFIX FOLD SCALERS")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from sklearn.preprocessing import StandardScaler
+    from helper.fold_cache import FoldCache
+    
+    df = create_test_data()
+    X = df[[col for col in df.columns if col not in ['target', 'date']]].copy()
+    # Large offsets relative to the spread are where running sums lose precision
+    X['price'] = 3e9 + np.random.default_rng(0).normal(scale=2e5, size=len(X))
+    X['constant'] = 3.1
+    y = df['target']
+    cv = TimeSeriesSplit(n_splits=4)
+    cache = FoldCache(X, y, cv)
+    
+    try:
+        for fold_idx, (train_idx, val_idx) in enumerate(cv.split(X)):
+            scaler = StandardScaler().fit(X.iloc[train_idx])
+            X_train_scaled, X_val_scaled, _, _ = cache.get_fold(fold_idx)
+            assert np.allclose(X_train_scaled, scaler.transform(X.iloc[train_idx]))
+            assert np.allclose(X_val_scaled, scaler.transform(X.iloc[val_idx]))
+        X_train_final, _, _ = cache.scale_final(X, X)
+        assert np.allclose(X_train_final, StandardScaler().fit_transform(X))
+        print("Prefix scalers match StandardScaler on every fold and the final fit")
+    except AssertionError:
+        print("ERROR: Prefix scalers differ from StandardScaler")
+
+def test_checkpoint_resume():
+    """Test that interrupted selector and tuner stages resume from their checkpoints."""
+    print("\n" + "="*60)
+    print("TEST 14: CHECKPOINT AND RESUME")
+    print("="*60)
+    
+    import tempfile
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.checkpoint import StageCheckpoint
+    from helper.profiler import counters
+    from models.linear_regression import LinearRegressionConfig
+    
+    class CrashingLoss:
+        """mae that raises after max_calls fold scores, like a run killed mid-stage"""
+        def __init__(self, max_calls):
+            self.loss = mae()
+            self.name = self.loss.name
+            self.higher_is_better = self.loss.higher_is_better
+            self.max_calls = max_calls
+        
+        def __call__(self, y_true, y_pred):
+            self.max_calls -= 1
+            if self.max_calls < 0:
+                raise RuntimeError("interrupted")
+            return self.loss(y_true, y_pred)
+    
+    df = create_test_data()
+    X = df[[col for col in df.columns if col not in ['target', 'date']]]
+    y = df['target']
+    cv = TimeSeriesSplit(n_splits=3)
+    param_grid = {'model_type': ['linear', 'ridge', 'lasso'], 'alpha': [0.01, 0.1, 1.0, 10.0]}
+    
+    stages = [
+        ('Tuner', lambda loss, checkpoint: GridSearchTuner(LinearRegressionConfig(), loss, param_grid, cv=cv, n_jobs=1,
+                                                           checkpoint=checkpoint),
+         lambda fitted: (fitted.best_params_, fitted.best_score_)),
+        ('Selector', lambda loss, checkpoint: BackwardFeatureSelector(LinearRegressionConfig(), loss, cv=cv,
+                                                                      linear_fast_path=False, checkpoint=checkpoint),
+         lambda fitted: (fitted.selected_features_, fitted.best_score_)),
+    ]
+    for name, make, result in stages:
+        before = counters['cv_folds']
+        expected = result(make(mae(), None).fit(X, y))
+        uninterrupted_fits = counters['cv_folds'] - before
+        
+        directory = tempfile.mkdtemp()
+        try:
+            make(CrashingLoss(20), StageCheckpoint(directory)).fit(X, y)
+            print(f"ERROR: {name} was not interrupted")
+        except RuntimeError:
+            pass
+        before = counters['cv_folds']
+        resumed = result(make(mae(), StageCheckpoint(directory)).fit(X, y))
+        resumed_fits = counters['cv_folds'] - before
+        print(f"{name}: resumed with {resumed_fits} of {uninterrupted_fits} fold fits -> {resumed[0]}")
+        if resumed != expected:
+            print(f"ERROR: Resumed {name.lower()} result differs from an uninterrupted run: {expected}")
+        if resumed_fits >= uninterrupted_fits:
+            print(f"ERROR: Resumed {name.lower()} refitted completed candidates")
+    
+    # A budget that runs out mid-step leaves the stage unfinished, so a resumed run completes the selection
+    from helper.budget import Budget
+    directory = tempfile.mkdtemp()
+    BackwardFeatureSelector(LinearRegressionConfig(), mae(), cv=cv, linear_fast_path=False,
+                            checkpoint=StageCheckpoint(directory), budget=Budget(max_evaluations=6)).fit(X, y)
+    resumed = BackwardFeatureSelector(LinearRegressionConfig(), mae(), cv=cv, linear_fast_path=False,
+                                      checkpoint=StageCheckpoint(directory)).fit(X, y)
+    if (resumed.selected_features_, resumed.best_score_) != expected:
+        print(f"ERROR: Selection resumed after the budget ran out differs: {resumed.selected_features_}")
+    
+    # A run directory only resumes on the data and settings it was created for
+    run_dir = tempfile.mkdtemp()
+    automl = SimpleAutoML(target_col='target')
+    automl.run_automl(df, models_to_run=['linear_regression'], n_splits=3, loss_fn=mae(), verbose=0, run_dir=run_dir)
+    changed = df.copy()
+    changed['target'] = changed['target'] + 1.0
+    try:
+        automl.run_automl(changed, models_to_run=['linear_regression'], n_splits=3, loss_fn=mae(), verbose=0,
+                          resume_from=run_dir)
+        print("ERROR: Resuming on different data did not raise")
+    except ValueError as e:
+        print(f"Correct error handling: {e}")
+
+def test_parquet_source():
+    """Test that parquet input is read in time order and rejects non-numeric columns."""
+    print("\n" + "="*60)
+    print("TEST 15: PARQUET INPUT")
+    print("="*60)
+    
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("pyarrow not installed, skipping")
+        return
+    import tempfile
+    from helper.parquet_source import ParquetSource
+    
+    df = create_test_data()
+    df['house_type'] = np.where(df['feature_0'] > 0, 'Villa', 'Apartment')
+    features = ['feature_0', 'feature_1']
+    directory = Path(tempfile.mkdtemp())
+    # Three files whose name order is not their text order; the last one newest first
+    for part, rows in [(1, slice(0, 80)), (2, slice(80, 150)), (10, slice(150, 200))]:
+        chunk = df.iloc[rows]
+        (chunk.iloc[::-1] if part == 10 else chunk).to_parquet(directory / f"part_{part}.parquet", row_group_size=32)
+    
+    source = ParquetSource(directory)
+    print(f"Files: {[file.name for file in source.files]}")
+    if [file.name for file in source.files] != ['part_1.parquet', 'part_2.parquet', 'part_10.parquet']:
+        print("ERROR: Files are not in numeric name order")
+    
+    values, y, _ = source.read(features, 'target')
+    if not (np.array_equal(values, df[features].to_numpy()) and np.array_equal(y.to_numpy(), df['target'].to_numpy())):
+        print("ERROR: Rows are not returned in date order")
+    values, y, _ = source.read(features, 'target', -30, None)
+    if not np.array_equal(values, df[features].to_numpy()[-30:]):
+        print("ERROR: Negative row range does not select the most recent rows")
+    
+    try:
+        source.read(features + ['house_type'], 'target')
+        print("ERROR: Non-numeric column was accepted")
+    except ValueError as e:
+        print(f"Correct error handling: {e}")
+        if 'house_type' not in str(e):
+            print("ERROR: Error does not name the non-numeric column")
+
+def test_linear_fast_path_equivalence():
+    """Test that the linear fast path selects the same features as plain CV fits."""
+    print("\n" + "="*60)
+    print("TEST 16: LINEAR FAST PATH EQUIVALENCE")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from feature_selection.forward import ForwardFeatureSelector
+    from models.linear_regression import LinearRegressionConfig
+    
+    # A constant column scores equal to the set without it, up to rounding that differs between the paths
+    for seed in (24, 25, 26):
+        rng = np.random.default_rng(seed)
+        X = pd.DataFrame(rng.normal(size=(200, 5)), columns=[f'feature_{i}' for i in range(5)])
+        X['nom_interest_rate%'] = 3.7
+        y = 2 * X['feature_0'] - X['feature_1'] + rng.normal(size=200)
+        for model_type in ['linear', 'ridge']:
+            for selector_cls in [BackwardFeatureSelector, ForwardFeatureSelector]:
+                fast, plain = [selector_cls(LinearRegressionConfig(model_type=model_type), rmse(), cv=TimeSeriesSplit(4),
+                                            linear_fast_path=fast_path).fit(X, y)
+                               for fast_path in (True, False)]
+                print(f"  seed {seed} {model_type} {selector_cls.__name__}: {fast.selected_features_}")
+                if fast.selected_features_ != plain.selected_features_:
+                    print(f"ERROR: Fast path selected {fast.selected_features_}, plain fits {plain.selected_features_}")
+
+def _cached_loss(cache, key):
+    """Look up key in a score cache from a worker process (module-level so loky can pickle it)"""
+    return cache.get(key)
+
+def test_score_cache():
+    """Test the score cache LRU, its SQLite tier across restarts and its use from worker processes."""
+    print("\n" + "="*60)
+    print("TEST 17: SCORE CACHE")
+    print("="*60)
+    
+    import pickle
+    import tempfile
+    import joblib
+    from helper.score_cache import ScoreCache
+    
+    # LRU: a lookup refreshes an entry, so the least recently used one is evicted
+    cache = ScoreCache(max_entries=2)
+    cache.put('a', 1.0)
+    cache.put('b', 2.0)
+    cache.get('a')
+    cache.put('c', 3.0)
+    print(f"LRU after overflow: {list(cache._memory)}")
+    if cache.get('b') is not None or cache.get('a') != 1.0 or cache.get('c') != 3.0:
+        print("ERROR: LRU did not evict the least recently used entry")
+    
+    # SQLite tier: a new cache on the same file serves the values from disk
+    path = str(Path(tempfile.mkdtemp()) / 'scores' / 'cache.sqlite')
+    cache = ScoreCache(max_entries=1, path=path)
+    for i in range(5):
+        cache.put(f"key_{i}", float(i))
+    restarted = ScoreCache(path=path)
+    values = [restarted.get(f"key_{i}") for i in range(5)]
+    print(f"After restart: {values}, stats {restarted.stats()}")
+    if values != [0.0, 1.0, 2.0, 3.0, 4.0] or restarted.disk_hits != 5:
+        print("ERROR: SQLite tier did not survive a restart")
+    if cache.get('key_0') != 0.0:
+        print("ERROR: Entry evicted from memory was not read back from SQLite")
+    
+    # Worker processes (parallel_models) get a pickled copy that reopens the SQLite file
+    copy = pickle.loads(pickle.dumps(cache))
+    if copy._connection is not None or copy.get('key_3') != 3.0:
+        print("ERROR: Pickled score cache does not reopen its SQLite file")
+    worker_values = joblib.Parallel(n_jobs=2, backend='loky')(
+        joblib.delayed(_cached_loss)(cache, f"key_{i}") for i in range(5))
+    print(f"Read in worker processes: {worker_values}")
+    if worker_values != [0.0, 1.0, 2.0, 3.0, 4.0]:
+        print("ERROR: Worker processes could not read the score cache")
+
+def test_forward_max_features_groups():
+    """Test that forward selection with feature groups never exceeds max_features."""
+    print("\n" + "="*60)
+    print("TEST 18: FORWARD SELECTION MAX_FEATURES WITH GROUPS")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from feature_selection.forward import ForwardFeatureSelector
+    from models.linear_regression import LinearRegressionConfig
+    
+    df = create_test_data()
+    X = df[[f'feature_{i}' for i in range(5)]].copy()
+    # A strong three-column one-hot group: adding it would take two features to four
+    house_type = np.random.default_rng(0).integers(0, 3, len(X))
+    for i, name in enumerate(['Villa', 'Apartment', 'Townhouse']):
+        X[f'btype_{name}'] = (house_type == i).astype(float)
+    y = df['target'] + 3 * X['btype_Villa'] - 2 * X['btype_Apartment']
+    
+    for max_features in (2, 4):
+        selector = ForwardFeatureSelector(LinearRegressionConfig(), rmse(), cv=TimeSeriesSplit(3),
+                                          max_features=max_features, feature_groups='auto')
+        selector.fit(X, y)
+        print(f"max_features={max_features}: {selector.selected_features_}")
+        if len(selector.selected_features_) > max_features:
+            print(f"ERROR: Selected {len(selector.selected_features_)} features with max_features={max_features}")
+    if not any(f.startswith('btype_') for f in selector.selected_features_):
+        print("ERROR: Group that fits within max_features was not added")
+
+def test_backward_selection_reduces_loss():
+    """Test that backward selection with an error loss drops noise and lowers the CV RMSE."""
+    print("\n" + "="*60)
+    print("TEST 19: BACKWARD SELECTION REDUCES THE LOSS")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.cross_validation import cross_val_scores
+    from models.linear_regression import LinearRegressionConfig
+    
+    df = create_test_data()
+    X = df[[f'feature_{i}' for i in range(5)]].iloc[:80].copy()
+    rng = np.random.default_rng(0)
+    for i in range(10):
+        X[f'noise_{i}'] = rng.normal(size=len(X))
+    y = df['target'].iloc[:80]
+    cv = TimeSeriesSplit(3)
+    
+    all_features_rmse = np.mean(cross_val_scores(LinearRegressionConfig(), X, y, cv, rmse()))
+    for fast_path in (True, False):
+        selector = BackwardFeatureSelector(LinearRegressionConfig(), rmse(), cv=cv, linear_fast_path=fast_path)
+        selector.fit(X, y)
+        print(f"linear_fast_path={fast_path}: RMSE {all_features_rmse:.4f} -> {selector.best_score_:.4f} "
+              f"with {selector.selected_features_}")
+        if not selector.best_score_ < all_features_rmse:
+            print("ERROR: Backward selection did not lower the CV RMSE")
+        if not {'feature_0', 'feature_1'} <= set(selector.selected_features_):
+            print("ERROR: Backward selection dropped an informative feature")
+
+def test_selection_artifact_reuse():
+    """Test that a feature selection artifact is reused by an identical run and not by a changed one."""
+    print("\n" + "="*60)
+    print("TEST 20: SELECTION ARTIFACT REUSE")
+    print("="*60)
+    
+    import functools
+    import tempfile
+    
+    df = create_test_data()
+    cache_dir = tempfile.mkdtemp()
+    
+    def run(feature_selection_fn):
+        automl = SimpleAutoML(target_col='target', selection_cache_dir=cache_dir)
+        results = automl.run_automl(df, feature_selection_fn=feature_selection_fn, models_to_run=['linear_regression'],
+                                    n_splits=3, loss_fn=mae(), verbose=0)
+        result = results['models']['linear_regression']
+        return result['selection_artifact'], result['feature_selector'].selected_features_
+    
+    first, first_features = run(BackwardFeatureSelector)
+    second, second_features = run(BackwardFeatureSelector)
+    print(f"First run: reused={first['reused']}, second run: reused={second['reused']}")
+    if first['reused'] or not second['reused'] or first['path'] != second['path']:
+        print("ERROR: Identical run did not reuse the stored selection")
+    if second_features != first_features:
+        print(f"ERROR: Reused selection {second_features} differs from {first_features}")
+    
+    changed, _ = run(functools.partial(BackwardFeatureSelector, feature_groups=['feature_']))
+    if changed['reused'] or changed['path'] == first['path']:
+        print("ERROR: Selection with different selector settings reused the stored artifact")
+
+def test_grid_search_direction_and_jobs():
+    """Test that GridSearchTuner keeps the lowest loss and how parallel_models splits the cores."""
+    print("\n" + "="*60)
+    print("TEST 21: GRID SEARCH DIRECTION AND PARALLEL_MODELS JOBS")
+    print("="*60)
+    
+    import functools
+    import os
+    from unittest import mock
+    from sklearn.model_selection import TimeSeriesSplit
+    from feature_selection.forward import ForwardFeatureSelector
+    from helper.cross_validation import cross_val_scores, cpu_share
+    from models.linear_regression import LinearRegressionConfig
+    
+    df = create_test_data()
+    X = df[[f'feature_{i}' for i in range(5)]]
+    y = df['target']
+    cv = TimeSeriesSplit(3)
+    estimator = LinearRegressionConfig(model_type='ridge')
+    param_grid = {'alpha': [1000.0, 0.01, 100.0]}
+    tuner = GridSearchTuner(estimator, mae(), param_grid, cv=cv, n_jobs=1).fit(X, y)
+    losses = {alpha: float(np.mean(cross_val_scores(estimator, X, y, cv, mae(), params={'alpha': alpha})))
+              for alpha in param_grid['alpha']}
+    print(f"CV MAE per alpha: {losses}, chosen: {tuner.best_params_}")
+    if tuner.best_params_ != {'alpha': min(losses, key=losses.get)} or not np.isclose(tuner.best_score_, min(losses.values())):
+        print("ERROR: GridSearchTuner did not keep the lowest mean loss")
+    
+    # Selectors only get the per-worker n_jobs when they take it and it is not bound already
+    accepts = [SimpleAutoML._accepts_kwarg(fn, 'n_jobs') for fn in
+               (BackwardFeatureSelector, ForwardFeatureSelector, functools.partial(BackwardFeatureSelector, n_jobs=3))]
+    print(f"Selectors given n_jobs: {accepts}")
+    if accepts != [True, False, False]:
+        print("ERROR: Wrong selectors are given the per-worker n_jobs")
+    
+    # Inside a parallel_models worker joblib limits OMP_NUM_THREADS to the worker's share
+    with mock.patch.dict(os.environ, {'OMP_NUM_THREADS': '1'}):
+        share = cpu_share()
+    print(f"cpu_share() in a one-core worker: {share}")
+    if share != 1:
+        print("ERROR: cpu_share() ignores the worker's OMP_NUM_THREADS")
+
+def test_successive_halving_fit_report():
+    """Test that the successive halving fit report counts the fold fits that actually ran."""
+    print("\n" + "="*60)
+    print("TEST 22: SUCCESSIVE HALVING FIT REPORT")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.fold_cache import FoldCache
+    from helper.profiler import counters
+    from helper.score_cache import ScoreCache
+    from hyper_tuning import SuccessiveHalvingTuner
+    from models.Xgboost import XGBoostConfig
+    
+    df = create_test_data()
+    X = df[[f'feature_{i}' for i in range(5)]]
+    y = df['target']
+    cv = TimeSeriesSplit(3)
+    fold_cache = FoldCache(X, y, cv)
+    score_cache = ScoreCache()
+    param_grid = {'max_depth': [2, 3, 4], 'n_estimators': [10, 30, 90]}
+    
+    for run in ('cold', 'warm'):
+        folds_before = counters['cv_folds']
+        tuner = SuccessiveHalvingTuner(XGBoostConfig(), mae(), param_grid, cv=cv, resource='n_estimators', n_jobs=1,
+                                       fold_cache=fold_cache, score_cache=score_cache).fit(X, y)
+        fitted = counters['cv_folds'] - folds_before
+        print(f"{run} score cache: fit_report_ {tuner.fit_report_}, fold fits run: {fitted}")
+        if tuner.fit_report_['fits'] != fitted:
+            print(f"ERROR: fit_report_ counts {tuner.fit_report_['fits']} fold fits, {fitted} ran")
+    if tuner.fit_report_['fits'] != 0:
+        print("ERROR: Score cache hits were counted as fold fits")
+
+def test_bayesian_fit_report():
+    """Test that the Bayesian tuner's fit report counts the fold fits that actually ran."""
+    print("\n" + "="*60)
+    print("TEST 23: BAYESIAN FIT REPORT")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.fold_cache import FoldCache
+    from helper.profiler import counters
+    from helper.score_cache import ScoreCache
+    from hyper_tuning import BayesianTuner
+    from models.linear_regression import LinearRegressionConfig
+    
+    df = create_test_data()
+    X = df[[f'feature_{i}' for i in range(5)]]
+    y = df['target']
+    cv = TimeSeriesSplit(3)
+    fold_cache = FoldCache(X, y, cv)
+    score_cache = ScoreCache()
+    param_grid = {'alpha': [0.01, 0.1, 1.0, 10.0, 100.0]}
+    
+    for run in ('cold', 'warm'):
+        folds_before = counters['cv_folds']
+        tuner = BayesianTuner(LinearRegressionConfig(model_type='ridge'), mae(), param_grid, cv=cv, n_iter=4,
+                              n_jobs=1, fold_cache=fold_cache, score_cache=score_cache).fit(X, y)
+        fitted = counters['cv_folds'] - folds_before
+        print(f"{run} score cache: fit_report_ {tuner.fit_report_}, fold fits run: {fitted}")
+        if tuner.fit_report_['fits'] != fitted:
+            print(f"ERROR: fit_report_ counts {tuner.fit_report_['fits']} fold fits, {fitted} ran")
+    if tuner.fit_report_['fits'] != 0:
+        print("ERROR: Score cache hits were counted as fold fits")
+
+def test_prefix_scoring():
+    """Test that scoring the n_estimators axis from one fit matches separately fitted boosters."""
+    print("\n" + "="*60)
+    print("TEST 24: N_ESTIMATORS PREFIX SCORING")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.cross_validation import cross_val_scores
+    from models.Xgboost import XGBoostConfig
+    from models.lightgbm import LightgbmConfig
+    
+    df = create_test_data()
+    X = df[[f'feature_{i}' for i in range(5)]]
+    y = df['target']
+    cv = TimeSeriesSplit(3)
+    param_grid = {'n_estimators': [20, 60, 150], 'max_depth': [3]}
+    
+    for config_cls, quiet in ((XGBoostConfig, {}), (LightgbmConfig, {'verbose': -1})):
+        for early_stopping_rounds in (None, 10):
+            estimator = config_cls(loss_fn=mae(), early_stopping_rounds=early_stopping_rounds, **quiet)
+            tuner = GridSearchTuner(estimator, mae(), param_grid, cv=cv, n_jobs=1)
+            candidates = [(None, {'n_estimators': n, 'max_depth': 3}) for n in param_grid['n_estimators']]
+            shared = tuner._score_candidates(X, y, candidates, backend='processes')
+            separate = [np.mean(cross_val_scores(estimator, X, y, cv, mae(), params=params)) for _, params in candidates]
+            print(f"{config_cls.__name__} early_stopping_rounds={early_stopping_rounds}: "
+                  f"one fit {np.round(shared, 4)}, separate fits {np.round(separate, 4)}")
+            if not np.allclose(shared, separate, rtol=1e-6):
+                print("ERROR: Scores from one fit differ from separately fitted boosters")
+            tuner.fit(X, y)
+            if not np.isclose(tuner.best_score_, min(separate), rtol=1e-6):
+                print(f"ERROR: GridSearchTuner best score {tuner.best_score_} is not the best separate fit {min(separate)}")
+
+def test_zero_copy_dataset():
+    """Test that the train/test split, DataFrame wrappers and fold rows are views of one matrix."""
+    print("\n" + "="*60)
+    print("TEST 25: ZERO-COPY DATASETS")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.fold_cache import FoldCache
+    
+    automl = SimpleAutoML(target_col='target')
+    train_data, test_data, y_train, _ = automl._prepare_datasets(create_test_data(), 0.2)
+    buffer = train_data.values.base if train_data.values.base is not None else train_data.values
+    X_train = train_data.to_frame()
+    fold_cache = FoldCache(train_data, y_train, TimeSeriesSplit(3)).build()
+    
+    views = {
+        'test rows': test_data.values,
+        'train DataFrame': X_train.to_numpy(),
+        'DataFrame column subset': train_data.to_frame(['feature_1', 'feature_2']).to_numpy(),
+        'fold cache matrix': fold_cache._X,
+    }
+    views.update({f"fold {i} train rows": train_data.take(rows=fold['train_rows'])
+                  for i, fold in enumerate(fold_cache._folds)})
+    views.update({f"fold {i} validation rows": train_data.take(rows=fold['val_rows'])
+                  for i, fold in enumerate(fold_cache._folds)})
+    for name, view in views.items():
+        shared = np.shares_memory(view, buffer)
+        print(f"  {name}: shares the dataset buffer: {shared}")
+        if not shared:
+            print(f"ERROR: {name} is a copy of the dataset matrix")
+
+def test_compact_dtype_policy():
+    """Test that 'compact' keeps indicator columns as uint8 outside the float matrix and uses less memory than 'float32'."""
+    print("\n" + "="*60)
+    print("TEST 26: COMPACT DTYPE POLICY")
+    print("="*60)
+    
+    import tracemalloc
+    from sklearn.model_selection import TimeSeriesSplit
+    from feature_selection.forward import ForwardFeatureSelector
+    from helper.fold_cache import FoldCache
+    
+    df = pd.concat([create_test_data()] * 10, ignore_index=True)
+    rng = np.random.default_rng(0)
+    for i in range(20):
+        df[f'btype_{i}'] = rng.integers(0, 2, len(df))
+    indicators = [f'btype_{i}' for i in range(20)]
+    
+    folds, sizes, peaks = {}, {}, {}
+    for policy in ['float32', 'compact']:
+        automl = SimpleAutoML(target_col='target', dtype_policy=policy)
+        train_data, _, y_train, _ = automl._prepare_datasets(df, 0.2)
+        sizes[policy] = train_data.nbytes
+        tracemalloc.start()
+        fold_cache = FoldCache(train_data, y_train, TimeSeriesSplit(n_splits=3)).build()
+        folds[policy] = list(fold_cache.folds())
+        peaks[policy] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if policy == 'compact':
+            frame = train_data.to_frame()
+    
+    print(f"Feature matrix bytes: float32={sizes['float32']}, compact={sizes['compact']}")
+    print(f"Peak fold memory: float32={peaks['float32']}, compact={peaks['compact']}")
+    if not sizes['compact'] < sizes['float32']:
+        print("ERROR: 'compact' feature matrix is not smaller than 'float32'")
+    if not peaks['compact'] < peaks['float32']:
+        print("ERROR: 'compact' folds did not use less memory than 'float32'")
+    
+    X_train_fold = folds['compact'][0][0]
+    if not isinstance(X_train_fold, pd.DataFrame) or \
+            any(X_train_fold[col].dtype != np.uint8 for col in indicators) or \
+            any(frame[col].dtype != np.uint8 for col in indicators):
+        print("ERROR: 'compact' indicator columns are not uint8")
+    if X_train_fold['feature_0'].dtype != np.float32:
+        print("ERROR: 'compact' value columns are not float32")
+    for (X_c, X_vc, _, _), (X_f, X_vf, _, _) in zip(folds['compact'], folds['float32']):
+        # Indicators stay unscaled under 'compact', the value columns match 'float32'
+        if not (np.array_equal(X_c[indicators], df[indicators].iloc[:len(X_c)]) and
+                np.allclose(X_c.drop(columns=indicators), X_f[:, :5])):
+            print("ERROR: 'compact' fold values differ from 'float32'")
+            break
+    
+    small = df.iloc[:200].drop(columns=indicators[5:])
+    losses = {}
+    for policy in ['float32', 'compact']:
+        automl = SimpleAutoML(target_col='target', dtype_policy=policy)
+        results = automl.run_automl(small, feature_selection_fn=ForwardFeatureSelector,
+                                    models_to_run=['linear_regression', 'xgboost', 'lightgbm'], n_splits=3,
+                                    loss_fn=mae(), verbose=0)
+        losses[policy] = {name: result.get('error') or result['metrics']['test_loss']
+                          for name, result in results['models'].items()}
+    print(f"Test losses: {losses}")
+    if any(isinstance(loss, str) for loss in losses['compact'].values()):
+        print("ERROR: A model failed under 'compact'")
+
+def test_run_checkpoint_settings():
+    """Test that run checkpoints fingerprint partial selectors and keep the model race outcome."""
+    print("\n" + "="*60)
+    print("TEST 27: RUN CHECKPOINT SETTINGS AND RACE")
+    print("="*60)
+    
+    import functools
+    import tempfile
+    from helper.model_race import ModelRace
+    
+    df = create_test_data()
+    models = ['linear_regression', 'xgboost', 'lightgbm']
+    
+    # Selector settings bound with functools.partial are part of the fingerprint
+    run_dir = tempfile.mkdtemp()
+    automl = SimpleAutoML(target_col='target')
+    automl.run_automl(df, feature_selection_fn=functools.partial(BackwardFeatureSelector, feature_groups=['feature_']),
+                      models_to_run=['linear_regression'], n_splits=3, loss_fn=mae(), verbose=0, run_dir=run_dir)
+    try:
+        automl.run_automl(df, feature_selection_fn=functools.partial(BackwardFeatureSelector, feature_groups=None),
+                          models_to_run=['linear_regression'], n_splits=3, loss_fn=mae(), verbose=0,
+                          resume_from=run_dir)
+        print("ERROR: Resuming with different selector settings did not raise")
+    except ValueError as e:
+        print(f"Correct error handling: {e}")
+    
+    # A resumed run takes the race survivors from the checkpoint instead of racing again
+    run_dir = tempfile.mkdtemp()
+    first = automl.run_automl(df, models_to_run=models, n_splits=4, loss_fn=mae(), verbose=0, run_dir=run_dir,
+                              model_race=True)
+    original_run = ModelRace.run
+    def no_race(self, estimators):
+        raise AssertionError("race ran again")
+    ModelRace.run = no_race
+    try:
+        resumed = automl.run_automl(df, models_to_run=models, n_splits=4, loss_fn=mae(), verbose=0,
+                                    resume_from=run_dir, model_race=True)
+        print(f"Race survivors: {first['race']['survivors']}, resumed: {resumed['race']['survivors']}")
+        if resumed['race']['survivors'] != first['race']['survivors'] or \
+                sorted(resumed['models']) != sorted(first['models']):
+            print("ERROR: Resumed run did not keep the checkpointed race survivors")
+    except AssertionError as e:
+        print(f"ERROR: Resumed run raced again ({e})")
+    finally:
+        ModelRace.run = original_run
+
+def test_profile_export():
+    """Test that export_profile writes per-stage figures for the run and every model."""
+    print("\n" + "="*60)
+    print("TEST 28: PROFILE EXPORT")
+    print("="*60)
+    
+    import functools
+    import json
+    import os
+    import tempfile
+    
+    automl = SimpleAutoML(target_col='target')
+    try:
+        automl.export_profile(os.path.join(tempfile.mkdtemp(), 'profile.json'))
+        print("ERROR: Exporting before a run did not raise")
+    except ValueError as e:
+        print(f"Correct error handling: {e}")
+    
+    # Refit selection (the linear fast path solves in closed form and counts no fits)
+    automl.run_automl(create_test_data(), feature_selection_fn=functools.partial(BackwardFeatureSelector,
+                                                                                 linear_fast_path=False),
+                      hypertuning_fn=GridSearchTuner, models_to_run=['linear_regression'], n_splits=3, loss_fn=mae(),
+                      verbose=0, trace_memory=True)
+    path = os.path.join(tempfile.mkdtemp(), 'profile.json')
+    automl.export_profile(path)
+    with open(path) as f:
+        profile = json.load(f)
+    
+    fields = {'wall_time_s', 'cpu_time_s', 'peak_rss_mb', 'model_fits', 'cv_folds', 'tracemalloc_peak_mb'}
+    expected = {
+        'run': {'data_split', 'fold_scaling', 'model_pipelines'},
+        'linear_regression': {'feature_selection', 'tuning', 'final_training'},
+    }
+    stages = {'run': profile.get('run', {}), **profile.get('models', {})}
+    print(f"Profiled stages: { {name: sorted(records) for name, records in stages.items()} }")
+    for name, names in expected.items():
+        if set(stages.get(name, {})) != names:
+            print(f"ERROR: Profile of {name} has stages {sorted(stages.get(name, {}))}, expected {sorted(names)}")
+            continue
+        for stage, record in stages[name].items():
+            if set(record) != fields or record['wall_time_s'] < 0 or record['cpu_time_s'] < 0:
+                print(f"ERROR: Profile record {name}/{stage} is malformed: {record}")
+    model_stages = stages.get('linear_regression', {})
+    if model_stages and not (model_stages['feature_selection']['cv_folds'] > 0 and
+                             model_stages['tuning']['cv_folds'] > 0 and
+                             model_stages['final_training']['model_fits'] == 1):
+        print(f"ERROR: Profile fit counts are off: {model_stages}")
+
+def test_model_race():
+    """Test that the model race eliminates a clearly worse model and only its survivors reach selection."""
+    print("\n" + "="*60)
+    print("TEST 29: MODEL RACE")
+    print("="*60)
+    
+    from sklearn.dummy import DummyRegressor
+    from sklearn.linear_model import LinearRegression, Ridge
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.dataset import ArrayDataset
+    from helper.fold_cache import FoldCache
+    from helper.model_race import ModelRace
+    
+    df = create_test_data()
+    X = df.drop(columns=['target', 'date'])
+    fold_cache = FoldCache(ArrayDataset.from_frame(X), df['target'], TimeSeriesSplit(n_splits=5))
+    race = ModelRace(fold_cache, mae(), eta=2, min_survivors=1)
+    survivors = race.run({'linear': LinearRegression(), 'ridge': Ridge(alpha=1.0),
+                          'mean': DummyRegressor(), 'median': DummyRegressor(strategy='median')})
+    
+    print(f"Rungs: {[(rung['n_folds'], rung['survivors']) for rung in race.rungs_]}, fits: {race.n_fits_}")
+    if race._rung_sizes() != [1, 2, 4, 5]:
+        print(f"ERROR: Rung sizes for 5 folds are {race._rung_sizes()}, expected [1, 2, 4, 5]")
+    # 4 models keep 2 after one fold, 2 keep 1 after two folds: 4 + 2 fits
+    if [rung['n_folds'] for rung in race.rungs_] != [1, 2] or \
+            [len(rung['survivors']) for rung in race.rungs_] != [2, 1] or race.n_fits_ != 6:
+        print("ERROR: Race rungs do not halve the models on 1, 2, ... folds")
+    if {'mean', 'median'} & set(race.rungs_[0]['survivors']):
+        print(f"ERROR: Constant predictor survived the first rung: {race.rungs_[0]['survivors']}")
+    if survivors != race.survivors_ or len(survivors) != 1 or \
+            sorted(survivors + race.eliminated_) != ['linear', 'mean', 'median', 'ridge']:
+        print(f"ERROR: Survivors {survivors} and eliminated {race.eliminated_} do not cover the race")
+    
+    # run_automl only selects, tunes and trains the survivors
+    automl = SimpleAutoML(target_col='target')
+    results = automl.run_automl(df, feature_selection_fn=BackwardFeatureSelector,
+                                models_to_run=['linear_regression', 'xgboost', 'lightgbm'], n_splits=4,
+                                loss_fn=mae(), verbose=0, model_race=True, race_survivors=2)
+    race = results['race']
+    print(f"Race survivors: {race['survivors']}, eliminated: {race['eliminated']}, trained: {list(results['models'])}")
+    if len(race['survivors']) != 2 or len(race['eliminated']) != 1:
+        print("ERROR: run_automl race did not keep race_survivors models")
+    if sorted(results['models']) != sorted(race['survivors']):
+        print("ERROR: Models outside the race survivors reached feature selection")
+    if any(results['models'][name].get('feature_selector') is None for name in race['survivors']):
+        print("ERROR: A race survivor skipped feature selection")
+
+def test_importance_pruning():
+    """Test that importance pruning drops noise features, honours min_features and patience, and prunes whole groups."""
+    print("\n" + "="*60)
+    print("TEST 30: IMPORTANCE PRUNING")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from feature_selection import ImportancePruningSelector
+    from models.linear_regression import LinearRegressionConfig
+    
+    class RecordingSelector(ImportancePruningSelector):
+        """Remembers the feature set of every round"""
+        def _evaluate(self, X, y, features):
+            self.rounds_ = getattr(self, 'rounds_', []) + [list(features)]
+            return super()._evaluate(X, y, features)
+    
+    df = create_test_data()
+    rng = np.random.default_rng(1)
+    X = df.drop(columns=['target', 'date'])
+    for i in range(10):
+        X[f'noise_{i}'] = rng.normal(size=len(X))
+    for i in range(3):
+        X[f'btype_{i}'] = rng.integers(0, 2, len(X))
+    y = df['target']
+    cv = TimeSeriesSplit(n_splits=3)
+    noise = [col for col in X.columns if col.startswith(('noise_', 'btype_'))]
+    
+    selector = RecordingSelector(LinearRegressionConfig(), mae(), cv=cv, patience=3).fit(X, y)
+    kept_noise = [col for col in selector.selected_features_ if col in noise]
+    print(f"Selected {selector.selected_features_} after {len(selector.rounds_)} rounds")
+    if not {'feature_0', 'feature_1', 'feature_2'} <= set(selector.selected_features_):
+        print("ERROR: Importance pruning dropped an informative feature")
+    if len(kept_noise) > 2:
+        print(f"ERROR: Importance pruning kept noise features: {kept_noise}")
+    
+    # patience: the run stops `patience` rounds after its best one
+    scores = [entry['score'] for entry in selector.score_trace_]
+    best_round = int(np.argmin(scores))
+    if len(scores) - 1 - best_round != 3 and len(selector.rounds_[-1]) > 1:
+        print(f"ERROR: Pruning ran {len(scores) - 1 - best_round} rounds past its best, patience is 3")
+    impatient = RecordingSelector(LinearRegressionConfig(), mae(), cv=cv, patience=1).fit(X, y)
+    if len(impatient.rounds_) > len(selector.rounds_):
+        print("ERROR: Lower patience ran more rounds")
+    
+    # min_features: never evaluates fewer columns, even without a plateau
+    floor = RecordingSelector(LinearRegressionConfig(), mae(), cv=cv, patience=100, min_features=6).fit(X, y)
+    sizes = [len(features) for features in floor.rounds_]
+    print(f"Round sizes with min_features=6: {sizes}")
+    if min(sizes) != 6 or len(floor.selected_features_) < 6:
+        print("ERROR: Importance pruning did not stop at min_features")
+    
+    # feature_groups: the btype_ indicators are kept or dropped together
+    grouped = RecordingSelector(LinearRegressionConfig(), mae(), cv=cv, patience=100,
+                                feature_groups=['btype_']).fit(X, y)
+    group_sizes = {sum(col.startswith('btype_') for col in features) for features in grouped.rounds_}
+    print(f"btype_ columns per round: {sorted(group_sizes)}")
+    if not group_sizes <= {0, 3}:
+        print("ERROR: Grouped pruning split the btype_ group")
+    if 0 not in group_sizes:
+        print("ERROR: Grouped pruning never dropped the btype_ noise group")
+
+def test_column_order_keys():
+    """Test that score cache keys keep the column order and CV fits use one canonical order."""
+    print("\n" + "="*60)
+    print("TEST 31: COLUMN ORDER IN SCORE CACHE KEYS")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from helper.cross_validation import cross_val_scores, fit_columns
+    from helper.fold_cache import FoldCache
+    from helper.score_cache import ScoreCache
+    from models.Xgboost import XGBoostConfig
+    
+    df = create_test_data()
+    X = df.drop(columns=['target', 'date'])
+    y = df['target']
+    cv = TimeSeriesSplit(n_splits=3)
+    fold_cache = FoldCache(X, y, cv)
+    # Column sampling makes XGBoost depend on the column order
+    estimator = XGBoostConfig(n_estimators=20, colsample_bytree=0.5)
+    
+    key = ScoreCache.key(fold_cache.fingerprint, ['feature_0', 'feature_2'], estimator, None, mae(), 0)
+    swapped = ScoreCache.key(fold_cache.fingerprint, ['feature_2', 'feature_0'], estimator, None, mae(), 0)
+    if key == swapped:
+        print("ERROR: Score cache key ignores the column order")
+    if fit_columns(X, ['feature_3', 'feature_0', 'feature_2'], fold_cache) != ['feature_0', 'feature_2', 'feature_3']:
+        print("ERROR: fit_columns does not use the fold cache column order")
+    
+    score_cache = ScoreCache()
+    stats = {'hits': 0, 'misses': 0}
+    picked = ['feature_3', 'feature_0', 'feature_2']
+    first = cross_val_scores(estimator, X, y, cv, mae(), fold_cache=fold_cache, columns=picked,
+                             score_cache=score_cache, cache_stats=stats)
+    canonical = cross_val_scores(estimator, X, y, cv, mae(), fold_cache=fold_cache,
+                                 columns=['feature_0', 'feature_2', 'feature_3'])
+    again = cross_val_scores(estimator, X, y, cv, mae(), fold_cache=fold_cache, columns=picked[::-1],
+                             score_cache=score_cache, cache_stats=stats)
+    print(f"Fold losses: {np.round(first, 4)}, cache stats: {stats}")
+    if not np.allclose(first, canonical):
+        print("ERROR: CV losses depend on the order the columns were listed in")
+    if stats != {'hits': 3, 'misses': 3} or first != again:
+        print("ERROR: The same feature set in another order missed the score cache")
+
+def test_booster_fast_path_equivalence():
+    """Test that the booster fast path gives the same fold losses and selection as refitting, for both boosters."""
+    print("\n" + "="*60)
+    print("TEST 32: BOOSTER FAST PATH EQUIVALENCE")
+    print("="*60)
+    
+    from sklearn.model_selection import TimeSeriesSplit
+    from feature_selection.booster_fast_path import BoosterSubsetScorer
+    from feature_selection.forward import ForwardFeatureSelector
+    from helper.cross_validation import cross_val_scores
+    from helper.fold_cache import FoldCache
+    from models.Xgboost import XGBoostConfig
+    from models.lightgbm import LightgbmConfig
+    
+    df = create_test_data()
+    rng = np.random.default_rng(2)
+    X = df.drop(columns=['target', 'date'])
+    for i in range(3):
+        X[f'btype_{i}'] = rng.integers(0, 2, len(X))
+    y = df['target']
+    cv = TimeSeriesSplit(n_splits=3)
+    
+    for estimator in [XGBoostConfig(n_estimators=30), LightgbmConfig(n_estimators=30, verbose=-1)]:
+        name = type(estimator).__name__
+        if not BoosterSubsetScorer.supports(estimator):
+            print(f"ERROR: {name} with default parameters is not supported by the fast path")
+        if BoosterSubsetScorer.supports(estimator.__class__(**{**estimator.get_params(), 'subsample': 0.8})):
+            print(f"ERROR: {name} with subsample < 1 is supported by the fast path")
+        
+        fold_cache = FoldCache(X, y, cv)
+        scorer = BoosterSubsetScorer(estimator, mae(), X, y, cv, fold_cache)
+        # Candidates as ForwardFeatureSelector lists them: picks first, then the new group
+        for columns in [['feature_3', 'feature_0'], ['feature_1', 'btype_0', 'btype_1', 'btype_2', 'feature_0']]:
+            fast = scorer.fold_losses(columns)
+            plain = cross_val_scores(estimator, X, y, cv, mae(), fold_cache=fold_cache, columns=columns)
+            if not np.allclose(fast, plain, rtol=1e-6, atol=0.0):
+                print(f"ERROR: {name} fast path losses {fast} differ from refitting {plain} on {columns}")
+        
+        selections = {}
+        for fast_path in [True, False]:
+            selector = ForwardFeatureSelector(estimator, mae(), cv=cv, fold_cache=FoldCache(X, y, cv),
+                                              booster_fast_path=fast_path, feature_groups=['btype_']).fit(X, y)
+            selections[fast_path] = (selector.selected_features_, [entry['score'] for entry in selector.score_trace_])
+        print(f"{name}: selected {selections[True][0]} (fast path), {selections[False][0]} (refits)")
+        if selections[True][0] != selections[False][0] or \
+                not np.allclose(selections[True][1], selections[False][1], rtol=1e-6, atol=0.0):
+            print(f"ERROR: {name} fast path selection differs from refitting")
+
+def test_warm_start_run():
+    """Test run_automl initial_features as a dict and as a save_model path, with and without selector support."""
+    print("\n" + "="*60)
+    print("TEST 33: WARM START THROUGH RUN_AUTOML")
+    print("="*60)
+    
+    import contextlib
+    import io
+    import os
+    import tempfile
+    from feature_selection import ImportancePruningSelector, PermutationImportanceSelector
+    
+    df = create_test_data()
+    
+    def run(feature_selection_fn, initial_features):
+        automl = SimpleAutoML(target_col='target')
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = automl.run_automl(df, feature_selection_fn=feature_selection_fn,
+                                        models_to_run=['linear_regression'], n_splits=3, loss_fn=mae(), verbose=0,
+                                        initial_features=initial_features)
+        return automl, results['models']['linear_regression'], output.getvalue()
+    
+    seed = {'linear_regression': ['feature_0', 'feature_3']}
+    automl, result, _ = run(BackwardFeatureSelector, seed)
+    if 'error' in result or result['feature_selector'].initial_features != seed['linear_regression']:
+        print(f"ERROR: Backward selection was not warm-started from the dict seed: {result.get('error')}")
+    
+    path = automl.save_model(os.path.join(tempfile.mkdtemp(), 'yesterday'))
+    expected = result['feature_selector'].selected_features_
+    _, result, _ = run(BackwardFeatureSelector, path)
+    print(f"Seed from {os.path.basename(path)}: {result['feature_selector'].initial_features if 'error' not in result else None}")
+    if 'error' in result or result['feature_selector'].initial_features != expected:
+        print(f"ERROR: Backward selection was not warm-started from the saved package: {result.get('error')}")
+    
+    # Selectors without initial_features run cold with a warning instead of failing
+    for selector_class in [ImportancePruningSelector, PermutationImportanceSelector]:
+        for initial_features in [seed, path]:
+            _, result, output = run(selector_class, initial_features)
+            if 'error' in result:
+                print(f"ERROR: {selector_class.__name__} failed with initial_features: {result['error']}")
+            elif 'takes no initial_features' not in output:
+                print(f"ERROR: {selector_class.__name__} dropped the seed without a warning")
+    print("Selectors without initial_features ran without the seed")
+
 def main():
     """Run lightweight test suite."""
     print("LIGHTWEIGHT AUTOML TEST SUITE")
@@ -338,6 +1326,81 @@ def main():
         # Test 8: Edge cases
         test_edge_cases()
         
+        # Test 9: Fold cache
+        test_fold_cache()
+        
+        # Test 10: Permutation importance selector
+        test_permutation_importance()
+        
+        # Test 11: Successive halving tuner
+        test_successive_halving()
+        
+        # Test 12: Early stopping
+        test_early_stopping()
+        
+        # Test 13: Prefix fold scalers
+        test_fold_cache_prefix_scalers()
+        
+        # Test 14: Checkpoint and resume
+        test_checkpoint_resume()
+        
+        # Test 15: Parquet input
+        test_parquet_source()
+        
+        # Test 16: Linear fast path equivalence
+        test_linear_fast_path_equivalence()
+        
+        # Test 17: Score cache
+        test_score_cache()
+        
+        # Test 18: Forward selection max_features with groups
+        test_forward_max_features_groups()
+        
+        # Test 19: Backward selection reduces the loss
+        test_backward_selection_reduces_loss()
+        
+        # Test 20: Selection artifact reuse
+        test_selection_artifact_reuse()
+        
+        # Test 21: Grid search direction and parallel_models jobs
+        test_grid_search_direction_and_jobs()
+        
+        # Test 22: Successive halving fit report
+        test_successive_halving_fit_report()
+        
+        # Test 23: Bayesian fit report
+        test_bayesian_fit_report()
+        
+        # Test 24: n_estimators prefix scoring
+        test_prefix_scoring()
+        
+        # Test 25: Zero-copy datasets
+        test_zero_copy_dataset()
+        
+        # Test 26: Compact dtype policy
+        test_compact_dtype_policy()
+        
+        # Test 27: Run checkpoint settings and race
+        test_run_checkpoint_settings()
+        
+        # Test 28: Profile export
+        test_profile_export()
+        
+        # Test 29: Model race
+        test_model_race()
+        
+        # Test 30: Importance pruning
+        test_importance_pruning()
+        
+        # Test 31: Column order in score cache keys
+        test_column_order_keys()
+        
+        # Test 32: Booster fast path equivalence
+        test_booster_fast_path_equivalence()
+        
+        # Test 33: Warm start through run_automl
+        test_warm_start_run()
+        
         total_time = time.time() - start_time
         
         print("\n" + "="*60)